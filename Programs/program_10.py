@@ -1,6 +1,6 @@
 import heapq
 
-def dijkstra(graph, start_node):
+def dijkstra(graph, start_node, target=None, return_predecessors=False):
     """
     Finds the shortest path from a start_node to all other nodes in a weighted graph
     using Dijkstra's algorithm.
@@ -8,14 +8,20 @@ def dijkstra(graph, start_node):
     Args:
         graph (dict): Adjacency list representation where graph[node] is a list of (neighbor, weight) tuples.
         start_node: The starting node for path calculation.
+        target: Optional. Stop as soon as this node is settled. Distances of
+                nodes not yet settled at that point are upper bounds, not final.
+        return_predecessors (bool): Also return {node: previous node on its
+                                    shortest path}, for use with `reconstruct_path`.
 
     Returns:
         dict: A dictionary mapping each node to its shortest distance from the start_node.
               Returns float('inf') for unreachable nodes.
+              With return_predecessors=True, a (distances, predecessors) tuple.
     """
     # Initialize distances with infinity for all nodes and 0 for the start_node
     distances = {node: float('inf') for node in graph}
     distances[start_node] = 0
+    predecessors = {start_node: None}
 
     # Priority queue to store (distance, node). Stores nodes to visit, ordered by shortest distance found so far.
     priority_queue = [(0, start_node)] # (distance, node)
@@ -26,43 +32,252 @@ def dijkstra(graph, start_node):
         # If we've already found a shorter path to this node, skip
         if current_distance > distances[current_node]:
             continue
+        if current_node == target:
+            break # Settled: its distance can no longer improve
 
         # Explore neighbors
         for neighbor, weight in graph.get(current_node, []):
             distance = current_distance + weight
 
             # If a shorter path to the neighbor is found
-            if distance < distances[neighbor]:
+            if distance < distances.get(neighbor, float('inf')):
                 distances[neighbor] = distance
+                predecessors[neighbor] = current_node
                 heapq.heappush(priority_queue, (distance, neighbor))
 
+    if return_predecessors:
+        return distances, predecessors
     return distances
 
+def reconstruct_path(predecessors, target):
+    """
+    Walks predecessor links back from target. Returns [] if target was not reached.
+    """
+    if target not in predecessors:
+        return []
+    path = []
+    node = target
+    while node is not None:
+        path.append(node)
+        node = predecessors[node]
+    return path[::-1]
+
+def reverse_graph(graph):
+    """
+    Same adjacency format with every edge flipped, for backward searches.
+    """
+    reverse = {node: [] for node in graph}
+    for node, edges in graph.items():
+        for neighbor, weight in edges:
+            reverse.setdefault(neighbor, []).append((node, weight))
+    return reverse
+
+def bidirectional_dijkstra(graph, start_node, target, reverse=None):
+    """
+    Point-to-point shortest path, searching forward from start_node and
+    backward from target at the same time. Each side only explores roughly a
+    ball of half the radius, which settles far fewer nodes on large graphs.
+
+    Args:
+        reverse (dict): Optional precomputed `reverse_graph(graph)`, so that
+                        repeated queries don't rebuild it.
+
+    Returns:
+        tuple: (distance, path); (float('inf'), []) if target is unreachable.
+    """
+    if start_node == target:
+        return 0, [start_node]
+    if reverse is None:
+        reverse = reverse_graph(graph)
+
+    inf = float('inf')
+    dist = ({start_node: 0}, {target: 0})
+    pred = ({start_node: None}, {target: None})
+    settled = (set(), set())
+    queues = ([(0, start_node)], [(0, target)])
+    adjacency = (graph, reverse)
+    best, meeting = inf, None
+
+    while queues[0] and queues[1]:
+        # Stop once no path through unsettled nodes can beat the best found
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        d, node = heapq.heappop(queues[side])
+        if d > dist[side][node] or node in settled[side]:
+            continue
+        settled[side].add(node)
+        for neighbor, weight in adjacency[side].get(node, []):
+            nd = d + weight
+            if nd < dist[side].get(neighbor, inf):
+                dist[side][neighbor] = nd
+                pred[side][neighbor] = node
+                heapq.heappush(queues[side], (nd, neighbor))
+            other = dist[1 - side].get(neighbor)
+            if other is not None and nd + other < best:
+                best, meeting = nd + other, neighbor
+
+    if meeting is None:
+        return inf, []
+    forward = reconstruct_path(pred[0], meeting)
+    backward = reconstruct_path(pred[1], meeting)[::-1] # meeting -> target
+    return best, forward + backward[1:]
+
+def multi_source_dijkstra(graph, sources):
+    """
+    Distance from every node to its nearest source, and which source that is.
+    One search from all sources at once (e.g. nearest facility for every
+    customer) instead of one search per source.
+
+    Returns:
+        tuple: (distances, nearest) dicts; nearest[node] is None if unreachable.
+    """
+    distances = {node: float('inf') for node in graph}
+    nearest = {node: None for node in graph}
+    priority_queue = []
+    for source in sources:
+        distances[source] = 0
+        nearest[source] = source
+        priority_queue.append((0, source))
+    heapq.heapify(priority_queue)
+
+    while priority_queue:
+        current_distance, current_node = heapq.heappop(priority_queue)
+        if current_distance > distances[current_node]:
+            continue
+        for neighbor, weight in graph.get(current_node, []):
+            distance = current_distance + weight
+            if distance < distances.get(neighbor, float('inf')):
+                distances[neighbor] = distance
+                nearest[neighbor] = nearest[current_node]
+                heapq.heappush(priority_queue, (distance, neighbor))
+    return distances, nearest
+
+class ShortestPathQueryEngine:
+    def __init__(self, graph):
+        """
+        Answers many point-to-point queries on one static graph.
+
+        Node names are interned to integer ids once, and the forward and
+        backward adjacency become lists indexed by id. Per-query scratch
+        (distances, predecessors) lives in preallocated lists that are never
+        cleared: each entry carries the id of the query that last wrote it, so
+        starting a new query is O(1) instead of rebuilding a dict of every node.
+        """
+        names = list(graph)
+        for edges in graph.values():
+            for neighbor, _ in edges:
+                if neighbor not in graph:
+                    names.append(neighbor)
+        self.names = list(dict.fromkeys(names))
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        n = len(self.names)
+        self.forward = [[] for _ in range(n)]
+        self.backward = [[] for _ in range(n)]
+        for node, edges in graph.items():
+            u = self.ids[node]
+            for neighbor, weight in edges:
+                v = self.ids[neighbor]
+                self.forward[u].append((v, weight))
+                self.backward[v].append((u, weight))
+        # Scratch buffers, one set per search direction
+        self.dist = ([0] * n, [0] * n)
+        self.pred = ([-1] * n, [-1] * n)
+        self.stamp = ([0] * n, [0] * n) # Query id that last touched each entry
+        self.done = ([0] * n, [0] * n)  # Query id that settled each entry
+        self.query_id = 0
+
+    def query(self, start_node, target):
+        """
+        Bidirectional Dijkstra using the shared buffers. Returns (distance, path).
+        """
+        s, t = self.ids[start_node], self.ids[target]
+        if s == t:
+            return 0, [start_node]
+        self.query_id += 1
+        q = self.query_id
+        dist, pred, stamp, done = self.dist, self.pred, self.stamp, self.done
+        adjacency = (self.forward, self.backward)
+        for side, root in ((0, s), (1, t)):
+            dist[side][root], pred[side][root], stamp[side][root] = 0, -1, q
+        queues = ([(0, s)], [(0, t)])
+        best, meeting = float('inf'), -1
+
+        while queues[0] and queues[1]:
+            if queues[0][0][0] + queues[1][0][0] >= best:
+                break
+            side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+            d, u = heapq.heappop(queues[side])
+            my_dist, my_stamp, my_done = dist[side], stamp[side], done[side]
+            if my_done[u] == q or d > my_dist[u]:
+                continue
+            my_done[u] = q
+            other_dist, other_stamp = dist[1 - side], stamp[1 - side]
+            for v, weight in adjacency[side][u]:
+                nd = d + weight
+                if my_stamp[v] != q or nd < my_dist[v]:
+                    my_dist[v], pred[side][v], my_stamp[v] = nd, u, q
+                    heapq.heappush(queues[side], (nd, v))
+                if other_stamp[v] == q and nd + other_dist[v] < best:
+                    best, meeting = nd + other_dist[v], v
+
+        if meeting < 0:
+            return float('inf'), []
+        path = []
+        node = meeting
+        while node != -1:
+            path.append(node)
+            node = pred[0][node]
+        path.reverse()
+        node = pred[1][meeting]
+        while node != -1:
+            path.append(node)
+            node = pred[1][node]
+        return best, [self.names[i] for i in path]
+
+    def query_many(self, pairs):
+        """
+        Answers a batch of (start, target) pairs; returns a list of (distance, path).
+        """
+        return [self.query(s, t) for s, t in pairs]
+
 # Example Usage:
-graph1 = {
-    'A': [('B', 1), ('C', 4)],
-    'B': [('C', 2), ('D', 5)],
-    'C': [('D', 1)],
-    'D': []
-}
-print("Graph 1 Shortest Paths from A:", dijkstra(graph1, 'A'))
-# Expected: {'A': 0, 'B': 1, 'C': 3, 'D': 4}
-
-graph2 = {
-    'S': [('A', 10), ('C', 1)],
-    'A': [('B', 2)],
-    'B': [('D', 7)],
-    'C': [('A', 4), ('D', 8)],
-    'D': [('E', 3)],
-    'E': []
-}
-print("Graph 2 Shortest Paths from S:", dijkstra(graph2, 'S'))
-# Expected: {'S': 0, 'A': 5, 'B': 7, 'C': 1, 'D': 9, 'E': 12}
-
-graph3 = {
-    'X': [('Y', 7)],
-    'Y': [('Z', 2)],
-    'Z': []
-}
-print("Graph 3 Shortest Paths from X:", dijkstra(graph3, 'X'))
-# Expected: {'X': 0, 'Y': 7, 'Z': 9}
\ No newline at end of file
+if __name__ == "__main__":
+    graph1 = {
+        'A': [('B', 1), ('C', 4)],
+        'B': [('C', 2), ('D', 5)],
+        'C': [('D', 1)],
+        'D': []
+    }
+    print("Graph 1 Shortest Paths from A:", dijkstra(graph1, 'A'))
+    # Expected: {'A': 0, 'B': 1, 'C': 3, 'D': 4}
+
+    graph2 = {
+        'S': [('A', 10), ('C', 1)],
+        'A': [('B', 2)],
+        'B': [('D', 7)],
+        'C': [('A', 4), ('D', 8)],
+        'D': [('E', 3)],
+        'E': []
+    }
+    print("Graph 2 Shortest Paths from S:", dijkstra(graph2, 'S'))
+    # Expected: {'S': 0, 'A': 5, 'B': 7, 'C': 1, 'D': 9, 'E': 12}
+
+    graph3 = {
+        'X': [('Y', 7)],
+        'Y': [('Z', 2)],
+        'Z': []
+    }
+    print("Graph 3 Shortest Paths from X:", dijkstra(graph3, 'X'))
+    # Expected: {'X': 0, 'Y': 7, 'Z': 9}
+
+    distances, predecessors = dijkstra(graph2, 'S', target='D', return_predecessors=True)
+    print("\nEarly exit at D:", distances['D'], "via", reconstruct_path(predecessors, 'D'))
+    # Expected: 9 via ['S', 'C', 'D']
+    print("Bidirectional S -> E:", bidirectional_dijkstra(graph2, 'S', 'E'))
+    # Expected: (12, ['S', 'C', 'D', 'E'])
+    print("Nearest of {A, C} for every node:", multi_source_dijkstra(graph2, ['A', 'C'])[1])
+
+    engine = ShortestPathQueryEngine(graph2)
+    print("Batched queries:", engine.query_many([('S', 'E'), ('A', 'E'), ('E', 'S'), ('C', 'B')]))
+    # Expected: 12, 12, unreachable, 6
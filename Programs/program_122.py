@@ -1,61 +1,138 @@
+import random
+import sys
+import time
 from collections import deque
+from program_45 import FlowNetwork, ford_fulkerson
 
-def bfs(graph, s, t, parent):
-    visited = [False] * len(graph)
-    queue = deque()
-    queue.append(s)
-    visited[s] = True
-    parent[s] = -1
+def hopcroft_karp(adjacency, num_right):
+    """
+    Maximum bipartite matching in O(E sqrt(V)).
 
-    while queue:
-        u = queue.popleft()
-        for v in range(len(graph)):
-            if not visited[v] and graph[u][v] > 0:
-                queue.append(v)
-                visited[v] = True
-                parent[v] = u
-    return True if visited[t] else False
+    Each phase runs one BFS from all free left vertices to layer the graph,
+    then augments along a maximal set of vertex-disjoint shortest paths with
+    an iterative DFS, so deep graphs cannot hit the recursion limit.
 
-def ford_fulkerson(graph, s, t):
-    parent = [0] * len(graph)
-    max_flow = 0
-    
-    while bfs(graph, s, t, parent):
-        path_flow = float('inf')
-        v = t
-        while v != s:
-            u = parent[v]
-            path_flow = min(path_flow, graph[u][v])
-            v = parent[v]
+    Args:
+        adjacency (list): adjacency[u] lists the right vertices (0..num_right-1)
+                          left vertex u may be matched to.
+        num_right (int): Number of right vertices.
 
-        max_flow += path_flow
-        v = t
-        while v != s:
-            u = parent[v]
-            graph[u][v] -= path_flow
-            graph[v][u] += path_flow
-            v = parent[v]
-    
-    return max_flow
+    Returns:
+        tuple: (matching size, match_left) where match_left[u] is u's partner or -1.
+    """
+    num_left = len(adjacency)
+    match_left = [-1] * num_left
+    match_right = [-1] * num_right
+    size = 0
+
+    while True:
+        # BFS layers over left vertices, starting from every free one
+        dist = [-1] * num_left
+        queue = deque(u for u in range(num_left) if match_left[u] == -1)
+        for u in queue:
+            dist[u] = 0
+        found = False
+        while queue:
+            u = queue.popleft()
+            for v in adjacency[u]:
+                w = match_right[v]
+                if w == -1:
+                    found = True
+                elif dist[w] == -1:
+                    dist[w] = dist[u] + 1
+                    queue.append(w)
+        if not found:
+            return size, match_left
+
+        current = [0] * num_left
+        for root in range(num_left):
+            if match_left[root] != -1:
+                continue
+            stack = [root] # Left vertices on the path; chosen[i] links stack[i] to stack[i + 1]
+            chosen = []
+            while stack:
+                u = stack[-1]
+                edges = adjacency[u]
+                advanced = False
+                while current[u] < len(edges):
+                    v = edges[current[u]]
+                    current[u] += 1
+                    w = match_right[v]
+                    if w == -1:
+                        # Free right vertex: flip the whole path
+                        chosen.append(v)
+                        for left, right in zip(stack, chosen):
+                            match_left[left] = right
+                            match_right[right] = left
+                        size += 1
+                        stack = []
+                        advanced = True
+                        break
+                    if dist[w] == dist[u] + 1:
+                        chosen.append(v)
+                        stack.append(w)
+                        advanced = True
+                        break
+                if not advanced:
+                    dist[u] = -1 # No augmenting path through u in this phase
+                    stack.pop()
+                    if chosen:
+                        chosen.pop()
 
 def max_bipartite_matching(bipartite_graph):
+    """
+    Same input format as before: bipartite_graph[0][i][j] == 1 if left vertex i
+    may be matched to right vertex j, with len(bipartite_graph[1]) right vertices.
+    Returns the size of a maximum matching.
+    """
     u_count = len(bipartite_graph[0])
     v_count = len(bipartite_graph[1])
-    source = u_count + v_count
-    sink = u_count + v_count + 1
-    
-    flow_network = [[0] * (sink + 1) for _ in range(sink + 1)]
-    
-    for i in range(u_count):
-        flow_network[source][i] = 1
-        for j in range(v_count):
-            if bipartite_graph[0][i][j] == 1:
-                flow_network[i][u_count + j] = 1
-    
-    for i in range(v_count):
-        flow_network[u_count + i][sink] = 1
-        
-    return ford_fulkerson(flow_network, source, sink)
+    adjacency = [[j for j in range(v_count) if bipartite_graph[0][i][j] == 1] for i in range(u_count)]
+    return hopcroft_karp(adjacency, v_count)[0]
+
+# --- Benchmark ---
+def _matching_via_flow(adjacency, num_right):
+    # Unit-capacity flow network solved with Dinic, for comparison
+    num_left = len(adjacency)
+    source, sink = num_left + num_right, num_left + num_right + 1
+    network = FlowNetwork(num_left + num_right + 2)
+    for u, neighbours in enumerate(adjacency):
+        network.add_edge(source, u, 1)
+        for v in neighbours:
+            network.add_edge(u, num_left + v, 1)
+    for v in range(num_right):
+        network.add_edge(num_left + v, sink, 1)
+    return network.max_flow(source, sink)
+
+def run_benchmark(size=100_000, degree=5, dense_size=300):
+    from program_45 import _ford_fulkerson_dense
+    rng = random.Random(1)
+    adjacency = [rng.sample(range(size), degree) for _ in range(size)]
+    print(f"Random assignment problem: {size:,} x {size:,}, {size * degree:,} edges")
+
+    start = time.perf_counter()
+    matched, _ = hopcroft_karp(adjacency, size)
+    print(f"  Hopcroft-Karp:       {time.perf_counter() - start:6.2f} s, matching {matched:,}")
+    start = time.perf_counter()
+    matched = _matching_via_flow(adjacency, size)
+    print(f"  Dinic on flow graph: {time.perf_counter() - start:6.2f} s, matching {matched:,}")
+
+    # The original approach: a dense (2n + 2)^2 flow matrix and Edmonds-Karp
+    adjacency = [rng.sample(range(dense_size), degree) for _ in range(dense_size)]
+    n = 2 * dense_size + 2
+    network = [[0] * n for _ in range(n)]
+    for u, neighbours in enumerate(adjacency):
+        network[n - 2][u] = 1
+        network[dense_size + u][n - 1] = 1
+        for v in neighbours:
+            network[u][dense_size + v] = 1
+    print(f"{dense_size} x {dense_size}:")
+    start = time.perf_counter()
+    matched = _ford_fulkerson_dense(network, n - 2, n - 1)
+    print(f"  dense flow matrix:   {time.perf_counter() - start:6.2f} s, matching {matched}")
+    start = time.perf_counter()
+    matched, _ = hopcroft_karp(adjacency, dense_size)
+    print(f"  Hopcroft-Karp:       {time.perf_counter() - start:6.2f} s, matching {matched}")
 
 if __name__ == '__main__':
     bipartite_graph = [
@@ -70,4 +147,13 @@ if __name__ == '__main__':
             [0, 1, 0, 0, 1]
         ]
     ]
-    print(f"Maximum matching is {max_bipartite_matching(bipartite_graph)}")
\ No newline at end of file
+    print(f"Maximum matching is {max_bipartite_matching(bipartite_graph)}")
+
+    jobs = [[0, 1], [0], [1, 2], [2, 3]]
+    size, match_left = hopcroft_karp(jobs, 4)
+    print(f"Workers -> jobs: {match_left} ({size} matched)")
+    # Expected: 4 matched, e.g. [1, 0, 2, 3]
+
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        print()
+        run_benchmark()
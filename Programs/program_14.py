@@ -1,4 +1,4 @@
-from collections import deque
+from program_356 import GridMap
 
 def solve_maze_bfs(maze, start, end):
     """
@@ -14,27 +14,12 @@ def solve_maze_bfs(maze, start, end):
     if not (0 <= end[0] < rows and 0 <= end[1] < cols and maze[end[0]][end[1]] == 0):
         return False
 
-    queue = deque([(start, [start])]) # (current_position, path_taken_to_reach_current_position)
-    visited = set([start])
-
-    directions = [(0, 1), (0, -1), (1, 0), (-1, 0)] # Right, Left, Down, Up
-
-    while queue:
-        (r, c), path = queue.popleft()
-
-        if (r, c) == end:
-            print(f"Path found: {path}")
-            return True
-
-        for dr, dc in directions:
-            nr, nc = r + dr, c + dc
-
-            # Check boundaries and if it's a valid path (0) and not visited
-            if 0 <= nr < rows and 0 <= nc < cols and maze[nr][nc] == 0 and (nr, nc) not in visited:
-                visited.add((nr, nc))
-                queue.append(((nr, nc), path + [(nr, nc)])) # Extend the path
-
-    return False
+    # One predecessor byte per cell instead of a copied path per queued cell, see program_356
+    path = GridMap.from_lists(maze).bfs_path(start, end)
+    if path is None:
+        return False
+    print(f"Path found: {path}")
+    return True
 
 # Solution (using DFS - simpler to implement for existence, but not necessarily shortest)
 def solve_maze_dfs(maze, start, end):
@@ -71,33 +56,34 @@ def solve_maze_dfs(maze, start, end):
 
     return dfs(start[0], start[1])
 
-maze1 = [
-    [0, 0, 1, 0, 0],
-    [0, 0, 0, 0, 0],
-    [0, 0, 1, 0, 0],
-    [0, 1, 0, 0, 0],
-    [0, 0, 0, 1, 0]
-]
-
-start1 = (0, 4)
-end1 = (4, 4)
-print(f"Maze 1 (BFS) - Path from {start1} to {end1}: {solve_maze_bfs(maze1, start1, end1)}") # True
-
-start2 = (0, 0)
-end2 = (0, 2) # A wall
-print(f"Maze 1 (BFS) - Path from {start2} to {end2}: {solve_maze_bfs(maze1, start2, end2)}") # False
-
-maze2 = [
-    [0, 1, 0, 0, 0],
-    [0, 1, 0, 1, 0],
-    [0, 0, 0, 1, 0],
-    [1, 1, 0, 1, 0],
-    [0, 0, 0, 0, 0]
-]
-start3 = (0, 0)
-end3 = (4, 4)
-print(f"\nMaze 2 (BFS) - Path from {start3} to {end3}: {solve_maze_bfs(maze2, start3, end3)}") # True
-
-print(f"\nMaze 1 (DFS) - Path from {start1} to {end1}: {solve_maze_dfs(maze1, start1, end1)}") # True
-print(f"Maze 1 (DFS) - Path from {start2} to {end2}: {solve_maze_dfs(maze1, start2, end2)}") # False
-print(f"Maze 2 (DFS) - Path from {start3} to {end3}: {solve_maze_dfs(maze2, start3, end3)}") # True
\ No newline at end of file
+if __name__ == "__main__":
+    maze1 = [
+        [0, 0, 1, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 0, 1, 0, 0],
+        [0, 1, 0, 0, 0],
+        [0, 0, 0, 1, 0]
+    ]
+
+    start1 = (0, 4)
+    end1 = (4, 4)
+    print(f"Maze 1 (BFS) - Path from {start1} to {end1}: {solve_maze_bfs(maze1, start1, end1)}") # True
+
+    start2 = (0, 0)
+    end2 = (0, 2) # A wall
+    print(f"Maze 1 (BFS) - Path from {start2} to {end2}: {solve_maze_bfs(maze1, start2, end2)}") # False
+
+    maze2 = [
+        [0, 1, 0, 0, 0],
+        [0, 1, 0, 1, 0],
+        [0, 0, 0, 1, 0],
+        [1, 1, 0, 1, 0],
+        [0, 0, 0, 0, 0]
+    ]
+    start3 = (0, 0)
+    end3 = (4, 4)
+    print(f"\nMaze 2 (BFS) - Path from {start3} to {end3}: {solve_maze_bfs(maze2, start3, end3)}") # True
+
+    print(f"\nMaze 1 (DFS) - Path from {start1} to {end1}: {solve_maze_dfs(maze1, start1, end1)}") # True
+    print(f"Maze 1 (DFS) - Path from {start2} to {end2}: {solve_maze_dfs(maze1, start2, end2)}") # False
+    print(f"Maze 2 (DFS) - Path from {start3} to {end3}: {solve_maze_dfs(maze2, start3, end3)}") # True
\ No newline at end of file
@@ -1,14 +1,241 @@
+import sys
+import time
+import numpy as np
+
+def _initial_next_hop(distances):
+    """next_hop[i][j] = j for every direct edge, i on the diagonal, -1 if unreachable."""
+    n = len(distances)
+    next_hop = np.where(np.isfinite(distances), np.arange(n)[None, :], -1)
+    np.fill_diagonal(next_hop, np.arange(n))
+    return next_hop
+
+def floyd_warshall_numpy(graph):
+    """
+    All-pairs shortest paths. For each intermediate vertex k the whole matrix
+    is relaxed at once by broadcasting column k against row k, so the only
+    Python-level loop is over k.
+
+    Args:
+        graph: n x n adjacency matrix (list of lists or array); inf for no edge.
+
+    Returns:
+        tuple: (distances, next_hop) as NumPy arrays. next_hop[i][j] is the
+               vertex after i on a shortest i -> j path, or -1 if unreachable;
+               see `reconstruct_path`.
+    """
+    distances = np.array(graph, dtype=np.float64)
+    next_hop = _initial_next_hop(distances)
+    via = np.empty_like(distances) # Reused every k instead of allocating n x n temporaries
+    better = np.empty(distances.shape, dtype=bool)
+    for k in range(len(distances)):
+        np.add(distances[:, k, None], distances[None, k, :], out=via)
+        np.less(via, distances, out=better)
+        np.copyto(distances, via, where=better)
+        np.copyto(next_hop, next_hop[:, k, None], where=better)
+    return distances, next_hop
+
+def _relax_tile(dist, nxt, col, col_next, row, block_rows, hops=None):
+    """
+    Relaxes dist (a tile) through each k of the current block: col[:, k] holds
+    distances from the tile's rows to k, row[k, :] those from k to its columns.
+    block_rows lets the row and column panels pass themselves in as `row`/`col`.
+    hops, if given, is (tile, col, row) edge counts of the same slices; equal
+    distances are then broken by fewer edges.
+    """
+    for k in range(block_rows):
+        via = col[:, k, None] + row[None, k, :]
+        better = via < dist
+        if hops is not None:
+            tile_hops, col_hops, row_hops = hops
+            via_hops = col_hops[:, k, None] + row_hops[None, k, :]
+            better |= (via == dist) & (via_hops < tile_hops)
+            np.copyto(tile_hops, via_hops, where=better)
+        np.copyto(dist, via, where=better)
+        np.copyto(nxt, col_next[:, k, None], where=better)
+
+def floyd_warshall_blocked(graph, block_size=256):
+    """
+    Cache-blocked Floyd-Warshall with the same results as floyd_warshall_numpy.
+
+    The matrix is split into block_size x block_size tiles. For each diagonal
+    block: close the diagonal tile, then relax its row and column panels
+    through it, then every remaining tile through its panel row and column.
+    Each inner step only touches three tiles, so the working set stays in
+    cache instead of streaming the full n x n matrix once per k.
+
+    Tiles are relaxed out of k order, so with zero-weight cycles a tie could
+    leave next_hop pointing around the cycle. If any edge weighs zero or less,
+    the number of edges on each path is tracked too and ties go to the path
+    with fewer edges, so following next_hop always shrinks (distance, edges).
+    """
+    distances = np.array(graph, dtype=np.float64)
+    next_hop = _initial_next_hop(distances)
+    n = len(distances)
+    bounds = [(start, min(start + block_size, n)) for start in range(0, n, block_size)]
+    hops = None
+    if np.any(distances[~np.eye(n, dtype=bool)] <= 0):
+        hops = np.where(np.isfinite(distances), 1, n) # n marks unreachable; it never wins a tie
+        np.fill_diagonal(hops, 0)
+
+    def hop_tiles(*tiles):
+        # Edge counts of the given (rows, cols) slices, in _relax_tile's (tile, col, row) order
+        return None if hops is None else tuple(hops[rows, cols] for rows, cols in tiles)
+
+    every = slice(None)
+    for kb0, kb1 in bounds:
+        size = kb1 - kb0
+        block = slice(kb0, kb1)
+        diag, diag_next = distances[block, block], next_hop[block, block]
+        # Phase 1: diagonal tile through itself
+        _relax_tile(diag, diag_next, diag, diag_next, diag, size,
+                    hop_tiles((block, block), (block, block), (block, block)))
+        # Phase 2: row panel and column panel through the diagonal tile
+        row_panel, row_next = distances[block, :], next_hop[block, :]
+        _relax_tile(row_panel, row_next, diag, diag_next, row_panel, size,
+                    hop_tiles((block, every), (block, block), (block, every)))
+        col_panel, col_next = distances[:, block], next_hop[:, block]
+        _relax_tile(col_panel, col_next, col_panel, col_next, diag, size,
+                    hop_tiles((every, block), (every, block), (block, block)))
+        # Phase 3: every other tile through its slices of both panels
+        for i0, i1 in bounds:
+            if i0 == kb0:
+                continue
+            for j0, j1 in bounds:
+                if j0 == kb0:
+                    continue
+                rows, cols = slice(i0, i1), slice(j0, j1)
+                _relax_tile(distances[rows, cols], next_hop[rows, cols],
+                            distances[rows, block], next_hop[rows, block],
+                            distances[block, cols], size,
+                            hop_tiles((rows, cols), (rows, block), (block, cols)))
+    return distances, next_hop
+
+def johnson(num_vertices, edges):
+    """
+    All-pairs shortest paths for sparse graphs: O(V E log V) instead of O(V^3).
+
+    Bellman-Ford (program_53, SPFA mode) from a virtual source gives a
+    potential h with w(u, v) + h[u] - h[v] >= 0 for every edge, so the existing
+    Dijkstra from program_10 can then run once per vertex on the reweighted graph.
+
+    Args:
+        num_vertices (int): Vertices are 0..num_vertices-1.
+        edges (list): (u, v, weight) tuples; weights may be negative.
+
+    Returns:
+        tuple: (distances, next_hop) NumPy arrays, as floyd_warshall_numpy.
+
+    Raises:
+        ValueError: If the graph contains a negative cycle.
+    """
+    from program_10 import dijkstra
+    from program_53 import bellman_ford
+
+    virtual = num_vertices
+    potentials, cycle = bellman_ford(list(edges) + [(virtual, v, 0) for v in range(num_vertices)],
+                                     num_vertices + 1, virtual, mode="spfa")
+    if potentials is None:
+        raise ValueError(f"Negative cycle: {cycle}")
+    h = [potentials[v] for v in range(num_vertices)]
+
+    graph = {v: [] for v in range(num_vertices)}
+    for u, v, weight in edges:
+        graph[u].append((v, weight + h[u] - h[v]))
+
+    distances = np.full((num_vertices, num_vertices), np.inf)
+    next_hop = np.full((num_vertices, num_vertices), -1, dtype=np.int64)
+    for s in range(num_vertices):
+        reweighted, predecessors = dijkstra(graph, s, return_predecessors=True)
+        first_hop = {s: s}
+        for v, d in reweighted.items():
+            if d == float('inf'):
+                continue
+            distances[s, v] = d - h[s] + h[v]
+            # Walk up to the first vertex whose first hop is known, then fill in the walk
+            walk = []
+            node = v
+            while node not in first_hop:
+                walk.append(node)
+                node = predecessors[node]
+            hop = first_hop[node]
+            for w in reversed(walk):
+                hop = w if hop == s else hop
+                first_hop[w] = hop
+            next_hop[s, v] = first_hop[v]
+    return distances, next_hop
+
+def reconstruct_path(next_hop, start, end):
+    """
+    Vertices of a shortest start -> end path from a next_hop matrix, [] if unreachable.
+
+    Raises:
+        ValueError: If next_hop does not reach `end` within n steps, i.e. it
+                    does not describe shortest paths.
+    """
+    if next_hop[start][end] == -1:
+        return []
+    path = [start]
+    while start != end:
+        if len(path) > len(next_hop):
+            raise ValueError(f"next_hop loops on the path from {path[0]} to {end}.")
+        start = int(next_hop[start][end])
+        path.append(start)
+    return path
+
 def floyd_warshall(graph):
+    """
+    Same contract as before: returns the n x n distance matrix as lists of
+    lists. Delegates to the NumPy implementation.
+    """
+    return floyd_warshall_numpy(graph)[0].tolist()
+
+# --- Benchmark ---
+def _floyd_warshall_loops(graph):
+    # The original triple loop, kept as the baseline
     n = len(graph)
     distances = [row[:] for row in graph]
-
     for k in range(n):
         for i in range(n):
             for j in range(n):
                 distances[i][j] = min(distances[i][j], distances[i][k] + distances[k][j])
-    
     return distances
 
+def run_benchmark(n=2048, loop_n=128, sparse_n=1000, avg_degree=4):
+    rng = np.random.default_rng(0)
+
+    matrix = np.where(rng.random((loop_n, loop_n)) < 0.1, rng.integers(1, 100, (loop_n, loop_n)), np.inf)
+    np.fill_diagonal(matrix, 0)
+    start = time.perf_counter()
+    _floyd_warshall_loops(matrix.tolist())
+    loops = time.perf_counter() - start
+    print(f"n={loop_n}: triple loop {loops:.2f} s (O(n^3): ~{loops * (n / loop_n) ** 3 / 3600:.1f} h at n={n})")
+
+    matrix = np.where(rng.random((n, n)) < 0.01, rng.integers(1, 100, (n, n)), np.inf)
+    np.fill_diagonal(matrix, 0)
+    start = time.perf_counter()
+    dense, dense_next = floyd_warshall_numpy(matrix)
+    print(f"n={n}: NumPy broadcast  {time.perf_counter() - start:6.2f} s")
+    for block_size in (128, 256, 512):
+        start = time.perf_counter()
+        blocked, blocked_next = floyd_warshall_blocked(matrix, block_size)
+        print(f"n={n}: blocked ({block_size:>3})   {time.perf_counter() - start:6.2f} s, "
+              f"same distances: {np.array_equal(dense, blocked)}")
+
+    m = sparse_n * avg_degree
+    edges = list(zip(rng.integers(0, sparse_n, m).tolist(), rng.integers(0, sparse_n, m).tolist(),
+                     rng.integers(1, 100, m).tolist()))
+    matrix = np.full((sparse_n, sparse_n), np.inf)
+    np.fill_diagonal(matrix, 0)
+    for u, v, w in edges:
+        matrix[u, v] = min(matrix[u, v], w)
+    start = time.perf_counter()
+    dense, _ = floyd_warshall_numpy(matrix)
+    print(f"sparse n={sparse_n}, m={m}: NumPy Floyd-Warshall {time.perf_counter() - start:6.2f} s")
+    start = time.perf_counter()
+    sparse, _ = johnson(sparse_n, edges)
+    print(f"sparse n={sparse_n}, m={m}: Johnson              {time.perf_counter() - start:6.2f} s, "
+          f"same distances: {np.array_equal(dense, sparse)}")
+
 if __name__ == '__main__':
     inf = float('inf')
     graph = [
@@ -17,7 +244,22 @@ if __name__ == '__main__':
         [inf, inf, 0, 1],
         [inf, inf, inf, 0]
     ]
-    
+
     shortest_paths = floyd_warshall(graph)
     for row in shortest_paths:
-        print(row)
\ No newline at end of file
+        print(row)
+
+    distances, next_hop = floyd_warshall_blocked(graph, block_size=2)
+    print("Path 0 -> 3:", reconstruct_path(next_hop, 0, 3), "length", distances[0][3])
+    # Expected: [0, 1, 2, 3] length 9.0
+
+    edges = [(0, 1, -1), (0, 2, 4), (1, 2, 3), (1, 3, 2), (1, 4, 2), (3, 2, 5), (3, 1, 1), (4, 3, -3)]
+    distances, next_hop = johnson(5, edges)
+    print("Johnson from 0:", distances[0].tolist())
+    # Expected: [0.0, -1.0, 2.0, -2.0, 1.0]
+    print("Path 0 -> 2:", reconstruct_path(next_hop, 0, 2))
+    # Expected: [0, 1, 2]
+
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        print()
+        run_benchmark()
@@ -1,42 +1,4 @@
-from collections import deque
-
-def bfs(graph, s, t, parent):
-    visited = [False] * len(graph)
-    queue = deque()
-    queue.append(s)
-    visited[s] = True
-    parent[s] = -1
-
-    while queue:
-        u = queue.popleft()
-        for v in range(len(graph)):
-            if not visited[v] and graph[u][v] > 0:
-                queue.append(v)
-                visited[v] = True
-                parent[v] = u
-    return True if visited[t] else False
-
-def ford_fulkerson(graph, s, t):
-    parent = [0] * len(graph)
-    max_flow = 0
-    
-    while bfs(graph, s, t, parent):
-        path_flow = float('inf')
-        v = t
-        while v != s:
-            u = parent[v]
-            path_flow = min(path_flow, graph[u][v])
-            v = parent[v]
-
-        max_flow += path_flow
-        v = t
-        while v != s:
-            u = parent[v]
-            graph[u][v] -= path_flow
-            graph[v][u] += path_flow
-            v = parent[v]
-    
-    return max_flow
+from program_45 import FlowNetwork, ford_fulkerson, max_flow_min_cut
 
 if __name__ == '__main__':
     capacity = [
@@ -49,4 +11,6 @@ if __name__ == '__main__':
     ]
     source = 0
     sink = 5
-    print(f"The maximum possible flow is {ford_fulkerson(capacity, source, sink)}")
\ No newline at end of file
+    print(f"The maximum possible flow is {ford_fulkerson(capacity, source, sink)}")
+    flow, source_side, cut_edges = max_flow_min_cut(capacity, source, sink)
+    print(f"Min cut: source side {sorted(source_side)}, edges {cut_edges}")
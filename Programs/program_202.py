@@ -1,13 +1,4 @@
-def floyd_warshall(graph):
-    n = len(graph)
-    distances = [row[:] for row in graph]
-
-    for k in range(n):
-        for i in range(n):
-            for j in range(n):
-                distances[i][j] = min(distances[i][j], distances[i][k] + distances[k][j])
-    
-    return distances
+from program_183 import floyd_warshall, floyd_warshall_numpy, floyd_warshall_blocked, johnson, reconstruct_path
 
 if __name__ == '__main__':
     inf = float('inf')
@@ -20,4 +11,7 @@ if __name__ == '__main__':
     
     shortest_paths = floyd_warshall(graph)
     for row in shortest_paths:
-        print(row)
\ No newline at end of file
+        print(row)
+
+    distances, next_hop = floyd_warshall_numpy(graph)
+    print("Path 0 -> 3:", reconstruct_path(next_hop, 0, 3))
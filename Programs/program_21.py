@@ -1,4 +1,4 @@
-import heapq
+from program_356 import GridMap
 
 def a_star_search(grid, start, end):
     """
@@ -23,53 +23,8 @@ def a_star_search(grid, start, end):
         print(f"Invalid end point: {end} or it's an obstacle.")
         return None
     
-    # Priority queue: (f_score, g_score, current_node)
-    # The g_score is included for tie-breaking, preferring shorter paths in case of equal f_scores.
-    open_set = [(0, 0, start)] # (f_score, g_score, node)
-
-    # g_score[node] is the cost of the cheapest path from start to node currently known
-    g_score = { (r, c): float('inf') for r in range(rows) for c in range(cols) }
-    g_score[start] = 0
-
-    # came_from[node] is the node immediately preceding it on the cheapest path found so far
-    came_from = {}
-
-    # Heuristic function (Manhattan distance)
-    def heuristic(node_a, node_b):
-        return abs(node_a[0] - node_b[0]) + abs(node_a[1] - node_b[1])
-
-    # Possible movements (up, down, left, right)
-    directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-
-    while open_set:
-        current_f, current_g, current_node = heapq.heappop(open_set)
-
-        if current_node == end:
-            # Reconstruct path
-            path = []
-            while current_node in came_from:
-                path.append(current_node)
-                current_node = came_from[current_node]
-            path.append(start)
-            return path[::-1] # Reverse to get path from start to end
-
-        for dr, dc in directions:
-            neighbor = (current_node[0] + dr, current_node[1] + dc)
-            
-            # Check if neighbor is within grid bounds and not an obstacle
-            if (0 <= neighbor[0] < rows and
-                0 <= neighbor[1] < cols and
-                grid[neighbor[0]][neighbor[1]] == 0):
-
-                tentative_g_score = g_score[current_node] + 1 # Cost to move to neighbor is 1
-
-                if tentative_g_score < g_score[neighbor]:
-                    came_from[neighbor] = current_node
-                    g_score[neighbor] = tentative_g_score
-                    f_score = tentative_g_score + heuristic(neighbor, end)
-                    heapq.heappush(open_set, (f_score, tentative_g_score, neighbor))
-    
-    return None # No path found
+    # Flat grid with array-backed g-scores and predecessors, see program_356
+    return GridMap.from_lists(grid).astar(start, end)
 
 # Function to print the path on the grid (optional for visualization)
 def print_path_on_grid(grid, path):
@@ -100,43 +55,44 @@ def print_path_on_grid(grid, path):
         print() # New line for each row
 
 # Example Usage:
-grid1 = [
-    [0, 0, 0, 0, 0],
-    [0, 1, 1, 1, 0],
-    [0, 0, 0, 1, 0],
-    [0, 1, 0, 0, 0],
-    [0, 0, 0, 0, 0]
-]
-
-start1 = (0, 0)
-end1 = (4, 4)
-print("--- Grid 1 Path ---")
-path1 = a_star_search(grid1, start1, end1)
-print(f"Path from {start1} to {end1}: {path1}")
-print_path_on_grid(grid1, path1)
-
-print("\n--- Grid 2 Path (No Path) ---")
-grid2 = [
-    [0, 0, 0, 0, 0],
-    [0, 1, 1, 1, 0],
-    [0, 1, 0, 1, 0],
-    [0, 1, 1, 1, 0],
-    [0, 0, 0, 0, 0]
-]
-start2 = (0, 0)
-end2 = (4, 4)
-path2 = a_star_search(grid2, start2, end2)
-print(f"Path from {start2} to {end2}: {path2}")
-print_path_on_grid(grid2, path2)
-
-print("\n--- Grid 3 Path (Short Path) ---")
-grid3 = [
-    [0, 0, 0],
-    [0, 1, 0],
-    [0, 0, 0]
-]
-start3 = (0, 0)
-end3 = (2, 2)
-path3 = a_star_search(grid3, start3, end3)
-print(f"Path from {start3} to {end3}: {path3}")
-print_path_on_grid(grid3, path3)
\ No newline at end of file
+if __name__ == "__main__":
+    grid1 = [
+        [0, 0, 0, 0, 0],
+        [0, 1, 1, 1, 0],
+        [0, 0, 0, 1, 0],
+        [0, 1, 0, 0, 0],
+        [0, 0, 0, 0, 0]
+    ]
+
+    start1 = (0, 0)
+    end1 = (4, 4)
+    print("--- Grid 1 Path ---")
+    path1 = a_star_search(grid1, start1, end1)
+    print(f"Path from {start1} to {end1}: {path1}")
+    print_path_on_grid(grid1, path1)
+
+    print("\n--- Grid 2 Path (No Path) ---")
+    grid2 = [
+        [0, 0, 0, 0, 0],
+        [0, 1, 1, 1, 0],
+        [0, 1, 0, 1, 0],
+        [0, 1, 1, 1, 0],
+        [0, 0, 0, 0, 0]
+    ]
+    start2 = (0, 0)
+    end2 = (4, 4)
+    path2 = a_star_search(grid2, start2, end2)
+    print(f"Path from {start2} to {end2}: {path2}")
+    print_path_on_grid(grid2, path2)
+
+    print("\n--- Grid 3 Path (Short Path) ---")
+    grid3 = [
+        [0, 0, 0],
+        [0, 1, 0],
+        [0, 0, 0]
+    ]
+    start3 = (0, 0)
+    end3 = (2, 2)
+    path3 = a_star_search(grid3, start3, end3)
+    print(f"Path from {start3} to {end3}: {path3}")
+    print_path_on_grid(grid3, path3)
\ No newline at end of file
@@ -1,3 +1,7 @@
+import time
+from array import array
+import numpy as np
+
 class DisjointSetUnion:
     def __init__(self, elements):
         """
@@ -20,16 +24,17 @@ class DisjointSetUnion:
     def find(self, element):
         """
         Finds the representative (root) of the set containing 'element'.
-        Implements Path Compression.
+        Implements Path Halving: iterative, so long chains cannot hit the
+        recursion limit, and every visited node is re-pointed to its grandparent.
         """
         if element not in self.parent:
             raise ValueError(f"Element '{element}' not found in any set.")
 
-        # If element is not its own parent, it's not the root
-        if self.parent[element] != element:
-            # Recursively find the root and compress the path
-            self.parent[element] = self.find(self.parent[element])
-        return self.parent[element]
+        parent = self.parent
+        while parent[element] != element:
+            parent[element] = parent[parent[element]]
+            element = parent[element]
+        return element
 
     def union(self, element1, element2):
         """
@@ -72,6 +77,120 @@ class DisjointSetUnion:
             sets[root].append(element)
         return sets
 
+class IntDisjointSetUnion:
+    def __init__(self, n):
+        """
+        DSU over the integer ids 0..n-1, backed by flat arrays instead of dicts.
+
+        parent/rank live in `array('i')`/`array('b')` (4 + 1 bytes per element,
+        versus ~200 for two dict entries). `parent` is shared with NumPy without
+        copying, so `union_many` can merge millions of pairs in vectorized passes.
+        Drop-in for the list-based DSU(n) used by Kruskal in program_338.
+        Args:
+            n (int): Number of elements.
+        """
+        self.n = n
+        self.parent = array('i', range(n))
+        self.rank = array('b', bytes(n))
+        self.num_sets = n
+
+    def find(self, i):
+        """Returns the root of i's set, halving the path on the way up."""
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i, j):
+        """
+        Union by rank. Returns True if a union occurred, False if i and j were
+        already in the same set.
+        """
+        root_i = self.find(i)
+        root_j = self.find(j)
+        if root_i == root_j:
+            return False
+        rank = self.rank
+        if rank[root_i] < rank[root_j]:
+            root_i, root_j = root_j, root_i
+        self.parent[root_j] = root_i
+        if rank[root_i] == rank[root_j]:
+            rank[root_i] += 1
+        self.num_sets -= 1
+        return True
+
+    def connected(self, i, j):
+        return self.find(i) == self.find(j)
+
+    def union_many(self, pairs):
+        """
+        Merges every (i, j) pair and returns the number of unions performed.
+
+        A NumPy array of shape (m, 2) is processed with whole-array operations
+        (see `connected_components`); any other iterable is merged pair by pair.
+        """
+        if not isinstance(pairs, np.ndarray):
+            before = self.num_sets
+            union = self.union
+            for i, j in pairs:
+                union(i, j)
+            return before - self.num_sets
+
+        parent = np.frombuffer(self.parent, dtype=np.int32)
+        nodes = np.arange(self.n, dtype=np.int32)
+        # Existing trees are just more edges: (i, parent[i])
+        u = np.concatenate((pairs[:, 0].astype(np.int32, copy=False), nodes))
+        v = np.concatenate((pairs[:, 1].astype(np.int32, copy=False), parent))
+        labels = connected_components(self.n, u, v)
+        parent[:] = labels # Every element now points straight at its root
+        is_root = labels == nodes
+        rank = np.frombuffer(self.rank, dtype=np.int8)
+        rank[:] = 0
+        rank[labels[~is_root]] = 1 # Flat trees: every non-trivial root has height 1
+        before = self.num_sets
+        self.num_sets = int(is_root.sum())
+        return before - self.num_sets
+
+    def get_sets(self):
+        """Returns {root: [members]}, like DisjointSetUnion.get_sets."""
+        sets = {}
+        for element in range(self.n):
+            sets.setdefault(self.find(element), []).append(element)
+        return sets
+
+def connected_components(num_nodes, u, v):
+    """
+    Vectorized connected components of an edge list.
+
+    Alternates two whole-array steps until no edge joins different labels:
+    hooking (each label adopts the smallest label across its edges, via
+    np.minimum.at) and pointer jumping (labels = labels[labels]) to flatten the
+    resulting trees. Labels only ever decrease, so there are no cycles.
+    Args:
+        num_nodes (int): Nodes are 0..num_nodes-1.
+        u, v (array-like): Edge endpoints, same length.
+    Returns:
+        np.ndarray: label per node, equal to the smallest node id in its component.
+    """
+    labels = np.arange(num_nodes, dtype=np.int32)
+    u = np.asarray(u, dtype=np.int32)
+    v = np.asarray(v, dtype=np.int32)
+    while True:
+        lu, lv = labels[u], labels[v]
+        crossing = lu != lv
+        if not crossing.any():
+            return labels
+        lu, lv = lu[crossing], lv[crossing]
+        # Keep only edges that still matter for the next round
+        u, v = u[crossing], v[crossing]
+        np.minimum.at(labels, np.maximum(lu, lv), np.minimum(lu, lv))
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
 # Example Usage:
 if __name__ == "__main__":
     elements = ['A', 'B', 'C', 'D', 'E', 'F', 'G']
@@ -80,7 +199,7 @@ if __name__ == "__main__":
     print("Initial sets:", dsu.get_sets())
 
     dsu.union('A', 'B')
-    print("\nUnion A, B:", ddsu.get_sets()) # A-B
+    print("\nUnion A, B:", dsu.get_sets()) # A-B
 
     dsu.union('B', 'C')
     print("Union B, C:", dsu.get_sets()) # A-B-C
@@ -109,4 +228,35 @@ if __name__ == "__main__":
     dsu.add_element('H')
     print("\nAdded H:", dsu.get_sets())
     dsu.union('H', 'A')
-    print("Union H, A:", dsu.get_sets())
\ No newline at end of file
+    print("Union H, A:", dsu.get_sets())
+
+    # Long chains no longer hit the recursion limit
+    chain = DisjointSetUnion(range(200000))
+    for i in range(199999):
+        chain.parent[i] = i + 1 # Worst-case chain, built without union-by-rank
+    print("\nRoot of a 200000-long chain:", chain.find(0))
+
+    print("\n--- Integer DSU on a random graph ---")
+    n, m = 1_000_000, 1_500_000
+    rng = np.random.default_rng(0)
+    edges = rng.integers(0, n, size=(m, 2), dtype=np.int32)
+
+    start = time.perf_counter()
+    labels = connected_components(n, edges[:, 0], edges[:, 1])
+    print(f"connected_components: {len(np.unique(labels))} components in {time.perf_counter() - start:.2f} s")
+
+    int_dsu = IntDisjointSetUnion(n)
+    start = time.perf_counter()
+    merged = int_dsu.union_many(edges)
+    print(f"union_many (NumPy):   {merged} unions, {int_dsu.num_sets} sets in {time.perf_counter() - start:.2f} s")
+
+    loop_dsu = IntDisjointSetUnion(n)
+    start = time.perf_counter()
+    loop_dsu.union_many(edges.tolist())
+    print(f"union_many (loop):    {loop_dsu.num_sets} sets in {time.perf_counter() - start:.2f} s")
+
+    dict_dsu = DisjointSetUnion(range(n))
+    start = time.perf_counter()
+    for a, b in edges.tolist():
+        dict_dsu.union(a, b)
+    print(f"DisjointSetUnion:     {len(dict_dsu.get_sets())} sets in {time.perf_counter() - start:.2f} s")
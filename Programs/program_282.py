@@ -1,23 +1,222 @@
+import sys
+import time
+import tracemalloc
+from array import array
+
 class State:
     def __init__(self, length, link=None):
         self.length = length
         self.link = link # Suffix link
         self.next = {}   # Transition map (char -> State)
 
+SHIFT = 21 # Transition keys are (state << SHIFT) | code point; every Unicode code point fits in 21 bits
+
 class SuffixAutomaton:
+    def __init__(self, max_states=None, overlap=0):
+        """
+        Suffix automaton stored as parallel arrays.
+
+        State s has `length[s]`, suffix `link[s]` and `endpos[s]` (1 for
+        states created by extend, 0 for clones; summed up the link tree by
+        `occurrence_counts`). All transitions share one dict keyed by the
+        integer (s << SHIFT) | symbol, so no state owns a dict. A state's
+        symbols are also chained through `first_edge`/`edge_symbol`/`edge_next`
+        so that cloning can copy them without scanning the table.
+
+        Args:
+            max_states (int | None): Memory budget. When the automaton reaches
+                this many states it is rebuilt from the last `overlap`
+                characters, so it always covers a recent window of the
+                stream and memory stays bounded however long the stream is.
+                None keeps everything.
+            overlap (int): Characters carried over on a rebuild; patterns up to
+                this long are still found across a rebuild boundary.
+        """
+        if max_states is not None and max_states <= 2 * overlap + 2:
+            raise ValueError("max_states must leave room for more than the overlap.")
+        self.max_states = max_states
+        self.overlap = overlap
+        self.consumed = 0 # Characters fed so far
+        self.window_start = 0 # Stream offset of the first character the automaton covers
+        self.rebuilds = 0
+        self._recent = None # Last `overlap` characters fed, carried into a rebuild
+        self._reset()
+
+    def _reset(self):
+        self.length = array('i', [0])
+        self.link = array('i', [-1])
+        self.endpos = array('i', [0])
+        self.first_edge = array('i', [-1])
+        self.edge_symbol = array('i')
+        self.edge_next = array('i')
+        self.transitions = {}
+        self.last = 0
+        self.root = 0
+        self._counts = None
+
+    @property
+    def size(self):
+        return len(self.length)
+
+    def feed(self, chunk):
+        """
+        Appends a chunk (str, or bytes for a byte alphabet) to the indexed
+        text. Amortized O(1) per character.
+        """
+        length, link, endpos = self.length, self.link, self.endpos
+        first_edge, edge_symbol, edge_next = self.first_edge, self.edge_symbol, self.edge_next
+        transitions = self.transitions
+        last = self.last
+        budget = self.max_states
+        self._counts = None
+        if self._recent is None:
+            self._recent = chunk[:0]
+        done = 0 # chunk[:done] is already counted in `consumed`
+
+        for position, char in enumerate(chunk):
+            symbol = ord(char) if isinstance(char, str) else char
+            cur = len(length)
+            length.append(length[last] + 1)
+            link.append(0)
+            endpos.append(1)
+            first_edge.append(-1)
+            p = last
+            while p != -1:
+                key = (p << SHIFT) | symbol
+                if key in transitions:
+                    break
+                transitions[key] = cur
+                edge_symbol.append(symbol)
+                edge_next.append(first_edge[p])
+                first_edge[p] = len(edge_symbol) - 1
+                p = link[p]
+            if p != -1:
+                q = transitions[(p << SHIFT) | symbol]
+                if length[p] + 1 == length[q]:
+                    link[cur] = q
+                else:
+                    clone = len(length)
+                    length.append(length[p] + 1)
+                    link.append(link[q])
+                    endpos.append(0)
+                    first_edge.append(-1)
+                    e = first_edge[q]
+                    while e != -1:
+                        s = edge_symbol[e]
+                        transitions[(clone << SHIFT) | s] = transitions[(q << SHIFT) | s]
+                        edge_symbol.append(s)
+                        edge_next.append(first_edge[clone])
+                        first_edge[clone] = len(edge_symbol) - 1
+                        e = edge_next[e]
+                    key = (p << SHIFT) | symbol
+                    while p != -1 and transitions.get(key) == q:
+                        transitions[key] = clone
+                        p = link[p]
+                        key = (p << SHIFT) | symbol
+                    link[q] = clone
+                    link[cur] = clone
+            last = cur
+
+            if budget is not None and len(length) >= budget:
+                self.last = last
+                self._advance(chunk, done, position + 1)
+                self._rebuild()
+                done = position + 1
+                # The rebuild replaced every array; carry on with the new ones
+                length, link, endpos = self.length, self.link, self.endpos
+                first_edge, edge_symbol, edge_next = self.first_edge, self.edge_symbol, self.edge_next
+                transitions = self.transitions
+                last = self.last
+        self.last = last
+        self._advance(chunk, done, len(chunk))
+
+    def _advance(self, chunk, start, stop):
+        # chunk[start:stop] has been fed; only its last `overlap` characters are copied
+        self.consumed += stop - start
+        if self.overlap:
+            self._recent = (self._recent + chunk[max(start, stop - self.overlap):stop])[-self.overlap:]
+
+    def _rebuild(self):
+        # Start over from the tail of the window, so memory never passes the budget
+        tail = self._recent
+        self._reset()
+        self.rebuilds += 1
+        self.window_start = self.consumed - len(tail)
+        consumed, budget = self.consumed, self.max_states
+        self.max_states = None
+        self.feed(tail)
+        self.consumed, self.max_states, self._recent = consumed, budget, tail
+
+    def extend(self, char):
+        self.feed(char)
+
+    def build_from_text(self, text):
+        self.feed(text)
+
+    def _walk(self, pattern):
+        state = 0
+        transitions = self.transitions
+        for char in pattern:
+            state = transitions.get((state << SHIFT) | (ord(char) if isinstance(char, str) else char), -1)
+            if state == -1:
+                return -1
+        return state
+
+    def contains(self, substring):
+        return self._walk(substring) != -1
+
+    def occurrence_counts(self):
+        """
+        endpos size of every state: how often each state's substrings occur.
+        States are bucketed by length (a topological order of the link tree)
+        and counts flow from longer states to their suffix links in one pass.
+        The result is cached until the next feed.
+        """
+        if self._counts is None:
+            length, link = self.length, self.link
+            buckets = [0] * (max(length) + 2)
+            for l in length:
+                buckets[l + 1] += 1
+            for l in range(1, len(buckets)):
+                buckets[l] += buckets[l - 1]
+            order = [0] * len(length)
+            for state, l in enumerate(length):
+                order[buckets[l]] = state
+                buckets[l] += 1
+            counts = self.endpos.tolist()
+            for state in reversed(order):
+                if link[state] > 0:
+                    counts[link[state]] += counts[state]
+            self._counts = counts
+        return self._counts
+
+    def count(self, pattern):
+        """Number of (possibly overlapping) occurrences of pattern in the indexed window."""
+        state = self._walk(pattern)
+        if state == -1:
+            return 0
+        if state == 0:
+            return self.consumed - self.window_start + 1 # The empty string
+        return self.occurrence_counts()[state]
+
+    def memory_bytes(self):
+        """Approximate memory held by the automaton: the arrays plus the transition dict and its int keys/values."""
+        arrays = sum(a.buffer_info()[1] * a.itemsize for a in
+                     (self.length, self.link, self.endpos, self.first_edge, self.edge_symbol, self.edge_next))
+        return arrays + sys.getsizeof(self.transitions) + len(self.transitions) * 64
+
+# --- Benchmark ---
+class _ObjectSuffixAutomaton:
+    # The original one-State-object-per-state automaton, kept as the baseline
     def __init__(self):
         self.last = self.root = State(0)
-        self.size = 1
 
     def extend(self, char):
         new_state = State(self.last.length + 1)
-        self.size += 1
-        
         p = self.last
         while p and char not in p.next:
             p.next[char] = new_state
             p = p.link
-        
         if not p:
             new_state.link = self.root
         else:
@@ -27,29 +226,64 @@ class SuffixAutomaton:
             else:
                 clone = State(p.length + 1, q.link)
                 clone.next = q.next.copy()
-                self.size += 1
-
                 while p and p.next.get(char) == q:
                     p.next[char] = clone
                     p = p.link
-                
                 q.link = clone
                 new_state.link = clone
-        
         self.last = new_state
 
-    def build_from_text(self, text):
-        for char in text:
-            self.extend(char)
+def _log_stream(num_chars, seed=0):
+    """Synthetic log lines, yielded in chunks of about 64 KB."""
+    import random
+    rng = random.Random(seed)
+    levels = ["INFO", "WARN", "ERROR", "DEBUG"]
+    services = ["auth", "billing", "search", "gateway", "scheduler"]
+    produced = 0
+    while produced < num_chars:
+        lines = []
+        for _ in range(1000):
+            lines.append(f"2024-05-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d} "
+                         f"{rng.choice(levels)} {rng.choice(services)} request={rng.randrange(10**6)} "
+                         f"latency_ms={rng.randint(1, 999)}\n")
+        chunk = ''.join(lines)[:num_chars - produced]
+        produced += len(chunk)
+        yield chunk
 
-    def contains(self, substring):
-        node = self.root
-        for char in substring:
-            if char in node.next:
-                node = node.next[char]
-            else:
-                return False
-        return True
+def run_benchmark(compare_chars=300_000, stream_chars=20_000_000, budget=2_000_000):
+    text = ''.join(_log_stream(compare_chars))
+    print(f"{len(text):,} characters of logs, peak traced memory while building:")
+    tracemalloc.start()
+    baseline = _ObjectSuffixAutomaton()
+    for char in text:
+        baseline.extend(char)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del baseline
+    print(f"  State objects with dicts: {peak / 2**20:8.1f} MB")
+    tracemalloc.start()
+    automaton = SuffixAutomaton()
+    automaton.feed(text)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  parallel arrays:          {peak / 2**20:8.1f} MB ({automaton.size:,} states)")
+
+    automaton = SuffixAutomaton(max_states=budget, overlap=256)
+    start = time.perf_counter()
+    largest = 0
+    for chunk in _log_stream(stream_chars):
+        automaton.feed(chunk)
+        largest = max(largest, automaton.memory_bytes())
+    elapsed = time.perf_counter() - start
+    print(f"Streaming {stream_chars:,} characters with a {budget:,}-state budget: {elapsed:.1f} s "
+          f"({stream_chars / elapsed / 1e6:.2f} M chars/s), {automaton.rebuilds} rebuilds, "
+          f"largest footprint ~{largest / 2**20:.0f} MB")
+    print(f"  at that rate 100M characters take ~{100e6 / (stream_chars / elapsed) / 60:.0f} min "
+          f"in the same memory")
+    start = time.perf_counter()
+    hits = automaton.count("ERROR billing")
+    print(f"  'ERROR billing' occurs {hits:,} times in the current window "
+          f"({automaton.consumed - automaton.window_start:,} chars); counts took {time.perf_counter() - start:.2f} s")
 
 if __name__ == '__main__':
     sa = SuffixAutomaton()
@@ -57,4 +291,14 @@ if __name__ == '__main__':
 
     print(f"Contains 'ana': {sa.contains('ana')}")
     print(f"Contains 'ban': {sa.contains('ban')}")
-    print(f"Contains 'nab': {sa.contains('nab')}")
\ No newline at end of file
+    print(f"Contains 'nab': {sa.contains('nab')}")
+
+    print(f"Occurrences of 'ana': {sa.count('ana')}, of 'a': {sa.count('a')}")
+    # Expected: 2, 3
+    sa.feed("nana")
+    print(f"After feeding 'nana': 'ana' occurs {sa.count('ana')} times")
+    # Expected: 4 (in "banananana")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        print()
+        run_benchmark()
@@ -1,12 +1,274 @@
-def solve_sudoku(board: list[list[int]]) -> bool:
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+# Row, column and box of each of the 81 cells, and the number of set bits of every 9-bit mask
+ROW = [i // 9 for i in range(81)]
+COL = [i % 9 for i in range(81)]
+BOX = [(i // 27) * 3 + (i % 9) // 3 for i in range(81)]
+POPCOUNT = [bin(mask).count("1") for mask in range(512)]
+ALL_DIGITS = 0x1FF
+
+def solve_sudoku(board: list[list[int]], method: str = "bitmask") -> bool:
     """
-    Solves a Sudoku puzzle using backtracking. Modifies the board in-place.
+    Solves a Sudoku puzzle. Modifies the board in-place.
     Args:
         board (list[list[int]]): The 9x9 Sudoku board, with 0s for empty cells.
+        method (str): "bitmask" (constraint propagation + backtracking),
+                      "dlx" (dancing-links exact cover) or "backtracking"
+                      (the original cell-by-cell search).
     Returns:
         bool: True if a solution is found, False otherwise.
     """
-    
+    if method == "backtracking":
+        return _solve_backtracking(board)
+    cells = [board[r][c] for r in range(9) for c in range(9)]
+    if method == "bitmask":
+        solved = _solve_bitmask(cells)
+    elif method == "dlx":
+        solved = _solve_dlx(cells)
+    else:
+        raise ValueError(f"Unknown method {method!r}; expected 'bitmask', 'dlx' or 'backtracking'.")
+    if solved:
+        for i, value in enumerate(cells):
+            board[i // 9][i % 9] = value
+    return solved
+
+# --- Bitmask solver ---
+def _solve_bitmask(cells: list[int]) -> bool:
+    """
+    Solves a flat 81-cell board in place. Each row, column and box keeps a
+    9-bit mask of the digits it already holds, so a cell's candidates are
+    one OR and one NOT instead of 27 board lookups.
+    """
+    rows, cols, boxes = [0] * 9, [0] * 9, [0] * 9
+    for i, value in enumerate(cells):
+        if value:
+            bit = 1 << (value - 1)
+            if (rows[ROW[i]] | cols[COL[i]] | boxes[BOX[i]]) & bit:
+                return False # The givens already clash
+            rows[ROW[i]] |= bit
+            cols[COL[i]] |= bit
+            boxes[BOX[i]] |= bit
+    empties = [i for i in range(81) if not cells[i]]
+    return _search(cells, empties, rows, cols, boxes)
+
+def _search(cells, empties, rows, cols, boxes) -> bool:
+    placed = [] # (cell, bit) placed by propagation at this level, undone on failure
+
+    def undo():
+        for i, bit in placed:
+            cells[i] = 0
+            rows[ROW[i]] ^= bit
+            cols[COL[i]] ^= bit
+            boxes[BOX[i]] ^= bit
+
+    while True:
+        # One scan fills every naked single and finds the minimum-remaining-values cell
+        best, best_mask, best_count = -1, 0, 10
+        remaining = []
+        progress = False
+        for i in empties:
+            r, c, b = ROW[i], COL[i], BOX[i]
+            mask = ALL_DIGITS & ~(rows[r] | cols[c] | boxes[b])
+            if not mask:
+                undo()
+                return False
+            if not mask & (mask - 1): # Exactly one candidate
+                cells[i] = mask.bit_length()
+                rows[r] |= mask
+                cols[c] |= mask
+                boxes[b] |= mask
+                placed.append((i, mask))
+                progress = True
+                continue
+            remaining.append(i)
+            if POPCOUNT[mask] < best_count:
+                best, best_mask, best_count = i, mask, POPCOUNT[mask]
+        empties = remaining
+        if not progress:
+            break
+    if best < 0:
+        return True
+
+    r, c, b = ROW[best], COL[best], BOX[best]
+    empties = [i for i in empties if i != best]
+    while best_mask:
+        bit = best_mask & -best_mask
+        best_mask ^= bit
+        cells[best] = bit.bit_length()
+        rows[r] |= bit
+        cols[c] |= bit
+        boxes[b] |= bit
+        if _search(cells, empties, rows, cols, boxes):
+            return True
+        rows[r] ^= bit
+        cols[c] ^= bit
+        boxes[b] ^= bit
+    cells[best] = 0
+    undo()
+    return False
+
+# --- Dancing links ---
+class DancingLinks:
+    def __init__(self, num_columns: int, rows: list[list[int]]):
+        """
+        Knuth's Algorithm X on a toroidal doubly linked list, for exact cover:
+        pick a set of rows that covers every column exactly once.
+
+        Nodes are integer indices into parallel lists (left, right, up, down,
+        column) rather than objects. Node 0 is the root and nodes
+        1..num_columns are the column headers.
+
+        Args:
+            num_columns (int): Number of constraints.
+            rows (list[list[int]]): Columns covered by each candidate row.
+        """
+        n = num_columns
+        self.left = [n] + list(range(n))
+        self.right = list(range(1, n + 1)) + [0]
+        self.up = list(range(n + 1))
+        self.down = list(range(n + 1))
+        self.column = list(range(n + 1))
+        self.row_of = [-1] * (n + 1)
+        self.size = [0] * (n + 1)
+        self.row_start = [] # First node of each row
+        for row_id, columns in enumerate(rows):
+            first = -1
+            for col in columns:
+                col += 1
+                node = len(self.column)
+                self.column.append(col)
+                self.row_of.append(row_id)
+                self.up.append(self.up[col])
+                self.down.append(col)
+                self.down[self.up[col]] = node
+                self.up[col] = node
+                self.size[col] += 1
+                if first < 0:
+                    first = node
+                    self.row_start.append(node)
+                    self.left.append(node)
+                    self.right.append(node)
+                else:
+                    self.left.append(self.left[first])
+                    self.right.append(first)
+                    self.right[self.left[first]] = node
+                    self.left[first] = node
+
+    def copy(self) -> "DancingLinks":
+        """Independent copy, cheaper than rebuilding the links from the rows."""
+        clone = object.__new__(DancingLinks)
+        for name in ("left", "right", "up", "down", "size"):
+            setattr(clone, name, getattr(self, name)[:])
+        # Node -> column/row never change, so those lists are shared
+        clone.column, clone.row_of, clone.row_start = self.column, self.row_of, self.row_start
+        return clone
+
+    def _cover(self, col):
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+        i = down[col]
+        while i != col:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, col):
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        i = up[col]
+        while i != col:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[col]] = col
+        left[right[col]] = col
+
+    def select(self, row_id: int) -> None:
+        """Forces a row into the solution (used for givens) by covering its columns."""
+        node = self.row_start[row_id]
+        j = node
+        while True:
+            self._cover(self.column[j])
+            j = self.right[j]
+            if j == node:
+                break
+
+    def solve(self) -> list[int] | None:
+        """Returns the chosen row ids of one exact cover, or None."""
+        right, down, column, size = self.right, self.down, self.column, self.size
+        solution = []
+
+        def search():
+            if right[0] == 0:
+                return True
+            # Column with the fewest remaining rows (the MRV rule of Algorithm X)
+            col, best = right[0], size[right[0]]
+            c = right[col]
+            while c != 0 and best > 1:
+                if size[c] < best:
+                    col, best = c, size[c]
+                c = right[c]
+            if best == 0:
+                return False
+            self._cover(col)
+            r = down[col]
+            while r != col:
+                solution.append(self.row_of[r])
+                j = right[r]
+                while j != r:
+                    self._cover(column[j])
+                    j = right[j]
+                if search():
+                    return True
+                j = self.left[r]
+                while j != r:
+                    self._uncover(column[j])
+                    j = self.left[j]
+                solution.pop()
+                r = down[r]
+            self._uncover(col)
+            return False
+
+        return solution if search() else None
+
+# Row (cell, digit) covers: cell filled, digit in row, digit in column, digit in box
+SUDOKU_COVER_ROWS = [[i, 81 + ROW[i] * 9 + d, 162 + COL[i] * 9 + d, 243 + BOX[i] * 9 + d]
+                     for i in range(81) for d in range(9)]
+_sudoku_links = None # Empty-board links, built once and copied per puzzle
+
+def _solve_dlx(cells: list[int]) -> bool:
+    global _sudoku_links
+    if _sudoku_links is None:
+        _sudoku_links = DancingLinks(324, SUDOKU_COVER_ROWS)
+    links = _sudoku_links.copy()
+    covered = set()
+    for i, value in enumerate(cells):
+        if value:
+            row = SUDOKU_COVER_ROWS[i * 9 + value - 1]
+            if covered.intersection(row):
+                return False # The givens already clash
+            covered.update(row)
+            links.select(i * 9 + value - 1)
+    solution = links.solve()
+    if solution is None:
+        return False
+    for row_id in solution:
+        cells[row_id // 9] = row_id % 9 + 1
+    return True
+
+# --- Original backtracking ---
+def _solve_backtracking(board: list[list[int]]) -> bool:
     empty_cell = find_empty(board)
     if not empty_cell:
         return True # No empty cells left, puzzle solved!
@@ -17,9 +279,9 @@ def solve_sudoku(board: list[list[int]]) -> bool:
         if is_valid(board, num, (row, col)):
             board[row][col] = num # Place the number
 
-            if solve_sudoku(board): # Recursively try to solve the rest
+            if _solve_backtracking(board): # Recursively try to solve the rest
                 return True
-            
+
             board[row][col] = 0 # Backtrack: if the current placement leads to no solution, reset the cell
 
     return False # No number worked for this cell
@@ -59,6 +321,54 @@ def is_valid(board: list[list[int]], num: int, pos: tuple[int, int]) -> bool:
 
     return True
 
+# --- Batch solving ---
+def parse_puzzle(line: str) -> list[int]:
+    """81-character line, digits with '0' or '.' for empty cells -> flat list of 81 ints."""
+    line = line.strip()
+    if len(line) != 81:
+        raise ValueError(f"Expected 81 characters, got {len(line)}.")
+    return [0 if ch in ".0" else int(ch) for ch in line]
+
+def _solve_line(args: tuple[str, str]) -> str | None:
+    line, method = args
+    cells = parse_puzzle(line)
+    solved = _solve_bitmask(cells) if method == "bitmask" else _solve_dlx(cells)
+    return "".join(map(str, cells)) if solved else None
+
+def solve_many(source, processes: int | None = None, method: str = "bitmask",
+               chunksize: int = 64) -> tuple[list[str | None], float]:
+    """
+    Solves a batch of puzzles across a process pool.
+
+    Args:
+        source: Path to a file with one 81-character puzzle per line, or an
+                iterable of such lines.
+        processes (int | None): Pool size; None uses every CPU, 1 solves in-process.
+        method (str): "bitmask" or "dlx".
+        chunksize (int): Puzzles handed to a worker at a time.
+
+    Returns:
+        tuple: (solutions, puzzles_per_second). Each solution is an 81-digit
+               string, or None if that puzzle has no solution.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source) as f:
+            lines = [line for line in f if line.strip()]
+    else:
+        lines = list(source)
+    jobs = [(line, method) for line in lines]
+    start = time.perf_counter()
+    if processes == 1:
+        solutions = list(map(_solve_line, jobs))
+    else:
+        with Pool(processes) as pool:
+            solutions = pool.map(_solve_line, jobs, chunksize=chunksize)
+    elapsed = time.perf_counter() - start
+    rate = len(lines) / elapsed if elapsed > 0 else float('inf')
+    print(f"Solved {sum(s is not None for s in solutions)}/{len(lines)} puzzles "
+          f"in {elapsed:.2f} s ({rate:,.0f} puzzles/s, method={method})")
+    return solutions, rate
+
 def print_board(board: list[list[int]]):
     """Prints the Sudoku board in a readable format."""
     for r in range(9):
@@ -74,6 +384,53 @@ def print_board(board: list[list[int]]):
             else:
                 print(str(board[r][c]) + " ", end="")
 
+# --- Benchmark ---
+HARD_PUZZLES = [
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+    "..53.....8......2..7..1.5..4....53...1..7...6..32...8..6.5....9..4....3......97..",
+    ".......1.4.........2...........5.4.7..8...3....1.9....3..4..2...5.1........8.6...",
+]
+
+def generate_puzzles(count: int, clues: int = 25, seed: int = 0) -> list[str]:
+    """
+    Random puzzles: a random valid grid (bitmask solver on a shuffled first
+    row) with all but `clues` cells blanked. Not guaranteed to be unique.
+    """
+    import random
+    rng = random.Random(seed)
+    puzzles = []
+    for _ in range(count):
+        cells = [0] * 81
+        cells[:9] = rng.sample(range(1, 10), 9)
+        _solve_bitmask(cells)
+        # Relabel digits and swap rows within bands so grids differ beyond the first row
+        relabel = [0] + rng.sample(range(1, 10), 9)
+        order = [band * 3 + r for band in rng.sample(range(3), 3) for r in rng.sample(range(3), 3)]
+        cells = [relabel[cells[r * 9 + c]] for r in order for c in range(9)]
+        for i in rng.sample(range(81), 81 - clues):
+            cells[i] = 0
+        puzzles.append("".join(map(str, cells)))
+    return puzzles
+
+def run_benchmark(count=20_000, path="/tmp/program_29_puzzles.txt"):
+    # The original backtracking needs minutes on HARD_PUZZLES, so it only gets the example puzzle
+    example = "530070000600195000098000060800060003400803001700020006060000280000419005000080079"
+    for label, lines, methods in (("example puzzle", [example], ("backtracking", "bitmask", "dlx")),
+                                  (f"{len(HARD_PUZZLES)} hard puzzles", HARD_PUZZLES, ("bitmask", "dlx"))):
+        for method in methods:
+            start = time.perf_counter()
+            for line in lines:
+                cells = parse_puzzle(line)
+                solve_sudoku([cells[r * 9:r * 9 + 9] for r in range(9)], method=method)
+            print(f"{label}, {method:<12}: {time.perf_counter() - start:7.3f} s")
+
+    with open(path, "w") as f:
+        f.write("\n".join(generate_puzzles(count)) + "\n")
+    print(f"\n{count:,} generated puzzles ({os.cpu_count()} CPU(s)):")
+    solve_many(path, processes=1)
+    solve_many(path, method="dlx", processes=1)
+    solve_many(path)
+
 # Example Usage:
 if __name__ == "__main__":
     puzzle1 = [
@@ -112,8 +469,12 @@ if __name__ == "__main__":
     print("\n--- Original Puzzle 2 (No Solution Expected) ---")
     print_board(puzzle2)
     print("\nSolving...\n")
-    if solve_sudoku(puzzle2):
+    if solve_sudoku(puzzle2, method="dlx"):
         print("--- Solved Puzzle 2 ---")
         print_board(puzzle2)
     else:
-        print("No solution found for Puzzle 2 (as expected).")
\ No newline at end of file
+        print("No solution found for Puzzle 2 (as expected).")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        print()
+        run_benchmark()
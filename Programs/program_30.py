@@ -1,6 +1,9 @@
 from collections import OrderedDict, defaultdict
 import heapq
+import random
+import sys
 import time
+import tracemalloc
 
 # --- LRU Cache Implementation (Problem 1 revisited, slightly adjusted) ---
 class LRUCache:
@@ -36,8 +39,8 @@ class LRUCache:
     def __str__(self):
         return f"LRUCache(Capacity={self.capacity}, Current={len(self.cache)}, Hits={self.hits}, Misses={self.misses}, Content={list(self.cache.keys())})"
 
-# --- LFU Cache Implementation ---
-class LFUCache:
+# --- Original heap-based LFU (kept as the benchmark baseline) ---
+class HeapLFUCache:
     def __init__(self, capacity: int):
         self.capacity = capacity
         self.cache = {}  # key: value
@@ -106,7 +109,169 @@ class LFUCache:
         return len(self.cache)
     
     def __str__(self):
-        return f"LFUCache(Capacity={self.capacity}, Current={len(self.cache)}, Hits={self.hits}, Misses={self.misses}, Content={list(self.cache.keys())})"
+        return f"HeapLFUCache(Capacity={self.capacity}, Current={len(self.cache)}, Hits={self.hits}, Misses={self.misses}, Content={list(self.cache.keys())})"
+
+# --- Count-Min Sketch (frequency estimates for TinyLFU admission) ---
+class CountMinSketch:
+    MASK64 = (1 << 64) - 1
+    # Odd 64-bit multipliers, one per row, for multiplicative hashing
+    SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+    MAX_COUNT = 15 # 4-bit counters, as in TinyLFU
+    HALVE_TABLE = bytes(c >> 1 for c in range(256)) # bytes.translate table for aging
+
+    def __init__(self, width: int, sample_size: int):
+        """
+        Args:
+            width (int): Counters per row; rounded up to a power of two.
+            sample_size (int): After this many increments every counter is
+                               halved, so old popularity fades out.
+        """
+        self.bits = max(4, (width - 1).bit_length())
+        self.width = 1 << self.bits
+        self.shift = 64 - self.bits
+        self.rows = [bytearray(self.width) for _ in self.SEEDS]
+        self.sample_size = sample_size
+        self.additions = 0
+
+    def increment(self, key) -> None:
+        h = hash(key) & self.MASK64
+        mask, shift = self.MASK64, self.shift
+        for row, seed in zip(self.rows, self.SEEDS):
+            index = ((h * seed) & mask) >> shift
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self._age()
+
+    def estimate(self, key) -> int:
+        h = hash(key) & self.MASK64
+        mask, shift = self.MASK64, self.shift
+        return min(row[((h * seed) & mask) >> shift] for row, seed in zip(self.rows, self.SEEDS))
+
+    def _age(self):
+        self.rows = [bytearray(row.translate(self.HALVE_TABLE)) for row in self.rows]
+        self.additions //= 2
+
+# --- LFU Cache Implementation (O(1) frequency buckets) ---
+class LFUCache:
+    def __init__(self, capacity: int, admission: str = None):
+        """
+        LFU cache with O(1) get, put and eviction.
+
+        Keys are grouped in one bucket per access count. Each bucket is an
+        OrderedDict, i.e. a doubly linked list with a hash index, so moving a
+        key to the next bucket and evicting the oldest key of the lowest bucket
+        are both O(1). Ties within a frequency are broken LRU-style, like the
+        (freq, timestamp) ordering of HeapLFUCache.
+
+        Args:
+            capacity (int): Maximum number of entries.
+            admission (str | None): "tinylfu" enables W-TinyLFU: new keys enter a
+                small LRU window (1% of capacity) and, when they leave it, only
+                replace the LFU victim if a count-min sketch says they are
+                requested more often. This keeps one-hit wonders out of the main area.
+        """
+        if admission not in (None, "tinylfu"):
+            raise ValueError("admission must be None or 'tinylfu'")
+        self.capacity = capacity
+        self.cache = {}      # key: value
+        self.frequencies = {} # key: frequency_count
+        self.buckets = defaultdict(OrderedDict) # frequency: keys in LRU order
+        self.min_freq = 0
+        self.hits = 0
+        self.misses = 0
+        self.admission = admission
+        self.window = OrderedDict() # W-TinyLFU admission window (LRU), key: value
+        self.window_capacity = 0
+        self.main_capacity = capacity
+        self.sketch = None
+        if admission == "tinylfu" and capacity > 1:
+            self.window_capacity = max(1, capacity // 100)
+            self.main_capacity = capacity - self.window_capacity
+            self.sketch = CountMinSketch(width=capacity, sample_size=10 * capacity)
+
+    def _touch(self, key):
+        freq = self.frequencies[key]
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+            if self.min_freq == freq:
+                self.min_freq = freq + 1
+        self.frequencies[key] = freq + 1
+        self.buckets[freq + 1][key] = None
+
+    def _evict(self):
+        bucket = self.buckets[self.min_freq]
+        lfu_key, _ = bucket.popitem(last=False)
+        if not bucket:
+            del self.buckets[self.min_freq]
+        del self.cache[lfu_key]
+        del self.frequencies[lfu_key]
+        # print(f"  LFU Eviction: Evicted {lfu_key} from L2 Cache.")
+        return lfu_key
+
+    def _insert(self, key, value):
+        self.cache[key] = value
+        self.frequencies[key] = 1 # New item, frequency 1
+        self.buckets[1][key] = None
+        self.min_freq = 1
+
+    def _victim(self):
+        return next(iter(self.buckets[self.min_freq]))
+
+    def get(self, key: any) -> any:
+        if self.sketch is not None:
+            self.sketch.increment(key)
+        if key in self.cache:
+            self.hits += 1
+            self._touch(key) # Increment frequency on access
+            return self.cache[key]
+        if key in self.window:
+            self.hits += 1
+            self.window.move_to_end(key)
+            return self.window[key]
+        self.misses += 1
+        return -1 # Not found
+
+    def put(self, key: any, value: any) -> None:
+        if self.capacity == 0: return # Handle zero capacity
+
+        if key in self.cache:
+            self.cache[key] = value
+            self._touch(key)
+            return
+        if self.sketch is None:
+            if len(self.cache) >= self.capacity:
+                self._evict()
+            self._insert(key, value)
+            return
+
+        # W-TinyLFU: new keys go through the window first
+        if key in self.window:
+            self.window[key] = value
+            self.window.move_to_end(key)
+            return
+        self.window[key] = value
+        if len(self.window) <= self.window_capacity:
+            return
+        candidate, candidate_value = self.window.popitem(last=False)
+        if len(self.cache) < self.main_capacity:
+            self._insert(candidate, candidate_value)
+        elif self.sketch.estimate(candidate) > self.sketch.estimate(self._victim()):
+            self._evict()
+            self._insert(candidate, candidate_value)
+        # Otherwise the candidate is simply dropped
+
+    def __contains__(self, key):
+        return key in self.cache or key in self.window
+
+    def __len__(self):
+        return len(self.cache) + len(self.window)
+
+    def __str__(self):
+        return f"LFUCache(Capacity={self.capacity}, Current={len(self)}, Hits={self.hits}, Misses={self.misses}, Content={list(self.window.keys()) + list(self.cache.keys())})"
 
 # --- Simulated Data Source ---
 class DataSource:
@@ -178,8 +343,51 @@ class MultiLevelCache:
             "data_source_fetches": self.data_source.fetch_count
         }
 
+# --- Zipfian Benchmark ---
+def zipf_trace(num_keys: int, length: int, skew: float = 0.9, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    weights = [1 / (rank ** skew) for rank in range(1, num_keys + 1)]
+    keys = list(range(num_keys))
+    rng.shuffle(keys) # Popularity should not follow key order
+    return rng.choices(keys, weights=weights, k=length)
+
+def _replay(cache, trace):
+    get, put = cache.get, cache.put
+    for key in trace:
+        if get(key) == -1:
+            put(key, key)
+
+def run_benchmark(capacity=1000, num_keys=100_000, length=300_000):
+    trace = zipf_trace(num_keys, length)
+    print(f"Zipf(0.9) trace: {length} requests over {num_keys} keys, capacity {capacity}\n")
+    contenders = [
+        ("HeapLFUCache (old)", lambda: HeapLFUCache(capacity)),
+        ("LFUCache O(1)", lambda: LFUCache(capacity)),
+        ("LFUCache W-TinyLFU", lambda: LFUCache(capacity, admission="tinylfu")),
+        ("LRUCache", lambda: LRUCache(capacity)),
+    ]
+    for name, factory in contenders:
+        cache = factory()
+        start = time.perf_counter()
+        _replay(cache, trace)
+        elapsed = time.perf_counter() - start
+
+        # Second, traced replay: memory still held by the cache at the end
+        tracemalloc.start()
+        traced = factory()
+        _replay(traced, trace)
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        extra = f", heap entries {len(traced.min_heap)}" if isinstance(traced, HeapLFUCache) else ""
+        print(f"{name:<20} {length / elapsed:>10,.0f} ops/s   hit rate {cache.hits / length:6.2%}   "
+              f"memory {held / 1024:8.1f} KiB{extra}")
+
 # Example Usage:
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        run_benchmark()
+        sys.exit(0)
+
     cache_system = MultiLevelCache(l1_capacity=2, l2_capacity=3)
 
     print("--- Initial State ---")
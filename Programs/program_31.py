@@ -1,9 +1,15 @@
 import socket
+import selectors
 import threading
 import queue
+import heapq
+import multiprocessing
 import pickle
+import struct
+import sys
 import time
 import random
+from collections import OrderedDict, deque
 
 # --- Constants ---
 BROKER_HOST = '127.0.0.1'
@@ -12,7 +18,45 @@ TASK_REQUEST = "GET_TASK"
 TASK_SUBMIT = "SUBMIT_TASK"
 TASK_DONE = "TASK_DONE"
 NO_TASK = "NO_TASK"
-BUFFER_SIZE = 4096
+WAIT_RESULT = "WAIT_RESULT"
+SUBSCRIBE = "SUBSCRIBE"
+TASK_RESULT = "TASK_RESULT"
+DEFAULT_PREFETCH = 32    # Credit window: max tasks a worker holds locally
+DEFAULT_FETCH_WAIT = 1.0 # How long the broker may park a GET_TASK waiting for work
+RESULT_STORE_CAPACITY = 100000 # Max results kept before the oldest are evicted
+RESULT_TTL = 300.0             # Seconds a result stays collectable
+
+# --- Wire Protocol ---
+# Every message is a pickled dict prefixed by its length as a 4-byte big-endian
+# unsigned int, so a message can span several TCP segments (or several messages
+# can share one) without being cut in half by a single recv().
+HEADER = struct.Struct('!I')
+
+def _recv_exact(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            return None # Peer closed the connection
+        buf.extend(chunk)
+    return bytes(buf)
+
+def send_message(sock, message):
+    payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    sock.sendall(HEADER.pack(len(payload)) + payload)
+
+def recv_message(sock):
+    """
+    Reads one framed message. Returns None if the peer closed the connection.
+    """
+    header = _recv_exact(sock, HEADER.size)
+    if header is None:
+        return None
+    (length,) = HEADER.unpack(header)
+    payload = _recv_exact(sock, length)
+    if payload is None:
+        return None
+    return pickle.loads(payload)
 
 # --- Task Definition (for serialization) ---
 class Task:
@@ -27,83 +71,225 @@ class Task:
     def __repr__(self):
         return f"Task(id={self.task_id}, func={self.func_name}, status={self.status})"
 
+# --- Result Store ---
+class ResultStore:
+    def __init__(self, capacity=RESULT_STORE_CAPACITY, ttl=RESULT_TTL):
+        """
+        Bounded in-memory store of finished task results.
+
+        Results are kept in insertion order, so both expired entries (older than
+        `ttl` seconds) and entries over `capacity` are always at the front and
+        eviction is O(1) per entry.
+        """
+        self.capacity = capacity
+        self.ttl = ttl
+        self.results = OrderedDict() # task_id -> (result, stored_at)
+        self.evicted_count = 0
+        self.condition = threading.Condition()
+
+    def _evict(self, now):
+        while self.results:
+            task_id, (_, stored_at) = next(iter(self.results.items()))
+            if len(self.results) <= self.capacity and now - stored_at < self.ttl:
+                break
+            self.results.popitem(last=False)
+            self.evicted_count += 1
+
+    def put_many(self, results):
+        now = time.monotonic()
+        with self.condition:
+            for task_id, result in results:
+                self.results.pop(task_id, None)
+                self.results[task_id] = (result, now)
+            self._evict(now)
+            self.condition.notify_all()
+
+    def wait_for(self, task_ids, timeout):
+        """
+        Blocks until every id in `task_ids` has a result or `timeout` expires.
+
+        Returns:
+            dict: task_id -> result for every id that finished in time.
+        """
+        task_ids = list(task_ids)
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                self._evict(now)
+                missing = [t for t in task_ids if t not in self.results]
+                if not missing or now >= deadline:
+                    break
+                self.condition.wait(deadline - now)
+            return {t: self.results[t][0] for t in task_ids if t in self.results}
+
 # --- Broker Implementation ---
 class Broker:
-    def __init__(self, host, port):
+    def __init__(self, host, port, verbose=True):
         self.host = host
         self.port = port
+        self.verbose = verbose
         self.task_queue = queue.Queue() # Thread-safe queue for tasks
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.clients = [] # To keep track of connected sockets
         self.running = True
         self.task_id_counter = 0
-        self.lock = threading.Lock() # For task_id_counter and client list
+        self.completed_count = 0
+        self.lock = threading.Lock() # For counters, client list and subscriptions
+        self.result_store = ResultStore()
+        self.subscribers = {}  # producer_id -> (conn, send lock)
+        self.notify_owner = {} # task_id -> producer_id waiting for a push
+
+    def _log(self, text):
+        if self.verbose:
+            print(text)
 
     def _generate_task_id(self):
         with self.lock:
             self.task_id_counter += 1
             return self.task_id_counter
 
+    def _enqueue(self, task_info, notify_producer=None):
+        task = Task(self._generate_task_id(), task_info['func_name'], task_info.get('args'), task_info.get('kwargs'))
+        if notify_producer is not None:
+            with self.lock:
+                self.notify_owner[task.task_id] = notify_producer
+        self.task_queue.put(task)
+        return task
+
+    def _dequeue_batch(self, max_tasks, wait):
+        """
+        Pops up to `max_tasks` tasks. Blocks for at most `wait` seconds for the
+        first one so idle workers park on the broker instead of polling it.
+        """
+        tasks = []
+        if max_tasks <= 0:
+            return tasks
+        try:
+            if wait > 0:
+                tasks.append(self.task_queue.get(timeout=wait))
+            else:
+                tasks.append(self.task_queue.get_nowait())
+            while len(tasks) < max_tasks:
+                tasks.append(self.task_queue.get_nowait())
+        except queue.Empty:
+            pass
+        return tasks
+
+    def _record_results(self, results, addr):
+        for task_id, result in results:
+            self._log(f"[Broker] Task {task_id} completed by worker {addr} with result: {result}")
+        self.result_store.put_many(results)
+        pushes = {}
+        with self.lock:
+            self.completed_count += len(results)
+            if self.notify_owner:
+                for task_id, result in results:
+                    producer_id = self.notify_owner.pop(task_id, None)
+                    if producer_id is not None:
+                        pushes.setdefault(producer_id, []).append((task_id, result))
+            targets = [(self.subscribers.get(pid), batch) for pid, batch in pushes.items()]
+        for subscriber, batch in targets:
+            if subscriber is None:
+                continue # Producer is not listening; it can still WAIT_RESULT
+            conn, send_lock = subscriber
+            try:
+                with send_lock:
+                    send_message(conn, {"type": TASK_RESULT, "results": batch})
+            except Exception as e:
+                self._log(f"[Broker] Failed to push results to subscriber: {e}")
+
+    def _handle_message(self, message, addr):
+        msg_type = message.get("type")
+
+        if msg_type == TASK_SUBMIT:
+            # Accepts a single "task" or a batch under "tasks"
+            task_infos = message.get("tasks")
+            if task_infos is None and message.get("task"):
+                task_infos = [message["task"]]
+            if not task_infos:
+                return {"status": "ERROR", "message": "No task info provided."}
+            notify_producer = message.get("producer_id") if message.get("notify") else None
+            task_ids = [self._enqueue(info, notify_producer).task_id for info in task_infos]
+            self._log(f"[Broker] Received {len(task_ids)} task(s) {task_ids[:5]} from producer {addr}. Queue size: {self.task_queue.qsize()}")
+            return {"status": "SUCCESS", "task_id": task_ids[0], "task_ids": task_ids}
+
+        elif msg_type == TASK_REQUEST:
+            tasks = self._dequeue_batch(message.get("max_tasks", 1), message.get("wait", 0))
+            if not tasks:
+                return {"type": NO_TASK}
+            self._log(f"[Broker] Worker {addr} requested tasks. Sending {[t.task_id for t in tasks]}. Queue size: {self.task_queue.qsize()}")
+            return {"type": TASK_REQUEST, "task": tasks[0], "tasks": tasks}
+
+        elif msg_type == TASK_DONE:
+            # Accepts a single task_id/result pair or a batch under "results"
+            results = message.get("results")
+            if results is None:
+                results = [(message.get("task_id"), message.get("result"))]
+            self._record_results(results, addr)
+            response = {"status": "ACK_TASK_DONE", "count": len(results)}
+            # A worker may piggyback its next GET_TASK on the ACK to save a round-trip
+            max_tasks = message.get("max_tasks", 0)
+            if max_tasks:
+                tasks = self._dequeue_batch(max_tasks, message.get("wait", 0))
+                response["type"] = TASK_REQUEST if tasks else NO_TASK
+                response["tasks"] = tasks
+            return response
+
+        elif msg_type == WAIT_RESULT:
+            task_ids = message.get("task_ids", [])
+            results = self.result_store.wait_for(task_ids, message.get("timeout", 0))
+            return {"type": WAIT_RESULT, "results": results,
+                    "missing": [t for t in task_ids if t not in results]}
+
+        else:
+            self._log(f"[Broker] Unknown message type from {addr}: {msg_type}")
+            return {"status": "ERROR", "message": "Unknown message type."}
+
     def _handle_client(self, conn, addr):
-        print(f"[Broker] New connection from {addr}")
+        self._log(f"[Broker] New connection from {addr}")
+        subscribed_as = None
         try:
             while self.running:
-                data = conn.recv(BUFFER_SIZE)
-                if not data:
-                    break # Client disconnected
-                
                 try:
-                    message = pickle.loads(data)
+                    message = recv_message(conn)
                 except pickle.UnpicklingError:
-                    print(f"[Broker] Invalid message from {addr}: {data[:50]}...")
-                    continue # Skip invalid message
-                
-                msg_type = message.get("type")
-
-                if msg_type == TASK_SUBMIT:
-                    task_info = message.get("task")
-                    if task_info:
-                        task = Task(self._generate_task_id(), task_info['func_name'], task_info['args'], task_info['kwargs'])
-                        self.task_queue.put(task)
-                        print(f"[Broker] Received task {task.task_id} from producer {addr}. Queue size: {self.task_queue.qsize()}")
-                        conn.sendall(pickle.dumps({"status": "SUCCESS", "task_id": task.task_id}))
-                    else:
-                        conn.sendall(pickle.dumps({"status": "ERROR", "message": "No task info provided."}))
-
-                elif msg_type == TASK_REQUEST:
-                    try:
-                        task = self.task_queue.get_nowait()
-                        print(f"[Broker] Worker {addr} requested task. Sending task {task.task_id}. Queue size: {self.task_queue.qsize()}")
-                        conn.sendall(pickle.dumps({"type": TASK_REQUEST, "task": task}))
-                    except queue.Empty:
-                        # print(f"[Broker] No tasks for worker {addr}. Queue empty.")
-                        conn.sendall(pickle.dumps({"type": NO_TASK}))
-                    
-                elif msg_type == TASK_DONE:
-                    task_id = message.get("task_id")
-                    result = message.get("result")
-                    print(f"[Broker] Task {task_id} completed by worker {addr} with result: {result}")
-                    # In a real system, broker would store results or notify producer
-                    conn.sendall(pickle.dumps({"status": "ACK_TASK_DONE"}))
-
-                else:
-                    print(f"[Broker] Unknown message type from {addr}: {msg_type}")
-                    conn.sendall(pickle.dumps({"status": "ERROR", "message": "Unknown message type."}))
+                    self._log(f"[Broker] Invalid message from {addr}")
+                    break # Framing is lost, drop the connection
+                if message is None:
+                    break # Client disconnected
+                if message.get("type") == SUBSCRIBE:
+                    # From now on this connection only receives pushed TASK_RESULTs.
+                    # The ACK goes out under the send lock so no push can overtake it.
+                    producer_id = message.get("producer_id")
+                    send_lock = threading.Lock()
+                    with send_lock:
+                        with self.lock:
+                            self.subscribers[producer_id] = (conn, send_lock)
+                        send_message(conn, {"status": "SUBSCRIBED"})
+                    subscribed_as = producer_id
+                    continue
+                send_message(conn, self._handle_message(message, addr))
 
         except Exception as e:
-            print(f"[Broker] Error handling client {addr}: {e}")
+            if self.running:
+                self._log(f"[Broker] Error handling client {addr}: {e}")
         finally:
             with self.lock:
                 if conn in self.clients:
                     self.clients.remove(conn)
+                if subscribed_as is not None and self.subscribers.get(subscribed_as, (None,))[0] is conn:
+                    del self.subscribers[subscribed_as]
             conn.close()
-            print(f"[Broker] Client {addr} disconnected.")
+            self._log(f"[Broker] Client {addr} disconnected.")
 
     def start(self):
         self.server_socket.bind((self.host, self.port))
-        self.server_socket.listen(5)
-        print(f"[Broker] Broker listening on {self.host}:{self.port}")
-        
+        self.port = self.server_socket.getsockname()[1] # Resolves port 0 to the real port
+        self.server_socket.listen(128)
+        self._log(f"[Broker] Broker listening on {self.host}:{self.port}")
+
         accept_thread = threading.Thread(target=self._accept_connections, daemon=True)
         accept_thread.start()
 
@@ -112,6 +298,8 @@ class Broker:
             try:
                 self.server_socket.settimeout(1.0) # Allows graceful shutdown
                 conn, addr = self.server_socket.accept()
+                conn.settimeout(None)
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
                 with self.lock:
                     self.clients.append(conn)
                 threading.Thread(target=self._handle_client, args=(conn, addr), daemon=True).start()
@@ -119,12 +307,12 @@ class Broker:
                 continue
             except Exception as e:
                 if self.running:
-                    print(f"[Broker] Error accepting connections: {e}")
+                    self._log(f"[Broker] Error accepting connections: {e}")
                 break
-        print("[Broker] Broker accept loop stopped.")
+        self._log("[Broker] Broker accept loop stopped.")
 
     def stop(self):
-        print("[Broker] Shutting down Broker...")
+        self._log("[Broker] Shutting down Broker...")
         self.running = False
         with self.lock:
             for client_conn in self.clients:
@@ -139,17 +327,389 @@ class Broker:
             self.server_socket.close()
         except Exception:
             pass
-        print("[Broker] Broker stopped.")
+        self._log("[Broker] Broker stopped.")
+
+# --- Event-Driven Broker Implementation ---
+class _ClientState:
+    __slots__ = ("sock", "addr", "inbuf", "outbuf", "writing", "waiter", "subscribed_as")
+
+    def __init__(self, sock, addr):
+        self.sock = sock
+        self.addr = addr
+        self.inbuf = bytearray()
+        self.outbuf = bytearray()
+        self.writing = False # Registered for EVENT_WRITE
+        self.waiter = None   # Parked GET_TASK / WAIT_RESULT, if any
+        self.subscribed_as = None
+
+class _Waiter:
+    __slots__ = ("client", "response", "max_tasks", "task_ids", "missing", "done")
+
+    def __init__(self, client, response, max_tasks=0, task_ids=None, missing=None):
+        self.client = client
+        self.response = response # Partially built reply, completed when the wait ends
+        self.max_tasks = max_tasks
+        self.task_ids = task_ids
+        self.missing = missing
+        self.done = False
+
+class SelectorBroker:
+    def __init__(self, host, port, verbose=True):
+        """
+        Single-threaded broker speaking the same protocol as `Broker`.
+
+        All sockets are non-blocking and multiplexed with `selectors`, so an idle
+        worker costs a few hundred bytes of state instead of a thread. Requests
+        that would block (GET_TASK / WAIT_RESULT with a wait) are parked and
+        answered when tasks or results arrive, or when their deadline passes.
+        """
+        self.host = host
+        self.port = port
+        self.verbose = verbose
+        self.selector = selectors.DefaultSelector()
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.task_queue = deque()
+        self.task_id_counter = 0
+        self.completed_count = 0
+        self.result_store = ResultStore()
+        self.clients = {}             # socket -> _ClientState
+        self.subscribers = {}         # producer_id -> _ClientState
+        self.notify_owner = {}        # task_id -> producer_id waiting for a push
+        self.parked_workers = deque() # _Waiters for GET_TASK
+        self.stale_parked = 0         # Entries of parked_workers already answered or disconnected
+        self.result_waiters = {}      # task_id -> [_Waiter] for WAIT_RESULT
+        self.deadlines = []           # heap of (deadline, seq, _Waiter)
+        self.deadline_seq = 0
+        self.running = True
+        self._wake_r, self._wake_w = socket.socketpair() # Lets stop() interrupt select()
+        self.loop_thread = None
+
+    def _log(self, text):
+        if self.verbose:
+            print(text)
+
+    def start(self):
+        self.server_socket.bind((self.host, self.port))
+        self.port = self.server_socket.getsockname()[1]
+        self.server_socket.listen(1024)
+        self.server_socket.setblocking(False)
+        self.selector.register(self.server_socket, selectors.EVENT_READ, data=None)
+        self._wake_r.setblocking(False)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, data="wake")
+        self._log(f"[Broker] Event-driven broker listening on {self.host}:{self.port}")
+        self.loop_thread = threading.Thread(target=self._event_loop, daemon=True)
+        self.loop_thread.start()
+
+    def _event_loop(self):
+        while self.running:
+            timeout = None
+            if self.deadlines:
+                timeout = max(0.0, self.deadlines[0][0] - time.monotonic())
+            for key, mask in self.selector.select(timeout):
+                if key.data is None:
+                    self._accept_connection()
+                elif key.data == "wake":
+                    try:
+                        self._wake_r.recv(64)
+                    except BlockingIOError:
+                        pass
+                else:
+                    self._service_connection(key.data, mask)
+            self._expire_waiters(time.monotonic())
+        self._teardown()
+        self._log("[Broker] Event loop stopped.")
+
+    def _teardown(self):
+        # Runs on the loop thread once it sees `running` is False, so no socket closes under select()
+        for sock in list(self.clients):
+            try:
+                sock.close()
+            except Exception:
+                pass
+        self.clients.clear()
+        for sock in (self.server_socket, self._wake_r, self._wake_w):
+            try:
+                sock.close()
+            except Exception:
+                pass
+        self.selector.close()
+
+    def _accept_connection(self):
+        while True:
+            try:
+                conn, addr = self.server_socket.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            conn.setblocking(False)
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client = _ClientState(conn, addr)
+            self.clients[conn] = client
+            self.selector.register(conn, selectors.EVENT_READ, data=client)
+
+    def _close_client(self, client):
+        if client.sock not in self.clients:
+            return
+        self.selector.unregister(client.sock)
+        del self.clients[client.sock]
+        if client.waiter is not None:
+            self._unpark(client.waiter)
+        if client.subscribed_as is not None and self.subscribers.get(client.subscribed_as) is client:
+            del self.subscribers[client.subscribed_as]
+        client.sock.close()
+
+    def _service_connection(self, client, mask):
+        if mask & selectors.EVENT_READ:
+            try:
+                data = client.sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                data = None
+            except OSError:
+                data = b""
+            if data == b"":
+                self._close_client(client)
+                return
+            if data:
+                client.inbuf.extend(data)
+                self._drain_inbuf(client)
+        if mask & selectors.EVENT_WRITE and client.sock in self.clients:
+            self._flush(client)
+
+    def _drain_inbuf(self, client):
+        buf = client.inbuf
+        offset = 0
+        while len(buf) - offset >= HEADER.size:
+            (length,) = HEADER.unpack_from(buf, offset)
+            end = offset + HEADER.size + length
+            if len(buf) < end:
+                break
+            try:
+                message = pickle.loads(buf[offset + HEADER.size:end])
+                offset = end
+                self._handle_message(client, message)
+            except Exception as e:
+                # A bad frame or request only costs its sender the connection, never the event loop
+                self._log(f"[Broker] Error handling message from {client.addr}: {e!r}")
+                self._close_client(client)
+                return
+            if client.sock not in self.clients:
+                return
+        del buf[:offset]
+
+    def _send(self, client, message):
+        payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+        client.outbuf += HEADER.pack(len(payload))
+        client.outbuf += payload
+        self._flush(client)
+
+    def _flush(self, client):
+        try:
+            sent = client.sock.send(client.outbuf)
+            del client.outbuf[:sent]
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            self._close_client(client)
+            return
+        want_write = bool(client.outbuf)
+        if want_write != client.writing:
+            client.writing = want_write
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if want_write else 0)
+            self.selector.modify(client.sock, events, data=client)
+
+    def _park(self, waiter, wait):
+        waiter.client.waiter = waiter
+        self.deadline_seq += 1
+        heapq.heappush(self.deadlines, (time.monotonic() + wait, self.deadline_seq, waiter))
+
+    def _unpark(self, waiter):
+        """
+        Marks a waiter as finished and drops it from the park lists, so that
+        expired or disconnected waiters do not pile up. Result waiters are
+        removed from each of their task's lists; parked workers are dropped
+        lazily, with the deque compacted once most of it is stale.
+        """
+        waiter.done = True
+        waiter.client.waiter = None
+        if waiter.task_ids is None:
+            self.stale_parked += 1
+            if self.stale_parked * 2 > len(self.parked_workers):
+                self.parked_workers = deque(w for w in self.parked_workers if not w.done)
+                self.stale_parked = 0
+            return
+        for task_id in waiter.missing:
+            waiters = self.result_waiters.get(task_id)
+            if waiters is None:
+                continue
+            if waiter in waiters:
+                waiters.remove(waiter)
+            if not waiters:
+                del self.result_waiters[task_id]
+
+    def _finish(self, waiter, extra):
+        self._unpark(waiter)
+        waiter.response.update(extra)
+        self._send(waiter.client, waiter.response)
+
+    def _expire_waiters(self, now):
+        while self.deadlines and self.deadlines[0][0] <= now:
+            _, _, waiter = heapq.heappop(self.deadlines)
+            if waiter.done:
+                continue
+            if waiter.task_ids is None:
+                self._finish(waiter, {"type": NO_TASK, "tasks": []})
+            else:
+                results = self.result_store.wait_for(waiter.task_ids, 0)
+                self._finish(waiter, {"results": results,
+                                      "missing": [t for t in waiter.task_ids if t not in results]})
+
+    def _take_tasks(self, max_tasks):
+        count = min(max_tasks, len(self.task_queue))
+        return [self.task_queue.popleft() for _ in range(count)]
+
+    def _serve_parked_workers(self):
+        while self.task_queue and self.parked_workers:
+            waiter = self.parked_workers.popleft()
+            self.stale_parked -= 1 # Counted as stale when it finishes, but it has already left the deque
+            if not waiter.done:
+                tasks = self._take_tasks(waiter.max_tasks)
+                self._finish(waiter, {"type": TASK_REQUEST, "task": tasks[0], "tasks": tasks})
+
+    def _dispatch(self, client, response, max_tasks, wait):
+        """
+        Answers a GET_TASK (or a TASK_DONE carrying one) now if work is queued,
+        otherwise parks the request for up to `wait` seconds.
+        """
+        tasks = self._take_tasks(max_tasks)
+        if tasks:
+            response.update({"type": TASK_REQUEST, "task": tasks[0], "tasks": tasks})
+        elif wait > 0:
+            waiter = _Waiter(client, response, max_tasks=max_tasks)
+            self.parked_workers.append(waiter)
+            self._park(waiter, wait)
+            return
+        else:
+            response.update({"type": NO_TASK, "tasks": []})
+        self._send(client, response)
+
+    def _record_results(self, results, addr):
+        for task_id, result in results:
+            self._log(f"[Broker] Task {task_id} completed by worker {addr} with result: {result}")
+        self.result_store.put_many(results)
+        self.completed_count += len(results)
+        pushes = {}
+        for task_id, result in results:
+            producer_id = self.notify_owner.pop(task_id, None)
+            if producer_id is not None:
+                pushes.setdefault(producer_id, []).append((task_id, result))
+            for waiter in self.result_waiters.pop(task_id, ()):
+                waiter.missing.discard(task_id)
+                if not waiter.missing and not waiter.done:
+                    self._finish(waiter, {"results": self.result_store.wait_for(waiter.task_ids, 0), "missing": []})
+        for producer_id, batch in pushes.items():
+            subscriber = self.subscribers.get(producer_id)
+            if subscriber is not None:
+                self._send(subscriber, {"type": TASK_RESULT, "results": batch})
+
+    def _handle_message(self, client, message):
+        msg_type = message.get("type")
+
+        if msg_type == TASK_SUBMIT:
+            task_infos = message.get("tasks")
+            if task_infos is None and message.get("task"):
+                task_infos = [message["task"]]
+            if not task_infos:
+                self._send(client, {"status": "ERROR", "message": "No task info provided."})
+                return
+            notify_producer = message.get("producer_id") if message.get("notify") else None
+            task_ids = []
+            for info in task_infos:
+                self.task_id_counter += 1
+                task = Task(self.task_id_counter, info['func_name'], info.get('args'), info.get('kwargs'))
+                if notify_producer is not None:
+                    self.notify_owner[task.task_id] = notify_producer
+                self.task_queue.append(task)
+                task_ids.append(task.task_id)
+            self._log(f"[Broker] Received {len(task_ids)} task(s) {task_ids[:5]} from producer {client.addr}. Queue size: {len(self.task_queue)}")
+            self._send(client, {"status": "SUCCESS", "task_id": task_ids[0], "task_ids": task_ids})
+            self._serve_parked_workers()
+
+        elif msg_type == TASK_REQUEST:
+            self._dispatch(client, {}, message.get("max_tasks", 1), message.get("wait", 0))
+
+        elif msg_type == TASK_DONE:
+            results = message.get("results")
+            if results is None:
+                results = [(message.get("task_id"), message.get("result"))]
+            self._record_results(results, client.addr)
+            response = {"status": "ACK_TASK_DONE", "count": len(results)}
+            max_tasks = message.get("max_tasks", 0)
+            if max_tasks:
+                self._dispatch(client, response, max_tasks, message.get("wait", 0))
+            else:
+                self._send(client, response)
+
+        elif msg_type == WAIT_RESULT:
+            task_ids = list(message.get("task_ids", []))
+            results = self.result_store.wait_for(task_ids, 0)
+            missing = {t for t in task_ids if t not in results}
+            timeout = message.get("timeout", 0)
+            if not missing or timeout <= 0:
+                self._send(client, {"type": WAIT_RESULT, "results": results, "missing": list(missing)})
+                return
+            waiter = _Waiter(client, {"type": WAIT_RESULT}, task_ids=task_ids, missing=missing)
+            for task_id in missing:
+                self.result_waiters.setdefault(task_id, []).append(waiter)
+            self._park(waiter, timeout)
+
+        elif msg_type == SUBSCRIBE:
+            client.subscribed_as = message.get("producer_id")
+            self.subscribers[client.subscribed_as] = client
+            self._send(client, {"status": "SUBSCRIBED"})
+
+        else:
+            self._log(f"[Broker] Unknown message type from {client.addr}: {msg_type}")
+            self._send(client, {"status": "ERROR", "message": "Unknown message type."})
+
+    def stop(self):
+        self._log("[Broker] Shutting down Broker...")
+        self.running = False
+        if self.loop_thread is None: # Never started
+            self._teardown()
+        else:
+            try:
+                self._wake_w.send(b"x")
+            except OSError:
+                pass
+            self.loop_thread.join()
+        self._log("[Broker] Broker stopped.")
 
 # --- Worker Implementation ---
 class Worker:
-    def __init__(self, broker_host, broker_port, worker_id, known_funcs):
+    def __init__(self, broker_host, broker_port, worker_id, known_funcs,
+                 prefetch=DEFAULT_PREFETCH, work_delay=(0.5, 2.0), verbose=True):
+        """
+        Args:
+            prefetch (int): Credit window. The worker never holds more than this
+                            many unfinished tasks, and asks for exactly as many
+                            tasks as it has free credits.
+            work_delay (tuple | None): (min, max) seconds of simulated work per
+                                       task, or None to run tasks at full speed.
+        """
         self.broker_host = broker_host
         self.broker_port = broker_port
         self.worker_id = worker_id
         self.known_funcs = known_funcs
+        self.prefetch = max(1, prefetch)
+        self.work_delay = work_delay
+        self.verbose = verbose
         self.socket = None
         self.running = True
+        self.fetch_latencies = [] # Seconds per GET_TASK round-trip that returned tasks
+
+    def _log(self, text):
+        if self.verbose:
+            print(text)
 
     def _connect(self):
         if self.socket:
@@ -158,62 +718,83 @@ class Worker:
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
             self.socket.connect((self.broker_host, self.broker_port))
-            print(f"[Worker {self.worker_id}] Connected to broker.")
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._log(f"[Worker {self.worker_id}] Connected to broker.")
             return True
         except socket.error as e:
-            print(f"[Worker {self.worker_id}] Could not connect to broker: {e}. Retrying...")
+            self._log(f"[Worker {self.worker_id}] Could not connect to broker: {e}. Retrying...")
+            self.socket = None
             return False
 
+    def _request(self, message):
+        send_message(self.socket, message)
+        response = recv_message(self.socket)
+        if response is None:
+            raise ConnectionResetError("Broker closed the connection")
+        return response
+
+    def _execute(self, task):
+        self._log(f"[Worker {self.worker_id}] Received task {task.task_id}: {task.func_name}")
+        if task.func_name not in self.known_funcs:
+            self._log(f"[Worker {self.worker_id}] Unknown function '{task.func_name}' for task {task.task_id}")
+            return f"ERROR: Unknown function {task.func_name}"
+        try:
+            func = self.known_funcs[task.func_name]
+            if self.work_delay:
+                time.sleep(random.uniform(*self.work_delay)) # Simulate work
+            result = func(*task.args, **task.kwargs)
+            self._log(f"[Worker {self.worker_id}] Task {task.task_id} completed. Result: {result}")
+            return result
+        except Exception as e:
+            self._log(f"[Worker {self.worker_id}] Error executing task {task.task_id}: {e}")
+            return f"ERROR: {e}"
+
     def start(self):
+        pending = deque()  # Prefetched tasks not yet executed
+        results = []  # Finished (task_id, result) pairs not yet acknowledged by the broker
         while self.running:
-            if not self._connect():
+            if self.socket is None and not self._connect():
                 time.sleep(2) # Wait before retrying connection
                 continue
 
             try:
-                # Request a task
-                self.socket.sendall(pickle.dumps({"type": TASK_REQUEST}))
-                response_data = self.socket.recv(BUFFER_SIZE)
-                response = pickle.loads(response_data)
-
-                if response.get("type") == TASK_REQUEST and response.get("task"):
-                    task = response["task"]
-                    print(f"[Worker {self.worker_id}] Received task {task.task_id}: {task.func_name}")
-                    
-                    if task.func_name in self.known_funcs:
-                        try:
-                            func = self.known_funcs[task.func_name]
-                            # Simulate work
-                            time.sleep(random.uniform(0.5, 2.0))
-                            result = func(*task.args, **task.kwargs)
-                            print(f"[Worker {self.worker_id}] Task {task.task_id} completed. Result: {result}")
-                            self.socket.sendall(pickle.dumps({"type": TASK_DONE, "task_id": task.task_id, "result": result}))
-                            ack = pickle.loads(self.socket.recv(BUFFER_SIZE))
-                            # print(f"[Worker {self.worker_id}] Broker ACK: {ack}")
-                        except Exception as e:
-                            print(f"[Worker {self.worker_id}] Error executing task {task.task_id}: {e}")
-                            self.socket.sendall(pickle.dumps({"type": TASK_DONE, "task_id": task.task_id, "result": f"ERROR: {e}"}))
-                            pickle.loads(self.socket.recv(BUFFER_SIZE)) # consume ACK
+                if not pending:
+                    # Report everything finished so far and spend all free credits
+                    # on the next batch in the same round-trip.
+                    started = time.perf_counter()
+                    if results:
+                        response = self._request({"type": TASK_DONE, "results": results,
+                                                  "max_tasks": self.prefetch, "wait": DEFAULT_FETCH_WAIT})
+                        results = []
                     else:
-                        print(f"[Worker {self.worker_id}] Unknown function '{task.func_name}' for task {task.task_id}")
-                        self.socket.sendall(pickle.dumps({"type": TASK_DONE, "task_id": task.task_id, "result": f"ERROR: Unknown function {task.func_name}"}))
-                        pickle.loads(self.socket.recv(BUFFER_SIZE)) # consume ACK
-                elif response.get("type") == NO_TASK:
-                    # print(f"[Worker {self.worker_id}] No tasks available. Waiting...")
-                    time.sleep(1) # Wait before asking again
-                else:
-                    print(f"[Worker {self.worker_id}] Unexpected response from broker: {response}")
+                        response = self._request({"type": TASK_REQUEST, "max_tasks": self.prefetch,
+                                                  "wait": DEFAULT_FETCH_WAIT})
+                    if response.get("type") == TASK_REQUEST and response.get("tasks"):
+                        self.fetch_latencies.append(time.perf_counter() - started)
+                        pending.extend(response["tasks"])
+                    elif response.get("type") != NO_TASK:
+                        self._log(f"[Worker {self.worker_id}] Unexpected response from broker: {response}")
+                    continue
+
+                task = pending.popleft()
+                results.append((task.task_id, self._execute(task)))
 
             except (socket.error, ConnectionResetError, pickle.UnpicklingError) as e:
-                print(f"[Worker {self.worker_id}] Connection error: {e}. Reconnecting...")
-                self._connect() # Attempt to reconnect
+                if not self.running:
+                    break
+                # Finished results are kept and reported again after reconnecting;
+                # unstarted tasks are dropped, since a real system would lease them
+                # and let the broker re-queue on timeout.
+                self._log(f"[Worker {self.worker_id}] Connection error: {e}. Reconnecting...")
+                pending.clear()
+                self.socket = None
                 time.sleep(1)
             except Exception as e:
-                print(f"[Worker {self.worker_id}] Unexpected error: {e}")
+                self._log(f"[Worker {self.worker_id}] Unexpected error: {e}")
                 self.stop() # Critical error, stop worker
 
     def stop(self):
-        print(f"[Worker {self.worker_id}] Shutting down worker...")
+        self._log(f"[Worker {self.worker_id}] Shutting down worker...")
         self.running = False
         if self.socket:
             try:
@@ -221,76 +802,141 @@ class Worker:
                 self.socket.close()
             except Exception:
                 pass
-        print(f"[Worker {self.worker_id}] Worker stopped.")
+        self._log(f"[Worker {self.worker_id}] Worker stopped.")
 
 # --- Producer Implementation ---
 class Producer:
-    def __init__(self, broker_host, broker_port, producer_id):
+    def __init__(self, broker_host, broker_port, producer_id, verbose=True):
         self.broker_host = broker_host
         self.broker_port = broker_port
         self.producer_id = producer_id
+        self.verbose = verbose
         self.socket = None
+        self.notify_socket = None
         self.running = True
 
+    def _log(self, text):
+        if self.verbose:
+            print(text)
+
     def _connect(self):
         if self.socket:
-            try: self.socket.close()
-            except: pass
+            return True # Keep using the persistent connection
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
             self.socket.connect((self.broker_host, self.broker_port))
-            print(f"[Producer {self.producer_id}] Connected to broker.")
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._log(f"[Producer {self.producer_id}] Connected to broker.")
             return True
         except socket.error as e:
-            print(f"[Producer {self.producer_id}] Could not connect to broker: {e}. Retrying...")
+            self._log(f"[Producer {self.producer_id}] Could not connect to broker: {e}. Retrying...")
+            self.socket = None
             return False
 
-    def submit_task(self, func_name, *args, **kwargs):
+    def _drop_connection(self):
+        if self.socket:
+            try:
+                self.socket.close()
+            except Exception:
+                pass
+            self.socket = None
+
+    def _request(self, message):
+        send_message(self.socket, message)
+        response = recv_message(self.socket)
+        if response is None:
+            raise ConnectionResetError("Broker closed the connection")
+        return response
+
+    def submit_tasks(self, task_specs, notify=False):
+        """
+        Submits many tasks in one message.
+
+        Args:
+            task_specs (list): (func_name, args, kwargs) tuples.
+            notify (bool): Ask the broker to push each result to this producer's
+                           subscription (see `subscribe`) when it completes.
+
+        Returns:
+            list | None: The broker-assigned task ids, in submission order.
+        """
         if not self._connect():
-            print(f"[Producer {self.producer_id}] Failed to connect to broker, cannot submit task.")
+            self._log(f"[Producer {self.producer_id}] Failed to connect to broker, cannot submit tasks.")
             return None
 
-        task_payload = {
-            "func_name": func_name,
-            "args": args,
-            "kwargs": kwargs
-        }
-        message = {"type": TASK_SUBMIT, "task": task_payload}
+        payload = [{"func_name": f, "args": tuple(a), "kwargs": dict(kw)} for f, a, kw in task_specs]
         try:
-            self.socket.sendall(pickle.dumps(message))
-            response_data = self.socket.recv(BUFFER_SIZE)
-            response = pickle.loads(response_data)
+            response = self._request({"type": TASK_SUBMIT, "tasks": payload,
+                                      "producer_id": self.producer_id, "notify": notify})
             if response.get("status") == "SUCCESS":
-                print(f"[Producer {self.producer_id}] Task '{func_name}' submitted successfully, ID: {response.get('task_id')}")
-                return response.get('task_id')
-            else:
-                print(f"[Producer {self.producer_id}] Failed to submit task: {response.get('message')}")
-                return None
+                self._log(f"[Producer {self.producer_id}] {len(payload)} task(s) submitted successfully, IDs: {response['task_ids'][:5]}")
+                return response["task_ids"]
+            self._log(f"[Producer {self.producer_id}] Failed to submit tasks: {response.get('message')}")
+            return None
         except (socket.error, ConnectionResetError, pickle.UnpicklingError) as e:
-            print(f"[Producer {self.producer_id}] Connection error during submission: {e}. Retrying...")
-            self._connect() # Attempt to reconnect for next task
+            self._log(f"[Producer {self.producer_id}] Connection error during submission: {e}. Will reconnect.")
+            self._drop_connection()
             return None
         except Exception as e:
-            print(f"[Producer {self.producer_id}] Unexpected error submitting task: {e}")
+            self._log(f"[Producer {self.producer_id}] Unexpected error submitting tasks: {e}")
             return None
-        finally:
-            if self.socket: # Close connection after each submission for simplicity in this example
-                try:
-                    self.socket.close()
-                except Exception:
-                    pass
-                self.socket = None
 
+    def submit_task(self, func_name, *args, **kwargs):
+        task_ids = self.submit_tasks([(func_name, args, kwargs)])
+        return task_ids[0] if task_ids else None
+
+    def wait_results(self, task_ids, timeout=10.0):
+        """
+        Collects the results of many tasks in a single round-trip.
+
+        Returns:
+            dict: task_id -> result for every task that finished within `timeout`.
+                  Missing ids either are still running or were evicted.
+        """
+        if not self._connect():
+            return {}
+        try:
+            response = self._request({"type": WAIT_RESULT, "task_ids": list(task_ids), "timeout": timeout})
+            return response.get("results", {})
+        except (socket.error, ConnectionResetError, pickle.UnpicklingError) as e:
+            self._log(f"[Producer {self.producer_id}] Connection error while waiting for results: {e}")
+            self._drop_connection()
+            return {}
+
+    def subscribe(self, callback):
+        """
+        Opens a second connection on which the broker pushes results of tasks
+        submitted with `notify=True`. `callback(task_id, result)` runs on a
+        background thread for each of them.
+        """
+        self.notify_socket = socket.create_connection((self.broker_host, self.broker_port))
+        send_message(self.notify_socket, {"type": SUBSCRIBE, "producer_id": self.producer_id})
+        recv_message(self.notify_socket) # SUBSCRIBED ack
+
+        def listen():
+            try:
+                while self.running:
+                    message = recv_message(self.notify_socket)
+                    if message is None:
+                        break
+                    for task_id, result in message.get("results", []):
+                        callback(task_id, result)
+            except (socket.error, pickle.UnpicklingError):
+                pass
+
+        threading.Thread(target=listen, daemon=True).start()
 
     def stop(self):
-        print(f"[Producer {self.producer_id}] Shutting down producer...")
+        self._log(f"[Producer {self.producer_id}] Shutting down producer...")
         self.running = False
-        if self.socket:
+        self._drop_connection()
+        if self.notify_socket:
             try:
-                self.socket.close()
+                self.notify_socket.shutdown(socket.SHUT_RDWR)
+                self.notify_socket.close()
             except Exception:
                 pass
-        print(f"[Producer {self.producer_id}] Producer stopped.")
+        self._log(f"[Producer {self.producer_id}] Producer stopped.")
 
 # --- Functions for Workers to execute ---
 def simple_add(a, b):
@@ -305,8 +951,159 @@ def complex_calc(n_iterations):
 def greet_name(name="World"):
     return f"Hello, {name}!"
 
+# --- Throughput Benchmark ---
+def _legacy_worker_loop(host, port, funcs, stop_event, latencies):
+    """
+    Reproduces the original one-connection-per-task worker: connect, GET_TASK
+    for a single task, run it, report it, close.
+    """
+    while not stop_event.is_set():
+        started = time.perf_counter()
+        sock = socket.create_connection((host, port))
+        try:
+            send_message(sock, {"type": TASK_REQUEST})
+            response = recv_message(sock)
+            if response is None or response.get("type") != TASK_REQUEST:
+                time.sleep(0.01)
+                continue
+            latencies.append(time.perf_counter() - started)
+            task = response["task"]
+            result = funcs[task.func_name](*task.args, **task.kwargs)
+            send_message(sock, {"type": TASK_DONE, "task_id": task.task_id, "result": result})
+            recv_message(sock)
+        finally:
+            sock.close()
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def _run_benchmark_round(label, num_tasks, num_workers, prefetch):
+    broker = Broker(BROKER_HOST, 0, verbose=False)
+    broker.start()
+    funcs = {"simple_add": simple_add}
+
+    producer = Producer(BROKER_HOST, broker.port, 0, verbose=False)
+    for start in range(0, num_tasks, 1000):
+        producer.submit_tasks([("simple_add", (i, i), {}) for i in range(start, min(num_tasks, start + 1000))])
+    producer.stop()
+
+    stop_event = threading.Event()
+    latencies = []
+    threads = []
+    workers = []
+    began = time.perf_counter()
+    for i in range(num_workers):
+        if prefetch is None:
+            t = threading.Thread(target=_legacy_worker_loop,
+                                 args=(BROKER_HOST, broker.port, funcs, stop_event, latencies), daemon=True)
+        else:
+            worker = Worker(BROKER_HOST, broker.port, i + 1, funcs, prefetch=prefetch, work_delay=None, verbose=False)
+            workers.append(worker)
+            t = threading.Thread(target=worker.start, daemon=True)
+        threads.append(t)
+        t.start()
+
+    while broker.completed_count < num_tasks:
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - began
+
+    stop_event.set()
+    for worker in workers:
+        worker.stop()
+        latencies.extend(worker.fetch_latencies)
+    broker.stop()
+
+    print(f"{label:<28} {num_tasks / elapsed:>12,.0f} tasks/s   "
+          f"p99 dispatch {_percentile(latencies, 99) * 1000:8.3f} ms   ({len(latencies)} fetches)")
+
+def run_benchmark(num_tasks=20000, num_workers=4):
+    print(f"Dispatching {num_tasks} no-op tasks to {num_workers} workers on localhost\n")
+    _run_benchmark_round("connection-per-task (old)", num_tasks, num_workers, None)
+    for prefetch in (1, 8, DEFAULT_PREFETCH, 128):
+        _run_benchmark_round(f"persistent, prefetch={prefetch}", num_tasks, num_workers, prefetch)
+
+# --- Load Generator: threaded vs event-driven engine ---
+ENGINES = {"threaded": Broker, "event-driven": SelectorBroker}
+
+def _serve_engine(engine, control):
+    broker = ENGINES[engine](BROKER_HOST, 0, verbose=False)
+    broker.start()
+    control.send(broker.port)
+    control.recv() # Block until the parent asks us to stop
+    broker.stop()
+
+def _read_proc_status(pid):
+    """
+    Returns (rss_bytes, threads) for a process, or (None, None) where /proc is unavailable.
+    """
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(fields["VmRSS"].split()[0]) * 1024, int(fields["Threads"])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+def run_loadtest(engine, idle_connections=2000, num_tasks=20000, num_workers=16):
+    parent_end, child_end = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_serve_engine, args=(engine, child_end), daemon=True)
+    process.start()
+    port = parent_end.recv()
+    rss_before, _ = _read_proc_status(process.pid)
+
+    # Memory per connection: open idle clients and make one round-trip on each,
+    # which guarantees the broker has fully set up its per-connection state.
+    idle = []
+    for _ in range(idle_connections):
+        sock = socket.create_connection((BROKER_HOST, port))
+        send_message(sock, {"type": WAIT_RESULT, "task_ids": [], "timeout": 0})
+        recv_message(sock)
+        idle.append(sock)
+    rss_after, threads = _read_proc_status(process.pid)
+
+    # Throughput: batched producer, persistent workers, one WAIT_RESULT to collect
+    producer = Producer(BROKER_HOST, port, 0, verbose=False)
+    workers = [Worker(BROKER_HOST, port, i + 1, {"simple_add": simple_add}, prefetch=8,
+                      work_delay=None, verbose=False) for i in range(num_workers)]
+    for worker in workers:
+        threading.Thread(target=worker.start, daemon=True).start()
+    began = time.perf_counter()
+    task_ids = []
+    for start in range(0, num_tasks, 1000):
+        task_ids.extend(producer.submit_tasks([("simple_add", (i, i), {}) for i in range(start, min(num_tasks, start + 1000))]))
+    collected = producer.wait_results(task_ids, timeout=120.0)
+    elapsed = time.perf_counter() - began
+
+    for worker in workers:
+        worker.stop()
+    producer.stop()
+    for sock in idle:
+        sock.close()
+    parent_end.send("stop")
+    process.join(timeout=5)
+
+    if rss_before is not None:
+        per_conn = (rss_after - rss_before) / idle_connections
+        memory = f"{per_conn / 1024:7.1f} KiB/conn ({threads} threads)"
+    else:
+        memory = "memory n/a"
+    print(f"{engine:<14} {memory}   {len(collected) / elapsed:>10,.0f} tasks/s "
+          f"({len(collected)}/{num_tasks} results)")
+
 # --- Main Simulation ---
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        run_benchmark()
+        sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == "loadtest":
+        connections = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+        print(f"{connections} idle connections, then 20000 tasks through 16 workers\n")
+        for engine in ENGINES:
+            run_loadtest(engine, idle_connections=connections)
+        sys.exit(0)
+
     # Start Broker in a separate thread
     broker = Broker(BROKER_HOST, BROKER_PORT)
     broker_thread = threading.Thread(target=broker.start, daemon=True)
@@ -323,7 +1120,7 @@ if __name__ == "__main__":
     workers = []
     worker_threads = []
     for i in range(num_workers):
-        worker = Worker(BROKER_HOST, BROKER_PORT, i + 1, worker_functions)
+        worker = Worker(BROKER_HOST, BROKER_PORT, i + 1, worker_functions, prefetch=2)
         workers.append(worker)
         w_thread = threading.Thread(target=worker.start, daemon=True)
         worker_threads.append(w_thread)
@@ -345,10 +1142,22 @@ if __name__ == "__main__":
     producers[0].submit_task("greet_name")
     producers[1].submit_task("complex_calc", n_iterations=500000)
     producers[0].submit_task("non_existent_func") # Test unknown function
+    # Batched submission: one message, one round-trip
+    producers[1].submit_tasks([("simple_add", (i, i), {}) for i in range(5)])
+
+    # Push notification: results arrive on producer 2's subscription as they finish
+    producers[1].subscribe(lambda task_id, result: print(f"[Producer 2] Pushed result for task {task_id}: {result}"))
+    producers[1].submit_tasks([("greet_name", (), {"name": n}) for n in ("Bob", "Carol")], notify=True)
+
+    # Pipelined collection: submit a batch, then gather every result in one call
+    batch_ids = producers[0].submit_tasks([("simple_add", (i, 100), {}) for i in range(6)])
+    print(f"\n--- Waiting for results of tasks {batch_ids} ---")
+    collected = producers[0].wait_results(batch_ids, timeout=15.0)
+    print(f"[Producer 1] Collected {len(collected)}/{len(batch_ids)} results: {collected}")
 
     # Let the system run for a while
-    print("\n--- Allowing system to run for 10 seconds ---")
-    time.sleep(10)
+    print("\n--- Allowing system to run for 5 seconds ---")
+    time.sleep(5)
 
     # Clean up (join non-daemon threads if any, or just let daemons exit with main)
     # For this example, we're using daemon threads, so they'll exit when the main thread exits.
@@ -359,7 +1168,7 @@ if __name__ == "__main__":
     for p in producers:
         p.stop()
     broker.stop()
-    
+
     # Give threads a moment to finish their cleanup
-    time.sleep(1) 
-    print("Simulation finished.")
\ No newline at end of file
+    time.sleep(1)
+    print("Simulation finished.")
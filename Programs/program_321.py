@@ -41,9 +41,27 @@ def kmp_search(text, pattern):
     
     return -1
 
+def kmp_find_all(text, pattern):
+    """Yields the start of every (possibly overlapping) occurrence of pattern."""
+    M = len(pattern)
+    if M == 0:
+        return
+    lps = compute_lps_array(pattern)
+    j = 0
+    for i, char in enumerate(text):
+        while j and char != pattern[j]:
+            j = lps[j - 1]
+        if char == pattern[j]:
+            j += 1
+            if j == M:
+                yield i - M + 1
+                j = lps[j - 1]
+
 if __name__ == '__main__':
     text = "ABABDABACDABABCABAB"
     pattern = "ABABCABAB"
     
     index = kmp_search(text, pattern)
-    print(f"Pattern found at index: {index}")
\ No newline at end of file
+    print(f"Pattern found at index: {index}")
+    print(f"All occurrences of 'ABAB': {list(kmp_find_all(text, 'ABAB'))}")
+    # Expected: [0, 10, 15]
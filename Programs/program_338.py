@@ -1,32 +1,16 @@
-class DSU:
-    def __init__(self, n):
-        self.parent = list(range(n))
-
-    def find(self, i):
-        if self.parent[i] == i:
-            return i
-        self.parent[i] = self.find(self.parent[i])
-        return self.parent[i]
-
-    def union(self, i, j):
-        root_i = self.find(i)
-        root_j = self.find(j)
-        if root_i != root_j:
-            self.parent[root_i] = root_j
-            return True
-        return False
+from program_28 import IntDisjointSetUnion as DSU # Array-backed, iterative find
 
 def kruskal_mst(vertices, edges):
     edges.sort(key=lambda x: x[2])
     dsu = DSU(len(vertices))
+    index = {vertex: i for i, vertex in enumerate(vertices)}
     mst = []
     mst_weight = 0
     
     for u, v, weight in edges:
-        u_idx = vertices.index(u)
-        v_idx = vertices.index(v)
-        
-        if dsu.union(u_idx, v_idx):
+        if dsu.num_sets == 1:
+            break # Spanning tree complete
+        if dsu.union(index[u], index[v]):
             mst.append((u, v, weight))
             mst_weight += weight
             
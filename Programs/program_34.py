@@ -1,6 +1,12 @@
 import random
 import math
 import operator
+import os
+import sys
+import time
+from contextlib import nullcontext
+from multiprocessing import Pool
+import numpy as np
 
 # --- Node Definitions for Expression Tree ---
 class Node:
@@ -25,10 +31,8 @@ class Node:
         """Evaluates the expression tree for a given 'x' value."""
         if self.value == 'x':
             return x_val
-        try:
+        if not self.children:
             return float(self.value) # Constant
-        except ValueError:
-            pass # Not a constant, must be an operator
 
         # Operators
         if self.value == '+':
@@ -60,6 +64,110 @@ class Node:
         """Performs a deep copy of the node and its children."""
         return Node(self.value, [child.copy() for child in self.children])
 
+    def compile(self) -> tuple:
+        """
+        Flattens the tree into a postfix program: a tuple of 'x', float
+        constants and operator strings, children before their operator.
+        """
+        program = []
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded or not node.children:
+                program.append(node.value if node.value == 'x' or node.children else float(node.value))
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node.children))
+        return tuple(program)
+
+# --- Compiled Evaluation ---
+def protected_divide(numerator, denominator):
+    """Elementwise version of Node.evaluate's '/': 1.0 wherever |denominator| < 1e-6."""
+    small = np.abs(denominator) < 1e-6
+    return np.where(small, 1.0, numerator / np.where(small, 1.0, denominator))
+
+BINARY_OPERATORS = {'+': np.add, '-': np.subtract, '*': np.multiply, '/': protected_divide}
+
+class ExpressionEvaluator:
+    def __init__(self, x_values, y_values=None, max_cached: int = 100_000):
+        """
+        Runs compiled postfix programs over every data point at once.
+
+        Each subtree is hash-consed to a small integer id: a terminal by its
+        value, an operator by (operator, left id, right id). Results are cached
+        by id, so a subexpression shared by many individuals (common after
+        crossover and elitism) is computed once until `clear` is called, which
+        the GP does once per generation.
+
+        Args:
+            x_values: Inputs of the data set.
+            y_values: Targets, needed for `mse`.
+            max_cached (int): Cap on cached arrays per generation, to bound memory
+                              on large data sets.
+        """
+        self.x = np.asarray(x_values, dtype=np.float64)
+        self.y = None if y_values is None else np.asarray(y_values, dtype=np.float64)
+        self.max_cached = max_cached
+        self.ids = {} # Subtree key -> id
+        self.cache = {} # Subtree id -> result array
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.ids.clear()
+        self.cache.clear()
+
+    def run(self, program: tuple) -> np.ndarray:
+        """Values of a postfix program (see Node.compile) for every x."""
+        ids, cache = self.ids, self.cache
+        stack = [] # (subtree id, values)
+        with np.errstate(all='ignore'):
+            for token in program:
+                if token in BINARY_OPERATORS:
+                    right_id, right = stack.pop()
+                    left_id, left = stack.pop()
+                    key = (token, left_id, right_id)
+                else:
+                    key = token
+                subtree = ids.get(key)
+                if subtree is None:
+                    subtree = ids[key] = len(ids)
+                values = cache.get(subtree)
+                if values is not None:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                    if token == 'x':
+                        values = self.x
+                    elif token in BINARY_OPERATORS:
+                        values = BINARY_OPERATORS[token](left, right)
+                    else:
+                        values = np.full(self.x.shape, token)
+                    if len(cache) < self.max_cached:
+                        cache[subtree] = values
+                stack.append((subtree, values))
+        return stack[0][1]
+
+    def mse(self, program: tuple) -> float:
+        """Mean squared error against y; inf for expressions that overflow."""
+        with np.errstate(all='ignore'):
+            mse = float(np.mean((self.run(program) - self.y) ** 2))
+        return mse if math.isfinite(mse) else float('inf')
+
+# Per-process evaluator for parallel fitness; set up once by the pool initializer
+_worker_evaluator = None
+
+def _init_worker(x_values, y_values):
+    global _worker_evaluator
+    _worker_evaluator = ExpressionEvaluator(x_values, y_values)
+
+def _mse_chunk(task):
+    generation, programs = task
+    if getattr(_worker_evaluator, 'generation', None) != generation:
+        _worker_evaluator.clear()
+        _worker_evaluator.generation = generation
+    return [_worker_evaluator.mse(program) for program in programs]
+
 # --- Genetic Programming Implementation ---
 class GeneticProgrammer:
     def __init__(self,
@@ -67,13 +175,19 @@ class GeneticProgrammer:
                  pop_size: int = 100,
                  max_depth: int = 5,
                  mutation_rate: float = 0.1,
-                 crossover_rate: float = 0.8):
+                 crossover_rate: float = 0.8,
+                 processes: int | None = 1):
 
         self.target_data = target_data
         self.pop_size = pop_size
         self.max_depth = max_depth
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
+        self.processes = processes # Fitness worker pool size; None uses every CPU, 1 evaluates in-process
+
+        self.evaluator = ExpressionEvaluator([x for x, _ in target_data], [y for _, y in target_data])
+        self._fitness = {} # id(individual) -> fitness for the current generation
+        self._generation = 0
 
         # Define the set of available functions (operators) and terminals
         self.functions = ['+', '-', '*', '/'] # Binary operators
@@ -114,22 +228,36 @@ class GeneticProgrammer:
         """
         Calculates fitness based on Mean Squared Error (MSE).
         Lower MSE (closer to 0) is better.
+        The tree is compiled and evaluated over all data points in one pass.
         """
-        total_squared_error = 0.0
-        for x_val, true_y in self.target_data:
-            try:
-                predicted_y = individual.evaluate(x_val)
-                error = predicted_y - true_y
-                total_squared_error += error ** 2
-            except (ValueError, TypeError): # Catch errors during evaluation (e.g., log of negative)
-                return float('inf') # Penalize invalid expressions heavily
-        
-        mse = total_squared_error / len(self.target_data)
+        return self._fitness_from_mse(self.evaluator.mse(individual.compile()))
+
+    @staticmethod
+    def _fitness_from_mse(mse: float) -> float:
         # For selection, we often want higher values for better fitness.
-        # So, we can return 1 / (1 + mse) or (some_large_number - mse)
         # Using 1 / (1 + mse) to avoid division by zero and make higher values better.
         return 1.0 / (1.0 + mse)
 
+    def _population_fitness(self, pool=None) -> list[float]:
+        """
+        Fitness of every individual, computed once per generation. With a pool
+        the compiled programs are split into one chunk per worker; each worker
+        keeps its own subtree cache for the generation.
+        """
+        self._generation += 1
+        programs = [individual.compile() for individual in self.population]
+        if pool is None:
+            self.evaluator.clear()
+            errors = [self.evaluator.mse(program) for program in programs]
+        else:
+            workers = self.processes or os.cpu_count()
+            size = -(-len(programs) // workers)
+            chunks = [(self._generation, programs[i:i + size]) for i in range(0, len(programs), size)]
+            errors = [mse for chunk in pool.map(_mse_chunk, chunks) for mse in chunk]
+        fitness = [self._fitness_from_mse(mse) for mse in errors]
+        self._fitness = {id(individual): f for individual, f in zip(self.population, fitness)}
+        return fitness
+
     def _select_parent(self) -> Node:
         """
         Selects a parent using Tournament Selection.
@@ -141,7 +269,9 @@ class GeneticProgrammer:
         best_fitness = -1.0
 
         for individual in competitors:
-            fitness = self._calculate_fitness(individual)
+            fitness = self._fitness.get(id(individual))
+            if fitness is None:
+                fitness = self._calculate_fitness(individual)
             if fitness > best_fitness:
                 best_fitness = fitness
                 best_individual = individual
@@ -281,13 +411,19 @@ class GeneticProgrammer:
 
     def evolve(self, generations: int):
         """Runs the genetic programming evolution process."""
+        if self.processes == 1:
+            context = nullcontext()
+        else:
+            context = Pool(self.processes, initializer=_init_worker,
+                           initargs=(self.evaluator.x, self.evaluator.y))
+        with context as pool:
+            return self._evolve(generations, pool)
+
+    def _evolve(self, generations: int, pool):
         for gen in range(generations):
             # Evaluate fitness of the current population
-            evaluated_population = [] # (fitness, individual)
-            for individual in self.population:
-                fitness = self._calculate_fitness(individual)
-                evaluated_population.append((fitness, individual))
-            
+            evaluated_population = list(zip(self._population_fitness(pool), self.population)) # (fitness, individual)
+
             # Sort by fitness (descending, higher is better)
             evaluated_population.sort(key=lambda x: x[0], reverse=True)
 
@@ -330,6 +466,49 @@ class GeneticProgrammer:
         print(f"\nMax generations reached. Best expression found: {best_individual.to_string()}")
         return best_individual
 
+# --- Benchmark ---
+def _fitness_recursive(individual: Node, target_data) -> float:
+    # The original per-point recursive evaluation, kept as the baseline
+    total_squared_error = 0.0
+    for x_val, true_y in target_data:
+        total_squared_error += (individual.evaluate(x_val) - true_y) ** 2
+    return 1.0 / (1.0 + total_squared_error / len(target_data))
+
+def run_benchmark(num_points=2_000, pop_size=500, warmup_generations=10):
+    import io
+    from contextlib import redirect_stdout
+
+    random.seed(3)
+    data = [(x, x ** 3 - 2 * x + 1) for x in np.linspace(-5, 5, num_points).tolist()]
+    gp = GeneticProgrammer(data, pop_size=pop_size, max_depth=6)
+    with redirect_stdout(io.StringIO()): # Evolve a little so the population shares subtrees, as it does in a real run
+        gp.evolve(warmup_generations)
+    population = gp.population
+    nodes = sum(len(individual.get_all_nodes()) for individual in population)
+    print(f"{pop_size} trees ({nodes:,} nodes) on {num_points:,} data points:")
+
+    sample = population[:20]
+    start = time.perf_counter()
+    baseline = [_fitness_recursive(individual, data) for individual in sample]
+    recursive = (time.perf_counter() - start) / len(sample) * len(population)
+    print(f"  recursive Node.evaluate      {recursive:8.3f} s (estimated from {len(sample)} trees)")
+
+    for label, max_cached in (("compiled, no subtree cache", 0), ("compiled + subtree cache", 100_000)):
+        evaluator = ExpressionEvaluator(gp.evaluator.x, gp.evaluator.y, max_cached=max_cached)
+        start = time.perf_counter()
+        errors = [evaluator.mse(individual.compile()) for individual in population]
+        elapsed = time.perf_counter() - start
+        agree = np.allclose([1 / (1 + e) for e in errors[:len(sample)]], baseline)
+        print(f"  {label:<28} {elapsed:8.3f} s, {evaluator.hits / (evaluator.hits + evaluator.misses):.0%} "
+              f"of subtrees from cache, matches baseline: {agree}")
+
+    for processes in (1, 2):
+        gp.processes = processes
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            gp.evolve(5)
+        print(f"  5 generations, {processes} process(es)  {time.perf_counter() - start:8.3f} s")
+
 # --- Main Test ---
 if __name__ == "__main__":
     # Define target function: f(x) = x^2 + 2x + 1
@@ -364,4 +543,8 @@ if __name__ == "__main__":
     print("\nTesting Final Expression on Data:")
     for x_val, true_y in data_points:
         predicted_y = final_solution.evaluate(x_val)
-        print(f"x={x_val}, True Y={true_y}, Predicted Y={predicted_y:.2f}")
\ No newline at end of file
+        print(f"x={x_val}, True Y={true_y}, Predicted Y={predicted_y:.2f}")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        print()
+        run_benchmark()
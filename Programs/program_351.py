@@ -1,44 +1,274 @@
+import sys
+import time
+import numpy as np
+
+MERSENNE_61 = (1 << 61) - 1
+BASES = (1_000_003, 911_382_323) # Two independent polynomial bases; a false hit needs both hashes to collide
+NUMPY_THRESHOLD = 1 << 15 # Texts at least this long are hashed with NumPy by default
+BLOCK = 1 << 20 # Windows hashed per NumPy block, to bound memory on large inputs
+
+def _codes(text):
+    """Symbol values: code points for str, byte values for bytes-like."""
+    if isinstance(text, str):
+        return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    return np.frombuffer(bytes(text), dtype=np.uint8).astype(np.uint64)
+
+def _value(symbol):
+    return ord(symbol) if isinstance(symbol, str) else symbol
+
+def pattern_hash(pattern):
+    """(h1, h2): the pattern's polynomial hash mod 2^61 - 1 under both bases."""
+    h1 = h2 = 0
+    b1, b2 = BASES
+    for symbol in pattern:
+        c = _value(symbol)
+        h1 = (h1 * b1 + c) % MERSENNE_61
+        h2 = (h2 * b2 + c) % MERSENNE_61
+    return h1, h2
+
+# --- NumPy window hashes ---
+_MASK_31 = np.uint64((1 << 31) - 1)
+_MASK_30 = np.uint64((1 << 30) - 1)
+_M61 = np.uint64(MERSENNE_61)
+
+def _mulmod(a, b):
+    """
+    a * b mod 2^61 - 1 for uint64 arrays (or scalars) below 2^61, without
+    128-bit products: both sides are split into 31-bit halves and the high
+    partial products folded back using 2^61 = 1.
+    """
+    a_hi, a_lo = a >> np.uint64(31), a & _MASK_31
+    b_hi, b_lo = b >> np.uint64(31), b & _MASK_31
+    mid = a_hi * b_lo + a_lo * b_hi # < 2^62
+    total = ((a_hi * b_hi) << np.uint64(1)) + (mid >> np.uint64(30)) + \
+            ((mid & _MASK_30) << np.uint64(31)) + a_lo * b_lo # < 2^64
+    total = (total & _M61) + (total >> np.uint64(61))
+    return np.where(total >= _M61, total - _M61, total)
+
+def _addmod(a, b):
+    total = a + b
+    return np.where(total >= _M61, total - _M61, total)
+
+def window_hashes(codes, window, base):
+    """
+    Hash of every length-`window` window of codes (an int array), all at once.
+
+    The polynomial hash of a window is built by binary lifting: hashes of
+    power-of-two blocks come from two half blocks (H2k[i] = Hk[i] * B^k +
+    Hk[i + k]), and the window is assembled from the blocks of its binary
+    expansion. That is O(n log window) vectorized work instead of a
+    sequential rolling loop.
+    """
+    n = len(codes)
+    if window <= 0 or window > n:
+        return np.zeros(0, dtype=np.uint64)
+    block = codes.astype(np.uint64) % _M61 # Hashes of length-1 blocks
+    block_len = 1
+    result = None
+    covered = 0
+    remaining = window
+    while True:
+        if remaining & 1:
+            count = n - window + 1
+            piece = block[covered:covered + count]
+            if result is None:
+                result = piece.copy()
+            else:
+                result = _addmod(_mulmod(result, np.uint64(pow(base, block_len, MERSENNE_61))), piece)
+            covered += block_len
+        remaining >>= 1
+        if not remaining:
+            return result
+        shift = np.uint64(pow(base, block_len, MERSENNE_61))
+        block = _addmod(_mulmod(block[:-block_len], shift), block[block_len:])
+        block_len *= 2
+
+# --- Matching ---
+def _pattern_table(patterns):
+    if isinstance(patterns, (str, bytes, bytearray)):
+        patterns = [patterns]
+    patterns = list(dict.fromkeys(patterns))
+    lengths = {len(p) for p in patterns}
+    if len(lengths) != 1 or 0 in lengths:
+        raise ValueError("All patterns must be non-empty and share one length (the window).")
+    table = {}
+    for pattern in patterns:
+        table.setdefault(pattern_hash(pattern), []).append(pattern)
+    return table, lengths.pop()
+
+def _iter_matches_rolling(text, table, m):
+    n = len(text)
+    b1, b2 = BASES
+    top1, top2 = pow(b1, m - 1, MERSENNE_61), pow(b2, m - 1, MERSENNE_61)
+    h1, h2 = pattern_hash(text[:m])
+    values = [_value(symbol) for symbol in text] if isinstance(text, str) else text
+    for i in range(n - m + 1):
+        if i:
+            out, new = values[i - 1], values[i + m - 1]
+            h1 = ((h1 - out * top1) * b1 + new) % MERSENNE_61
+            h2 = ((h2 - out * top2) * b2 + new) % MERSENNE_61
+        candidates = table.get((h1, h2))
+        if candidates:
+            window = text[i:i + m]
+            for pattern in candidates:
+                if window == pattern: # A double 61-bit collision is vanishingly rare, but confirm anyway
+                    yield i, pattern
+
+def _iter_matches_numpy(text, table, m):
+    wanted = np.array(sorted({h1 for h1, _ in table}), dtype=np.uint64)
+    for start in range(0, len(text) - m + 1, BLOCK):
+        # Only one block is ever held as codes, however long the text is
+        first = window_hashes(_codes(text[start:start + BLOCK + m - 1]), m, BASES[0])
+        for i in np.flatnonzero(np.isin(first, wanted)).tolist():
+            position = start + i
+            window = text[position:position + m]
+            for pattern in table.get(pattern_hash(window), ()):
+                if window == pattern:
+                    yield position, pattern
+
+def iter_matches(text, patterns, use_numpy=None):
+    """
+    Yields (position, pattern) for every occurrence, in position order.
+
+    Args:
+        text (str | bytes): Text to search.
+        patterns: One pattern, or a collection of patterns that all have the
+                  same length, matched together in a single pass.
+        use_numpy (bool | None): Hash all windows with NumPy instead of a
+                  Python rolling loop; by default for texts of NUMPY_THRESHOLD
+                  symbols or more.
+
+    Raises:
+        ValueError: If the patterns are empty or differ in length.
+    """
+    table, m = _pattern_table(patterns)
+    if m > len(text):
+        return iter(())
+    if use_numpy is None:
+        use_numpy = len(text) >= NUMPY_THRESHOLD
+    return (_iter_matches_numpy if use_numpy else _iter_matches_rolling)(text, table, m)
+
 def rabin_karp(text, pattern, d=256, q=101):
-    N = len(text)
-    M = len(pattern)
-    
-    if M > N:
-        return -1 # Pattern is longer than text
+    """
+    Same contract as before: the index of the first occurrence, or -1.
+    `d` and `q` are accepted for compatibility only; the hash is now the
+    double 61-bit Mersenne hash, which has no practical spurious hits.
+    """
+    if not pattern:
+        return 0
+    return next((position for position, _ in iter_matches(text, pattern)), -1)
 
-    p_hash = 0  # hash value for pattern
-    t_hash = 0  # hash value for text window
-    h = 1       # d^(M-1) % q
+# --- Duplicate detection ---
+def duplicate_windows(data, window):
+    """
+    Groups of positions whose `window`-long chunks are identical, for every
+    chunk that occurs more than once in data, ordered by first position.
 
-    # Precompute d^(M-1) % q
-    for i in range(M - 1):
-        h = (h * d) % q
+    Windows are grouped by their 61-bit hash with one sort, then each group
+    is split by the chunks' actual contents, so a hash collision can never
+    merge different chunks. Unlike iter_matches this is not blocked: it holds
+    O(n) uint64 arrays (codes, hashes, sort order and hashing temporaries),
+    about 64 bytes per symbol at peak.
+    """
+    hashes = window_hashes(_codes(data), window, BASES[0])
+    order = np.argsort(hashes, kind='stable')
+    sorted_hashes = hashes[order]
+    bounds = np.flatnonzero(sorted_hashes[1:] != sorted_hashes[:-1]) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [len(hashes)]))
+    repeated = ends - starts > 1
+    result = []
+    for lo, hi in zip(starts[repeated].tolist(), ends[repeated].tolist()):
+        by_chunk = {}
+        for position in order[lo:hi].tolist(): # Stable sort: already in position order
+            by_chunk.setdefault(data[position:position + window], []).append(position)
+        result.extend(group for group in by_chunk.values() if len(group) > 1)
+    result.sort()
+    return result
 
-    # Calculate initial hash for pattern and first text window
+def shared_windows(a, b, window):
+    """
+    (position in a, position in b) for each distinct `window`-long chunk that
+    appears in both inputs, e.g. to flag copied passages between two
+    documents. Positions are the first occurrences; candidates found by hash
+    are confirmed by comparing the chunks. Like duplicate_windows it holds
+    O(len(a) + len(b)) uint64 arrays of codes and hashes.
+    """
+    hashes_a, first_a = np.unique(window_hashes(_codes(a), window, BASES[0]), return_index=True)
+    hashes_b, first_b = np.unique(window_hashes(_codes(b), window, BASES[0]), return_index=True)
+    _, in_a, in_b = np.intersect1d(hashes_a, hashes_b, assume_unique=True, return_indices=True)
+    pairs = [(i, j) for i, j in zip(first_a[in_a].tolist(), first_b[in_b].tolist())
+             if a[i:i + window] == b[j:j + window]]
+    pairs.sort()
+    return pairs
+
+# --- Benchmark ---
+def _rabin_karp_mod(text, pattern, d=256, q=101):
+    # The original single-modulus scan, changed only to count spurious hits and continue past matches
+    N, M = len(text), len(pattern)
+    h = pow(d, M - 1, q)
+    p_hash = t_hash = 0
     for i in range(M):
         p_hash = (d * p_hash + ord(pattern[i])) % q
         t_hash = (d * t_hash + ord(text[i])) % q
-
-    # Slide the pattern over the text
+    matches, spurious = [], 0
     for i in range(N - M + 1):
         if p_hash == t_hash:
-            # Check for spurious hit (full match check)
-            if text[i:i+M] == pattern:
-                return i
-        
-        # Calculate rolling hash for next window (if not the last iteration)
+            if text[i:i + M] == pattern:
+                matches.append(i)
+            else:
+                spurious += 1
         if i < N - M:
-            # Subtract old character, multiply by d, add new character
             t_hash = (d * (t_hash - ord(text[i]) * h) + ord(text[i + M])) % q
-            
-            # Ensure t_hash is non-negative
-            if t_hash < 0:
-                t_hash += q
-                
-    return -1
+    return matches, spurious
+
+def run_benchmark(size=2_000_000, window=64):
+    rng = np.random.default_rng(0)
+    words = [''.join(chr(c) for c in rng.integers(97, 123, rng.integers(2, 9))) for _ in range(3000)]
+    text = ' '.join(words[i] for i in rng.integers(0, len(words), size // 5))[:size]
+    pattern = text[size // 2:size // 2 + 12]
+
+    start = time.perf_counter()
+    matches, spurious = _rabin_karp_mod(text, pattern)
+    print(f"{len(text):,} chars, one 12-char pattern:")
+    print(f"  q=101 rolling hash       {time.perf_counter() - start:7.2f} s, "
+          f"{len(matches)} matches, {spurious:,} spurious hash hits")
+    for use_numpy in (False, True):
+        start = time.perf_counter()
+        found = [p for p, _ in iter_matches(text, pattern, use_numpy=use_numpy)]
+        label = "NumPy window hashes" if use_numpy else "double 61-bit rolling"
+        print(f"  {label:<24} {time.perf_counter() - start:7.2f} s, {len(found)} matches, "
+              f"same: {found == matches}")
+
+    patterns = {text[i:i + 12] for i in rng.integers(0, size - 12, 1000).tolist()}
+    start = time.perf_counter()
+    hits = sum(1 for _ in iter_matches(text, patterns))
+    print(f"  {len(patterns)} patterns at once     {time.perf_counter() - start:7.2f} s, {hits:,} matches")
+
+    data = text.encode()
+    copied = data[:size // 2] + data[size // 4:size // 4 + 5000] + data[size // 2:]
+    start = time.perf_counter()
+    groups = duplicate_windows(copied, window)
+    print(f"Duplicate {window}-byte chunks in {len(copied):,} bytes: {len(groups):,} groups "
+          f"in {time.perf_counter() - start:.2f} s")
+    start = time.perf_counter()
+    shared = shared_windows(data[:size // 2], copied[size // 2:], window)
+    print(f"Chunks shared between the two halves: {len(shared):,} in {time.perf_counter() - start:.2f} s")
 
 if __name__ == '__main__':
     text = "GEEKSFORGEEKS"
     pattern = "FOR"
-    
+
     index = rabin_karp(text, pattern)
-    print(f"Pattern '{pattern}' found at index: {index}")
\ No newline at end of file
+    print(f"Pattern '{pattern}' found at index: {index}")
+
+    print(f"All 'GEEKS': {list(iter_matches(text, 'GEEKS'))}")
+    # Expected: [(0, 'GEEKS'), (8, 'GEEKS')]
+    print(f"Any of EKS/FOR: {list(iter_matches(text, {'EKS', 'FOR'}))}")
+    # Expected: [(2, 'EKS'), (5, 'FOR'), (10, 'EKS')]
+    print(f"Repeated 4-char chunks: {duplicate_windows(b'abcdXabcdYabcd', 4)}")
+    # Expected: [[0, 5, 10]]
+
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        print()
+        run_benchmark()
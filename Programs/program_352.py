@@ -0,0 +1,594 @@
+import math
+import mmap
+import struct
+import time
+import numpy as np
+import mmh3 # pip install mmh3
+
+MASK64 = (1 << 64) - 1
+SECOND_SEED = 0x5851F42D4C957F2D # Decorrelates the second integer hash from the first
+
+# File/byte layout: magic, number of bits (m), hash functions (k), items added
+HEADER = struct.Struct('<4sQIQ')
+
+def _splitmix64(x: int) -> int:
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+def _splitmix64_np(x: np.ndarray) -> np.ndarray:
+    """
+    Same mixer as `_splitmix64`, over a uint64 array. NumPy uint64 arithmetic
+    wraps modulo 2**64, which is exactly the masking the scalar version does.
+    """
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def hash_pair(item) -> tuple[int, int]:
+    """
+    Returns the two 64-bit base hashes used for double hashing.
+
+    Integers (including NumPy integers) are mixed with splitmix64 so that the
+    vectorized NumPy path produces identical hashes; everything else is hashed
+    as bytes with one 128-bit MurmurHash3 call. Note that 42 and "42" are
+    therefore different keys.
+    """
+    if isinstance(item, (int, np.integer)):
+        x = int(item) & MASK64
+        return _splitmix64(x), _splitmix64(x ^ SECOND_SEED)
+    if isinstance(item, str):
+        item = item.encode('utf-8')
+    elif not isinstance(item, (bytes, bytearray, memoryview)):
+        item = str(item).encode('utf-8')
+    return mmh3.hash64(item, 0, signed=False)
+
+def hash_pairs_np(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized `hash_pair` for integer arrays; other dtypes fall back to
+    hashing element by element.
+    """
+    if keys.dtype.kind in 'iub':
+        x = keys.astype(np.uint64, copy=False).ravel()
+        return _splitmix64_np(x), _splitmix64_np(x ^ np.uint64(SECOND_SEED))
+    pairs = [hash_pair(item.item() if isinstance(item, np.generic) else item) for item in keys.ravel()]
+    h = np.array(pairs, dtype=np.uint64).reshape(-1, 2)
+    return h[:, 0], h[:, 1]
+
+class PackedBloomFilter:
+    MAGIC = b'BLM1'
+
+    def __init__(self, size: int, num_hash_functions: int, _bits=None, _count: int = 0):
+        """
+        Bit-packed Bloom filter using double hashing.
+
+        Stores 8 bits per byte (1/8th of the memory of the one-byte-per-bit
+        filters in program_17/program_32) and derives all k probe positions
+        from two base hashes: index_i = (h1 + i * h2) mod m.
+
+        Args:
+            size (int): The size of the bit array (number of bits, m).
+            num_hash_functions (int): The number of probes per item (k).
+        """
+        if size <= 0 or num_hash_functions <= 0:
+            raise ValueError("Size and number of hash functions must be positive integers.")
+
+        self.size = size
+        self.num_hash_functions = num_hash_functions
+        self.num_bytes = self._storage_bytes(size)
+        # bytearray by default; a (possibly read-only) mmap view when loaded from disk
+        self.bits = _bits if _bits is not None else bytearray(self.num_bytes)
+        self.count = _count
+        self._mmap = None
+        self._probe_offsets = np.arange(num_hash_functions, dtype=np.uint64)
+
+    @staticmethod
+    def _storage_bytes(size: int) -> int:
+        return (size + 7) // 8
+
+    @classmethod
+    def from_capacity(cls, expected_elements: int, false_positive_rate: float) -> "PackedBloomFilter":
+        """
+        Sizes the filter with the same formulas as OptimalBloomFilter (program_32).
+        """
+        if not (0 < false_positive_rate < 1):
+            raise ValueError("False positive rate must be between 0 and 1 (exclusive).")
+        if expected_elements <= 0:
+            raise ValueError("Expected elements must be a positive integer.")
+        m = max(1, int(-(expected_elements * math.log(false_positive_rate)) / (math.log(2) ** 2)))
+        k = max(1, int(round((m / expected_elements) * math.log(2))))
+        return cls(m, k)
+
+    # --- Single-item API ---
+    def _indices(self, item):
+        h1, h2 = hash_pair(item)
+        m = self.size
+        return [((h1 + i * h2) & MASK64) % m for i in range(self.num_hash_functions)]
+
+    def add(self, item) -> None:
+        bits = self.bits
+        for index in self._indices(item):
+            bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+    def contains(self, item) -> bool:
+        """
+        Returns True for possible presence (may be a false positive), False for definite absence.
+        """
+        bits = self.bits
+        for index in self._indices(item):
+            if not bits[index >> 3] & (1 << (index & 7)):
+                return False
+        return True
+
+    __contains__ = contains
+
+    def __len__(self) -> int:
+        return self.count
+
+    # --- Bulk API ---
+    def _bit_view(self) -> np.ndarray:
+        return np.frombuffer(self.bits, dtype=np.uint8)
+
+    def _indices_np(self, keys) -> np.ndarray:
+        if not isinstance(keys, np.ndarray):
+            keys = list(keys)
+            if all(isinstance(k, (int, np.integer)) and not isinstance(k, bool) for k in keys):
+                # Python ints may exceed int64; masking keeps them equal to the scalar path
+                keys = np.array([int(k) & MASK64 for k in keys], dtype=np.uint64)
+            else:
+                keys = np.array(keys, dtype=object)
+        h1, h2 = hash_pairs_np(keys)
+        # (n, k) probe positions; uint64 wrap-around matches the scalar `& MASK64`
+        return (h1[:, None] + self._probe_offsets[None, :] * h2[:, None]) % np.uint64(self.size)
+
+    def add_many(self, keys) -> None:
+        """
+        Adds every key of an iterable or NumPy array. Integer arrays are hashed
+        and scattered into the bit array without a Python-level loop.
+        """
+        indices = self._indices_np(keys)
+        if indices.size == 0:
+            return
+        flat = indices.ravel()
+        np.bitwise_or.at(self._bit_view(), (flat >> np.uint64(3)).astype(np.intp),
+                         np.left_shift(1, (flat & np.uint64(7)).astype(np.uint8)).astype(np.uint8))
+        self.count += indices.shape[0]
+
+    def contains_many(self, keys) -> np.ndarray:
+        """
+        Returns a boolean array: True where the key may be present.
+        """
+        indices = self._indices_np(keys)
+        if indices.size == 0:
+            return np.zeros(0, dtype=bool)
+        words = self._bit_view()[(indices >> np.uint64(3)).astype(np.intp)]
+        hits = (words >> (indices & np.uint64(7)).astype(np.uint8)) & 1
+        return hits.all(axis=1)
+
+    # --- Set Operations ---
+    def _check_compatible(self, other) -> None:
+        if type(other) is not type(self) or other.size != self.size \
+                or other.num_hash_functions != self.num_hash_functions:
+            raise ValueError("Filters must have the same type, size and number of hash functions.")
+
+    def _estimate_count(self) -> int:
+        """
+        Estimates the number of distinct items from the fill ratio:
+        n ~= -(m / k) * ln(1 - X / m)
+        """
+        ratio = self.fill_ratio()
+        if ratio >= 1.0:
+            return self.count
+        return int(round(-(self.size / self.num_hash_functions) * math.log(1 - ratio)))
+
+    def union(self, other: "PackedBloomFilter") -> "PackedBloomFilter":
+        """
+        Filter of everything in either input (bitwise OR). Merging shards this
+        way is exact: the result equals a filter built from all their items.
+        """
+        self._check_compatible(other)
+        merged = type(self)(self.size, self.num_hash_functions,
+                            _bits=bytearray((self._bit_view() | other._bit_view()).tobytes()))
+        merged.count = merged._estimate_count()
+        return merged
+
+    def intersection(self, other: "PackedBloomFilter") -> "PackedBloomFilter":
+        """
+        Filter of items possibly in both inputs (bitwise AND). Its false-positive
+        rate can be higher than that of a filter built from the true intersection.
+        """
+        self._check_compatible(other)
+        common = type(self)(self.size, self.num_hash_functions,
+                            _bits=bytearray((self._bit_view() & other._bit_view()).tobytes()))
+        common.count = common._estimate_count()
+        return common
+
+    __or__ = union
+    __and__ = intersection
+
+    # --- Statistics ---
+    def fill_ratio(self) -> float:
+        set_bits = int(np.unpackbits(self._bit_view()).sum())
+        return set_bits / self.size
+
+    def get_effective_false_positive_rate(self) -> float:
+        """
+        p = (1 - exp(-k * n / m))^k, using the number of added items as n.
+        """
+        if self.count == 0:
+            return 0.0
+        return (1 - math.exp(-self.num_hash_functions * self.count / self.size)) ** self.num_hash_functions
+
+    # --- Serialization ---
+    def to_bytes(self) -> bytes:
+        return HEADER.pack(self.MAGIC, self.size, self.num_hash_functions, self.count) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data) -> "PackedBloomFilter":
+        magic, size, k, count = HEADER.unpack_from(data, 0)
+        if magic != cls.MAGIC:
+            raise ValueError(f"Not a serialized {cls.__name__}.")
+        bits = bytearray(data[HEADER.size:HEADER.size + cls._storage_bytes(size)])
+        return cls(size, k, _bits=bits, _count=count)
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str, writable: bool = False) -> "PackedBloomFilter":
+        """
+        Maps a saved filter into memory instead of reading it. Pages are loaded
+        lazily by the OS, so opening a multi-GB filter is instant. With
+        `writable=True` additions are written straight back to the file.
+        """
+        with open(path, 'r+b' if writable else 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        magic, size, k, count = HEADER.unpack_from(mm, 0)
+        if magic != cls.MAGIC:
+            mm.close()
+            raise ValueError(f"Not a serialized {cls.__name__}.")
+        bits = memoryview(mm)[HEADER.size:HEADER.size + cls._storage_bytes(size)]
+        bloom = cls(size, k, _bits=bits, _count=count)
+        bloom._mmap = mm
+        return bloom
+
+    def close(self) -> None:
+        """
+        Releases the memory map of a filter opened with `load`.
+        """
+        if self._mmap is not None:
+            if not self.bits.readonly:
+                HEADER.pack_into(self._mmap, 0, self.MAGIC, self.size, self.num_hash_functions, self.count)
+            self.bits.release()
+            self._mmap.close()
+            self._mmap = None
+            self.bits = None
+
+class CountingBloomFilter(PackedBloomFilter):
+    """
+    Bloom filter with 4-bit counters (two per byte) instead of bits, so items
+    can be removed. Counters saturate at 15 and then stay there, since a
+    saturated counter no longer knows how many items share it. Uses the same
+    hashing as PackedBloomFilter, so `to_packed()` yields an equivalent plain filter.
+    """
+    MAGIC = b'CBF1'
+    MAX_COUNT = 15
+
+    @staticmethod
+    def _storage_bytes(size: int) -> int:
+        return (size + 1) // 2
+
+    def _get_counter(self, index: int) -> int:
+        return (self.bits[index >> 1] >> ((index & 1) << 2)) & 0xF
+
+    def _set_counter(self, index: int, value: int) -> None:
+        shift = (index & 1) << 2
+        byte = index >> 1
+        self.bits[byte] = (self.bits[byte] & (0xF0 >> shift)) | (value << shift)
+
+    def add(self, item) -> None:
+        for index in set(self._indices(item)):
+            value = self._get_counter(index)
+            if value < self.MAX_COUNT:
+                self._set_counter(index, value + 1)
+        self.count += 1
+
+    def contains(self, item) -> bool:
+        return all(self._get_counter(index) for index in self._indices(item))
+
+    __contains__ = contains
+
+    def remove(self, item) -> bool:
+        """
+        Removes one occurrence of `item`. Returns False (and changes nothing)
+        if the item is definitely not present. Removing an item that was never
+        added but is a false positive corrupts the filter, as with any counting filter.
+        """
+        indices = set(self._indices(item))
+        if not all(self._get_counter(index) for index in indices):
+            return False
+        for index in indices:
+            value = self._get_counter(index)
+            if value < self.MAX_COUNT:
+                self._set_counter(index, value - 1)
+        self.count = max(0, self.count - 1)
+        return True
+
+    # --- Bulk API (vectorized over 4-bit counters) ---
+    def counters(self) -> np.ndarray:
+        """
+        Unpacks all counters into a uint8 array of length m.
+        """
+        packed = self._bit_view()
+        unpacked = np.empty(packed.size * 2, dtype=np.uint8)
+        unpacked[0::2] = packed & 0xF
+        unpacked[1::2] = packed >> 4
+        return unpacked[:self.size]
+
+    def _store_counters(self, values: np.ndarray) -> None:
+        if values.size % 2:
+            values = np.append(values, np.uint8(0))
+        self._bit_view()[:] = values[0::2] | (values[1::2] << 4)
+
+    def _apply_deltas(self, indices: np.ndarray, sign: int) -> None:
+        # One (item, probe) pair per row; a probe repeated within an item counts once
+        rows = np.sort(indices, axis=1)
+        keep = np.ones(rows.shape, dtype=bool)
+        keep[:, 1:] = rows[:, 1:] != rows[:, :-1]
+        positions, hits = np.unique(rows[keep], return_counts=True)
+        positions = positions.astype(np.intp)
+        values = self.counters()
+        current = values[positions].astype(np.int64)
+        saturated = current == self.MAX_COUNT
+        updated = np.clip(current + sign * hits, 0, self.MAX_COUNT)
+        values[positions] = np.where(saturated, current, updated).astype(np.uint8)
+        self._store_counters(values)
+
+    def add_many(self, keys) -> None:
+        indices = self._indices_np(keys)
+        if indices.size:
+            self._apply_deltas(indices, +1)
+            self.count += indices.shape[0]
+
+    def remove_many(self, keys) -> np.ndarray:
+        """
+        Removes every key that is possibly present; returns the mask of removed keys.
+        """
+        indices = self._indices_np(keys)
+        if indices.size == 0:
+            return np.zeros(0, dtype=bool)
+        present = self.counters()[indices.astype(np.intp)].all(axis=1)
+        if present.any():
+            self._apply_deltas(indices[present], -1)
+            self.count = max(0, self.count - int(present.sum()))
+        return present
+
+    def contains_many(self, keys) -> np.ndarray:
+        indices = self._indices_np(keys)
+        if indices.size == 0:
+            return np.zeros(0, dtype=bool)
+        return self.counters()[indices.astype(np.intp)].all(axis=1)
+
+    # --- Set Operations ---
+    def union(self, other: "CountingBloomFilter") -> "CountingBloomFilter":
+        """
+        Counter-wise saturating sum: the filter you would get by adding both item multisets.
+        """
+        self._check_compatible(other)
+        merged = CountingBloomFilter(self.size, self.num_hash_functions, _count=self.count + other.count)
+        total = self.counters().astype(np.uint16) + other.counters()
+        merged._store_counters(np.minimum(total, self.MAX_COUNT).astype(np.uint8))
+        return merged
+
+    def intersection(self, other: "CountingBloomFilter") -> "CountingBloomFilter":
+        """
+        Counter-wise minimum.
+        """
+        self._check_compatible(other)
+        common = CountingBloomFilter(self.size, self.num_hash_functions)
+        common._store_counters(np.minimum(self.counters(), other.counters()))
+        common.count = common._estimate_count()
+        return common
+
+    __or__ = union
+    __and__ = intersection
+
+    def fill_ratio(self) -> float:
+        return int(np.count_nonzero(self.counters())) / self.size
+
+    def to_packed(self) -> PackedBloomFilter:
+        """
+        Plain bit filter (8x smaller) with the same membership answers.
+        """
+        bits = np.packbits(self.counters() > 0, bitorder='little')
+        return PackedBloomFilter(self.size, self.num_hash_functions,
+                                 _bits=bytearray(bits.tobytes()), _count=self.count)
+
+class ScalableBloomFilter:
+    def __init__(self, initial_capacity: int, false_positive_rate: float,
+                 growth_factor: int = 2, tightening_ratio: float = 0.5):
+        """
+        Bloom filter that never exceeds its target false-positive rate, however
+        many items are added (Almeida et al., "Scalable Bloom Filters").
+
+        When the current slice reaches its capacity a new slice is appended with
+        `growth_factor` times the capacity and `tightening_ratio` times the
+        error rate. Slice i gets p0 * r^i with p0 = p * (1 - r), so the compound
+        rate stays below p = p0 / (1 - r).
+
+        Args:
+            initial_capacity (int): Items the first slice is sized for.
+            false_positive_rate (float): Upper bound on the overall FP rate.
+        """
+        if not (0 < tightening_ratio < 1):
+            raise ValueError("Tightening ratio must be between 0 and 1 (exclusive).")
+        if growth_factor < 1:
+            raise ValueError("Growth factor must be at least 1.")
+        self.initial_capacity = initial_capacity
+        self.false_positive_rate = false_positive_rate
+        self.growth_factor = growth_factor
+        self.tightening_ratio = tightening_ratio
+        self.slices = []      # PackedBloomFilter per slice, oldest first
+        self.capacities = []
+        self._add_slice()
+
+    def _add_slice(self) -> None:
+        i = len(self.slices)
+        capacity = self.initial_capacity * self.growth_factor ** i
+        rate = self.false_positive_rate * (1 - self.tightening_ratio) * self.tightening_ratio ** i
+        self.slices.append(PackedBloomFilter.from_capacity(capacity, rate))
+        self.capacities.append(capacity)
+
+    def add(self, item) -> bool:
+        """
+        Adds `item` unless it is (possibly) already present. Returns True if it was added.
+        """
+        if self.contains(item):
+            return False
+        if self.slices[-1].count >= self.capacities[-1]:
+            self._add_slice()
+        self.slices[-1].add(item)
+        return True
+
+    def contains(self, item) -> bool:
+        # Newest slices are the largest and hold the most recent items
+        return any(s.contains(item) for s in reversed(self.slices))
+
+    __contains__ = contains
+
+    def add_many(self, keys) -> None:
+        """
+        Adds keys in bulk, filling the current slice and growing as needed.
+        Unlike `add`, keys are not checked for prior presence first.
+        """
+        keys = keys if isinstance(keys, np.ndarray) else np.array(list(keys), dtype=object)
+        start = 0
+        while start < len(keys):
+            room = self.capacities[-1] - self.slices[-1].count
+            if room <= 0:
+                self._add_slice()
+                continue
+            self.slices[-1].add_many(keys[start:start + room])
+            start += room
+
+    def contains_many(self, keys) -> np.ndarray:
+        if not isinstance(keys, np.ndarray):
+            keys = np.array(list(keys), dtype=object)
+        result = np.zeros(len(keys), dtype=bool)
+        for s in self.slices:
+            result |= s.contains_many(keys)
+        return result
+
+    def __len__(self) -> int:
+        return sum(s.count for s in self.slices)
+
+    def get_effective_false_positive_rate(self) -> float:
+        """
+        P(false positive) = 1 - prod(1 - p_i) over all slices.
+        """
+        prob_all_negative = 1.0
+        for s in self.slices:
+            prob_all_negative *= 1 - s.get_effective_false_positive_rate()
+        return 1 - prob_all_negative
+
+    def union(self, other: "ScalableBloomFilter") -> "ScalableBloomFilter":
+        """
+        Merges two filters built with the same parameters slice by slice.
+        Slices present in only one input are copied across.
+        """
+        params = ("initial_capacity", "false_positive_rate", "growth_factor", "tightening_ratio")
+        if any(getattr(self, p) != getattr(other, p) for p in params):
+            raise ValueError("Scalable filters must share all construction parameters.")
+        merged = ScalableBloomFilter(*(getattr(self, p) for p in params))
+        merged.slices, merged.capacities = [], []
+        for i in range(max(len(self.slices), len(other.slices))):
+            a = self.slices[i] if i < len(self.slices) else None
+            b = other.slices[i] if i < len(other.slices) else None
+            if a is not None and b is not None:
+                merged.slices.append(a.union(b))
+            else:
+                merged.slices.append(PackedBloomFilter.from_bytes((a or b).to_bytes()))
+            merged.capacities.append(self.initial_capacity * self.growth_factor ** i)
+        return merged
+
+    __or__ = union
+
+# Example Usage:
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    bf = PackedBloomFilter.from_capacity(expected_elements=1000, false_positive_rate=0.01)
+    print(f"Packed Bloom Filter: m={bf.size} bits in {bf.num_bytes} bytes, k={bf.num_hash_functions}")
+
+    for word in ["apple", "banana", "cherry", "date", "elderberry"]:
+        bf.add(word)
+    print(f"'apple' in filter: {'apple' in bf}")
+    print(f"'grape' in filter: {'grape' in bf}")
+
+    print("\n--- Bulk operations ---")
+    bf.add_many(np.arange(500, dtype=np.int64))
+    print(f"contains_many([10, 499, 10_000_000]): {bf.contains_many([10, 499, 10_000_000])}")
+    print(f"Scalar and bulk paths agree: {bf.contains(250) and bool(bf.contains_many(np.array([250]))[0])}")
+
+    print("\n--- Serialization ---")
+    clone = PackedBloomFilter.from_bytes(bf.to_bytes())
+    print(f"Round-trip via bytes keeps 'cherry': {clone.contains('cherry')}")
+    path = os.path.join(tempfile.gettempdir(), "packed_bloom.bin")
+    bf.save(path)
+    mapped = PackedBloomFilter.load(path)
+    print(f"mmap-loaded filter keeps 'banana': {mapped.contains('banana')}, items={len(mapped)}")
+    mapped.close()
+    os.remove(path)
+
+    print("\n--- Throughput (1M integer keys) ---")
+    n = 1_000_000
+    big = PackedBloomFilter.from_capacity(expected_elements=n, false_positive_rate=0.01)
+    keys = np.random.default_rng(0).integers(0, 2**62, size=n, dtype=np.int64)
+    start = time.perf_counter()
+    big.add_many(keys)
+    add_time = time.perf_counter() - start
+    probes = np.random.default_rng(1).integers(0, 2**62, size=n, dtype=np.int64)
+    start = time.perf_counter()
+    present = big.contains_many(keys)
+    absent = big.contains_many(probes)
+    probe_time = time.perf_counter() - start
+    print(f"add_many:      {n / add_time:>12,.0f} keys/s")
+    print(f"contains_many: {2 * n / probe_time:>12,.0f} keys/s")
+    print(f"All inserted keys found: {bool(present.all())}")
+    print(f"Measured FP rate: {absent.mean():.4%} (theoretical {big.get_effective_false_positive_rate():.4%})")
+    print(f"Memory: {big.num_bytes / 2**20:.2f} MiB packed vs {big.size / 2**20:.2f} MiB at one byte per bit")
+
+    print("\n--- Merging shards ---")
+    shard_a = PackedBloomFilter.from_capacity(expected_elements=20000, false_positive_rate=0.01)
+    shard_b = PackedBloomFilter.from_capacity(expected_elements=20000, false_positive_rate=0.01)
+    shard_a.add_many(np.arange(0, 10000))
+    shard_b.add_many(np.arange(5000, 15000))
+    merged = shard_a | shard_b
+    overlap = shard_a & shard_b
+    print(f"Union contains 0 and 14999: {merged.contains_many([0, 14999])}, estimated items: {len(merged)}")
+    print(f"Intersection contains 7000 but not 100: {overlap.contains_many([7000, 100])}, estimated items: {len(overlap)}")
+
+    print("\n--- Scalable Bloom Filter (target FP 1%) ---")
+    fixed = PackedBloomFilter.from_capacity(expected_elements=10000, false_positive_rate=0.01)
+    scalable = ScalableBloomFilter(initial_capacity=10000, false_positive_rate=0.01)
+    stream = np.arange(200000, dtype=np.int64)
+    fixed.add_many(stream)
+    scalable.add_many(stream)
+    outsiders = np.arange(10**9, 10**9 + 100000, dtype=np.int64)
+    print(f"Fixed filter after 20x overfill:  measured FP {fixed.contains_many(outsiders).mean():.2%}")
+    print(f"Scalable filter ({len(scalable.slices)} slices):    measured FP {scalable.contains_many(outsiders).mean():.2%}, "
+          f"bound {scalable.get_effective_false_positive_rate():.2%}")
+
+    print("\n--- Counting Bloom Filter ---")
+    cbf = CountingBloomFilter.from_capacity(expected_elements=1000, false_positive_rate=0.01)
+    cbf.add_many(["session-1", "session-2", "session-3"])
+    print(f"Removed 'session-2': {cbf.remove('session-2')}")
+    print(f"contains_many(session-1..3): {cbf.contains_many(['session-1', 'session-2', 'session-3'])}")
+    print(f"Removing an absent key: {cbf.remove('session-9')}")
+    print(f"Memory: {cbf.num_bytes} bytes of 4-bit counters; plain export {cbf.to_packed().num_bytes} bytes, "
+          f"agrees: {cbf.to_packed().contains('session-3')}")
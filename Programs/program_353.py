@@ -0,0 +1,205 @@
+import sys
+import random
+import threading
+import time
+from collections import OrderedDict
+
+def default_sizeof(key, value) -> int:
+    """
+    Shallow size of an entry. Pass your own `sizeof` for nested containers.
+    """
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+class _Shard:
+    __slots__ = ("lock", "entries", "bytes_used", "hits", "misses", "evictions", "rejections")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict() # key -> (value, size), least recently used first
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0
+
+class ShardedLRUCache:
+    def __init__(self, max_bytes: int, num_shards: int = 16, sizeof=default_sizeof):
+        """
+        Thread-safe LRU cache bounded by total entry size instead of entry count.
+
+        Keys are spread over `num_shards` independent shards by hash, each with
+        its own lock and OrderedDict, so threads touching different shards never
+        contend. Each shard gets an equal slice of `max_bytes` and evicts its
+        least recently used entries until a new entry fits.
+
+        Args:
+            max_bytes (int): Total budget, as measured by `sizeof`.
+            num_shards (int): Number of lock stripes.
+            sizeof (callable): sizeof(key, value) -> int, the cost of one entry.
+        """
+        if max_bytes <= 0 or num_shards <= 0:
+            raise ValueError("max_bytes and num_shards must be positive integers.")
+        self.max_bytes = max_bytes
+        self.num_shards = num_shards
+        self.shard_budget = max_bytes // num_shards
+        self.sizeof = sizeof
+        self.shards = [_Shard() for _ in range(num_shards)]
+
+    def _shard(self, key) -> _Shard:
+        return self.shards[hash(key) % self.num_shards]
+
+    def get(self, key, default=None):
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                shard.misses += 1
+                return default
+            shard.entries.move_to_end(key)
+            shard.hits += 1
+            return entry[0]
+
+    def put(self, key, value) -> bool:
+        """
+        Inserts or replaces `key`. Returns False if the entry alone is larger
+        than a shard's budget and was therefore not cached.
+        """
+        size = self.sizeof(key, value) # Computed outside the lock
+        shard = self._shard(key)
+        with shard.lock:
+            old = shard.entries.pop(key, None)
+            if old is not None:
+                shard.bytes_used -= old[1]
+            if size > self.shard_budget:
+                shard.rejections += 1
+                return False
+            entries = shard.entries
+            while shard.bytes_used + size > self.shard_budget:
+                _, (_, evicted_size) = entries.popitem(last=False)
+                shard.bytes_used -= evicted_size
+                shard.evictions += 1
+            entries[key] = (value, size)
+            shard.bytes_used += size
+            return True
+
+    def delete(self, key) -> bool:
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.pop(key, None)
+            if entry is None:
+                return False
+            shard.bytes_used -= entry[1]
+            return True
+
+    def clear(self) -> None:
+        for shard in self.shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.bytes_used = 0
+
+    def __contains__(self, key) -> bool:
+        # Does not count as an access, so recency and hit counters are untouched
+        return key in self._shard(key).entries
+
+    def __len__(self):
+        return sum(len(shard.entries) for shard in self.shards)
+
+    def stats(self) -> dict:
+        """
+        Aggregated counters, read without taking any lock. Each counter is an
+        int updated under its shard lock, so reads are never torn, but the
+        totals are a snapshot that may be a few operations stale under load.
+        """
+        hits = sum(shard.hits for shard in self.shards)
+        misses = sum(shard.misses for shard in self.shards)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "evictions": sum(shard.evictions for shard in self.shards),
+            "rejections": sum(shard.rejections for shard in self.shards),
+            "entries": len(self),
+            "bytes_used": sum(shard.bytes_used for shard in self.shards),
+            "max_bytes": self.max_bytes,
+        }
+
+    def __str__(self):
+        s = self.stats()
+        return (f"ShardedLRUCache(Shards={self.num_shards}, Bytes={s['bytes_used']}/{self.max_bytes}, "
+                f"Entries={s['entries']}, Hits={s['hits']}, Misses={s['misses']}, Evictions={s['evictions']})")
+
+# --- Multi-threaded Benchmark ---
+class _LockedLRUCache:
+    """
+    program_30's LRUCache behind one global lock: the baseline a caller would
+    need to share it between threads safely.
+    """
+    def __init__(self, capacity: int):
+        from program_30 import LRUCache
+        self.inner = LRUCache(capacity)
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            value = self.inner.get(key)
+        return default if value == -1 else value
+
+    def put(self, key, value):
+        with self.lock:
+            self.inner.put(key, value)
+
+def _run_threads(cache, workloads):
+    def worker(ops):
+        for is_put, key in ops:
+            if is_put:
+                cache.put(key, key)
+            elif cache.get(key) is None:
+                cache.put(key, key)
+
+    threads = [threading.Thread(target=worker, args=(ops,)) for ops in workloads]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+def run_benchmark(num_threads=8, ops_per_thread=100_000, key_space=50_000, capacity=10_000):
+    rng = random.Random(42)
+    # Skewed key popularity: low keys are requested far more often
+    workloads = [[(rng.random() < 0.1, int(key_space * rng.random() ** 3)) for _ in range(ops_per_thread)]
+                 for _ in range(num_threads)]
+    total_ops = num_threads * ops_per_thread
+    print(f"{num_threads} threads x {ops_per_thread} ops (90% get / 10% put), {key_space} keys, "
+          f"capacity {capacity} entries")
+
+    baseline = _LockedLRUCache(capacity)
+    elapsed = _run_threads(baseline, workloads)
+    print(f"program_30 LRUCache + global lock: {total_ops / elapsed:>10,.0f} ops/s")
+
+    for shards in (1, 16, 64):
+        # Unit-cost sizeof makes the byte budget an entry budget, for a like-for-like comparison
+        cache = ShardedLRUCache(max_bytes=capacity, num_shards=shards, sizeof=lambda k, v: 1)
+        elapsed = _run_threads(cache, workloads)
+        s = cache.stats()
+        print(f"ShardedLRUCache, {shards:>2} shard(s):      {total_ops / elapsed:>10,.0f} ops/s   "
+              f"hit rate {s['hit_rate']:.1%}, evictions {s['evictions']}")
+
+# Example Usage:
+if __name__ == "__main__":
+    cache = ShardedLRUCache(max_bytes=4096, num_shards=4, sizeof=lambda k, v: len(v))
+
+    cache.put("small", b"x" * 100)
+    cache.put("medium", b"y" * 500)
+    print(f"Put 'huge' larger than a shard's 1024-byte slice: {cache.put('huge', b'z' * 2000)}")
+    print(f"get('small') -> {len(cache.get('small'))} bytes")
+    print(f"get('missing') -> {cache.get('missing')}")
+
+    # Fill one key's shard past its budget to trigger size-aware eviction
+    for i in range(40):
+        cache.put(f"blob{i}", b"b" * 300)
+    print(cache)
+    print(cache.stats())
+
+    print("\n--- Benchmark ---")
+    run_benchmark()
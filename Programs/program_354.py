@@ -0,0 +1,298 @@
+import heapq
+import sys
+import time
+import tracemalloc
+from array import array
+import numpy as np
+
+INF = float('inf')
+
+class CSRGraph:
+    def __init__(self, offsets, targets, weights, names=None):
+        """
+        Directed weighted graph in Compressed Sparse Row form.
+
+        The out-edges of node u are targets[offsets[u]:offsets[u + 1]] with the
+        matching weights. Storage is three flat `array` buffers (8 bytes per
+        node, 12 per edge) instead of a dict per node and a tuple per edge;
+        `np_offsets`/`np_targets`/`np_weights` are zero-copy NumPy views of them.
+        Use the `from_*` constructors rather than calling this directly.
+
+        Args:
+            offsets (array('q')): Length num_nodes + 1.
+            targets (array('i')): Edge heads.
+            weights (array('d')): Edge weights.
+            names (list | None): Node id -> original name. None means nodes are
+                                 simply the integers 0..n-1.
+        """
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.num_nodes = len(offsets) - 1
+        self.num_edges = len(targets)
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)} if names is not None else None
+
+    # --- Construction ---
+    @classmethod
+    def from_arrays(cls, num_nodes, sources, targets, weights=None, names=None):
+        """
+        Builds the CSR from parallel integer edge arrays with one stable sort.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int32)
+        weights = np.ones(len(sources)) if weights is None else np.asarray(weights, dtype=np.float64)
+        order = np.argsort(sources, kind='stable') # Keeps each node's edges in input order
+        offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=offsets[1:])
+        return cls(array('q', offsets.tobytes()),
+                   array('i', targets[order].tobytes()),
+                   array('d', weights[order].tobytes()),
+                   names)
+
+    @classmethod
+    def from_edge_list(cls, edges, directed=True, nodes=()):
+        """
+        Builds a graph from (u, v) or (u, v, weight) tuples with arbitrary
+        hashable node names, interning each name to a dense integer id.
+        Names in `nodes` are interned first, in order, even if they have no edges.
+        """
+        ids = {}
+        names = []
+        sources, targets, weights = array('q'), array('i'), array('d')
+
+        def intern(name):
+            node_id = ids.get(name)
+            if node_id is None:
+                node_id = ids[name] = len(names)
+                names.append(name)
+            return node_id
+
+        for name in nodes:
+            intern(name)
+        for edge in edges:
+            u, v = intern(edge[0]), intern(edge[1])
+            w = edge[2] if len(edge) > 2 else 1.0
+            sources.append(u); targets.append(v); weights.append(w)
+            if not directed:
+                sources.append(v); targets.append(u); weights.append(w)
+        return cls.from_arrays(len(names), np.frombuffer(sources, dtype=np.int64),
+                               np.frombuffer(targets, dtype=np.int32),
+                               np.frombuffer(weights, dtype=np.float64), names)
+
+    @classmethod
+    def from_dict(cls, graph):
+        """
+        Converts the adjacency formats used across Programs:
+          {u: [(v, w), ...]}  (dijkstra in program_10)
+          {u: {v: w, ...}}    (dijkstra / bellman_ford in program_92, 103, ...)
+          {u: [v, ...]}       (topological_sort in program_38, 148, 154; weight 1)
+        Nodes keep their dict order, so node ids follow the caller's ordering.
+        """
+        def edges():
+            for u, adjacency in graph.items():
+                items = adjacency.items() if isinstance(adjacency, dict) else adjacency
+                for entry in items:
+                    if isinstance(entry, tuple):
+                        yield (u, entry[0], entry[1])
+                    else:
+                        yield (u, entry)
+
+        return cls.from_edge_list(edges(), nodes=graph)
+
+    # --- Accessors ---
+    @property
+    def np_offsets(self):
+        return np.frombuffer(self.offsets, dtype=np.int64)
+
+    @property
+    def np_targets(self):
+        return np.frombuffer(self.targets, dtype=np.int32)
+
+    @property
+    def np_weights(self):
+        return np.frombuffer(self.weights, dtype=np.float64)
+
+    def id_of(self, name):
+        return self.ids[name] if self.ids is not None else name
+
+    def name_of(self, node_id):
+        return self.names[node_id] if self.names is not None else node_id
+
+    def neighbors(self, u):
+        """(targets, weights) slices of u's out-edges."""
+        start, end = self.offsets[u], self.offsets[u + 1]
+        return self.targets[start:end], self.weights[start:end]
+
+    def edge_sources(self):
+        """Source id of every edge, aligned with `targets`/`weights`."""
+        return np.repeat(np.arange(self.num_nodes, dtype=np.int32), np.diff(self.np_offsets))
+
+    def reverse(self):
+        """Graph with every edge flipped (same ids and names)."""
+        return CSRGraph.from_arrays(self.num_nodes, self.np_targets, self.edge_sources(),
+                                    self.np_weights, self.names)
+
+    def nbytes(self):
+        return self.offsets.itemsize * len(self.offsets) + self.targets.itemsize * len(self.targets) \
+            + self.weights.itemsize * len(self.weights)
+
+    def to_names(self, values):
+        """Maps a per-node sequence to {name: value}, like the dict-based functions return."""
+        return {self.name_of(i): values[i] for i in range(self.num_nodes)}
+
+# --- Algorithms ---
+def dijkstra_ids(graph, source):
+    """
+    Dijkstra over node ids. Returns array('d') of distances (inf if unreachable).
+    """
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    distances = array('d', [INF]) * graph.num_nodes
+    distances[source] = 0.0
+    priority_queue = [(0.0, source)]
+    heappop, heappush = heapq.heappop, heapq.heappush
+
+    while priority_queue:
+        current_distance, u = heappop(priority_queue)
+        if current_distance > distances[u]:
+            continue
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            distance = current_distance + weights[i]
+            if distance < distances[v]:
+                distances[v] = distance
+                heappush(priority_queue, (distance, v))
+    return distances
+
+def dijkstra(graph, start_node):
+    """
+    Same contract as dijkstra in program_10: {node: shortest distance from start_node}.
+    """
+    return graph.to_names(dijkstra_ids(graph, graph.id_of(start_node)))
+
+def bellman_ford(graph, start_node):
+    """
+    Same contract as bellman_ford in program_103: (distances, message), or
+    (None, "Negative cycle detected.") if a negative cycle is reachable.
+    Each pass relaxes all edges with NumPy and stops early once nothing changes.
+    """
+    n = graph.num_nodes
+    sources = graph.edge_sources()
+    targets = graph.np_targets
+    weights = graph.np_weights
+    distances = np.full(n, INF)
+    distances[graph.id_of(start_node)] = 0.0
+
+    for _ in range(max(n - 1, 0)):
+        candidate = distances[sources] + weights
+        improved = np.full(n, INF)
+        np.minimum.at(improved, targets, candidate)
+        updated = np.minimum(distances, improved)
+        if np.array_equal(updated, distances):
+            break
+        distances = updated
+
+    if np.any(distances[sources] + weights < distances[targets]):
+        return None, "Negative cycle detected."
+    return graph.to_names(distances.tolist()), "No negative cycle."
+
+def topological_sort(graph):
+    """
+    Kahn's algorithm over the CSR. Returns node names in topological order,
+    or [] if the graph has a cycle (as topological_sort in program_38 does).
+    Iterative, so deep graphs cannot hit the recursion limit.
+    """
+    offsets, targets = graph.offsets, graph.targets
+    in_degree = array('q', np.bincount(graph.np_targets, minlength=graph.num_nodes).astype(np.int64).tobytes())
+    ready = [u for u in range(graph.num_nodes) if in_degree[u] == 0]
+    order = []
+    while ready:
+        u = ready.pop()
+        order.append(u)
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            in_degree[v] -= 1
+            if in_degree[v] == 0:
+                ready.append(v)
+    if len(order) != graph.num_nodes:
+        return []
+    return [graph.name_of(u) for u in order]
+
+# --- Benchmark ---
+def run_benchmark(num_nodes=1_000_000, avg_degree=4):
+    from program_92 import dijkstra as dict_dijkstra # {u: {v: w}} implementation
+
+    rng = np.random.default_rng(0)
+    m = num_nodes * avg_degree
+    src = rng.integers(0, num_nodes, size=m)
+    dst = rng.integers(0, num_nodes, size=m)
+    w = rng.integers(1, 100, size=m).astype(np.float64)
+    print(f"Synthetic graph: {num_nodes:,} nodes, {m:,} edges")
+
+    start = time.perf_counter()
+    csr = CSRGraph.from_arrays(num_nodes, src, dst, w)
+    print(f"CSR build:        {time.perf_counter() - start:6.2f} s, {csr.nbytes() / 2**20:8.1f} MiB")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    adjacency = {u: {} for u in range(num_nodes)}
+    for u, v, weight in zip(src.tolist(), dst.tolist(), w.tolist()):
+        adjacency[u][v] = weight
+    build = time.perf_counter() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"dict build:       {build:6.2f} s, {held / 2**20:8.1f} MiB")
+
+    start = time.perf_counter()
+    csr_dist = dijkstra_ids(csr, 0)
+    print(f"dijkstra on CSR:  {time.perf_counter() - start:6.2f} s")
+    start = time.perf_counter()
+    dict_dist = dict_dijkstra(adjacency, 0)
+    print(f"dijkstra on dict: {time.perf_counter() - start:6.2f} s")
+    print(f"Same distances: {all(dict_dist[i] == csr_dist[i] for i in range(0, num_nodes, 997))}")
+    del adjacency, dict_dist
+
+    forward = src < dst # Keep only forward edges to get a DAG
+    dag = CSRGraph.from_arrays(num_nodes, src[forward], dst[forward])
+    start = time.perf_counter()
+    order = topological_sort(dag)
+    print(f"topological_sort on CSR DAG: {time.perf_counter() - start:6.2f} s ({len(order):,} nodes)")
+
+# Example Usage:
+if __name__ == "__main__":
+    graph1 = {
+        'A': [('B', 1), ('C', 4)],
+        'B': [('C', 2), ('D', 5)],
+        'C': [('D', 1)],
+        'D': []
+    }
+    csr1 = CSRGraph.from_dict(graph1)
+    print("Graph 1 Shortest Paths from A:", dijkstra(csr1, 'A'))
+    # Expected: {'A': 0, 'B': 1, 'C': 3, 'D': 4}
+
+    graph2 = {
+        'A': {'B': 10, 'C': 5},
+        'B': {'C': 2, 'D': 1},
+        'C': {'B': 3, 'D': 9, 'E': 2},
+        'D': {'E': 4},
+        'E': {'A': 7, 'B': -1}
+    }
+    print("Bellman-Ford from A:", bellman_ford(CSRGraph.from_dict(graph2), 'A'))
+    print("Bellman-Ford with a negative cycle:",
+          bellman_ford(CSRGraph.from_edge_list([(0, 1, 1), (1, 2, -1), (2, 3, -1), (3, 0, -1)]), 0))
+
+    dag = {
+        'A': ['C', 'D'],
+        'B': ['D'],
+        'C': ['E'],
+        'D': ['F', 'G'],
+        'E': [],
+        'F': [],
+        'G': []
+    }
+    print("Topological order:", topological_sort(CSRGraph.from_dict(dag)))
+    print("Cycle:", topological_sort(CSRGraph.from_dict({'A': ['B'], 'B': ['C'], 'C': ['A']})))
+
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        print()
+        run_benchmark()
@@ -0,0 +1,404 @@
+import heapq
+import pickle
+import random
+import struct
+import sys
+import time
+import numpy as np
+from program_354 import CSRGraph
+
+INF = float('inf')
+HEADER = struct.Struct('<4sQQQQ') # magic, num_nodes, up edges, down edges, names blob length
+
+class ContractionHierarchy:
+    MAGIC = b'CHG1'
+
+    def __init__(self, rank, up, down, names=None):
+        """
+        Preprocessed graph for fast repeated point-to-point shortest paths.
+
+        Every node has a rank (its contraction order). `up` holds, for each node
+        v, the edges v -> x with rank[x] > rank[v]; `down` holds the edges
+        u -> v with rank[u] > rank[v], stored at v. Both include the shortcut
+        edges added during contraction. A query only ever climbs in rank: a
+        forward search from the source over `up` and a backward search from the
+        target over `down`, which meet at the highest node of the shortest path.
+        Build one with `ContractionHierarchy.build` or `load`.
+
+        Args:
+            rank (list[int]): Contraction order of each node id.
+            up, down (tuple): (offsets, targets, weights, via) lists in CSR
+                              layout. via[i] is the contracted node a shortcut
+                              bypasses, or -1 for an original edge.
+            names (list | None): Node id -> original name, as in CSRGraph.
+        """
+        self.rank = rank
+        self.up = up
+        self.down = down
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)} if names is not None else None
+        self.num_nodes = len(rank)
+        # (tail, head) -> bypassed node, for unpacking shortcuts into original edges
+        self.via = {}
+        for (offsets, targets, _, via), upward in ((up, True), (down, False)):
+            for v in range(self.num_nodes):
+                for i in range(offsets[v], offsets[v + 1]):
+                    if via[i] >= 0:
+                        self.via[(v, targets[i]) if upward else (targets[i], v)] = via[i]
+        # Per-query scratch, stamped with the id of the query that last wrote it
+        n = self.num_nodes
+        self.dist = ([0.0] * n, [0.0] * n)
+        self.pred = ([-1] * n, [-1] * n)
+        self.stamp = ([0] * n, [0] * n)
+        self.query_id = 0
+
+    # --- Preprocessing ---
+    @classmethod
+    def build(cls, graph, settle_limit=200):
+        """
+        Contracts nodes one by one in order of importance, adding a shortcut
+        u -> x whenever the only shortest u -> x path ran through the removed
+        node. Importance is the edge difference (shortcuts added minus edges
+        removed) plus the number of already contracted neighbours, which keeps
+        contraction spread evenly over the graph. Priorities are refreshed
+        lazily when a node reaches the top of the queue.
+
+        Args:
+            graph: A CSRGraph, or any dict format CSRGraph.from_dict accepts.
+            settle_limit (int): Nodes a witness search may settle before giving
+                                up. Lower builds faster but adds extra (harmless)
+                                shortcuts.
+        """
+        if not isinstance(graph, CSRGraph):
+            graph = CSRGraph.from_dict(graph)
+        n = graph.num_nodes
+        out = [{} for _ in range(n)]
+        inn = [{} for _ in range(n)]
+        for u in range(n):
+            targets, weights = graph.neighbors(u)
+            for v, w in zip(targets, weights):
+                if u != v and w < out[u].get(v, INF): # Drop self-loops, keep lightest parallel edge
+                    out[u][v] = w
+                    inn[v][u] = w
+        via = {}
+        deleted_neighbors = [0] * n
+        rank = [0] * n
+        up_edges = [None] * n
+        down_edges = [None] * n
+
+        def shortcuts_for(v):
+            """Shortcuts needed if v were contracted now, as (u, x, weight)."""
+            outs = list(out[v].items())
+            if not outs:
+                return []
+            max_out = max(w for _, w in outs)
+            needed = []
+            for u, w_uv in inn[v].items():
+                # Local Dijkstra from u that avoids v, bounded by the longest path through v
+                limit = w_uv + max_out
+                dist = {u: 0.0}
+                heap = [(0.0, u)]
+                settled = 0
+                while heap and settled < settle_limit:
+                    d, a = heapq.heappop(heap)
+                    if d > dist[a]:
+                        continue
+                    if d > limit:
+                        break
+                    settled += 1
+                    for b, w in out[a].items():
+                        if b != v and d + w < dist.get(b, INF):
+                            dist[b] = d + w
+                            heapq.heappush(heap, (d + w, b))
+                for x, w_vx in outs:
+                    if x != u and dist.get(x, INF) > w_uv + w_vx:
+                        needed.append((u, x, w_uv + w_vx))
+            return needed
+
+        def priority(v, needed):
+            return len(needed) - len(out[v]) - len(inn[v]) + deleted_neighbors[v]
+
+        queue = [(priority(v, shortcuts_for(v)), v) for v in range(n)]
+        heapq.heapify(queue)
+        order = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            needed = shortcuts_for(v)
+            p = priority(v, needed)
+            if queue and p > queue[0][0]:
+                heapq.heappush(queue, (p, v)) # Stale priority: let the real minimum go first
+                continue
+
+            rank[v] = order
+            order += 1
+            up_edges[v] = [(x, w, via.get((v, x), -1)) for x, w in out[v].items()]
+            down_edges[v] = [(u, w, via.get((u, v), -1)) for u, w in inn[v].items()]
+            for x in out[v]:
+                del inn[x][v]
+                deleted_neighbors[x] += 1
+            for u in inn[v]:
+                del out[u][v]
+                deleted_neighbors[u] += 1
+            for u, x, w in needed:
+                if w < out[u].get(x, INF):
+                    out[u][x] = w
+                    inn[x][u] = w
+                    via[(u, x)] = v
+            out[v] = inn[v] = None
+
+        def to_csr(edge_lists):
+            offsets, targets, weights, vias = [0], [], [], []
+            for edges in edge_lists:
+                for x, w, mid in edges:
+                    targets.append(x); weights.append(w); vias.append(mid)
+                offsets.append(len(targets))
+            return offsets, targets, weights, vias
+
+        return cls(rank, to_csr(up_edges), to_csr(down_edges), graph.names)
+
+    @property
+    def num_shortcuts(self):
+        return len(self.via)
+
+    # --- Queries ---
+    def _search(self, s, t):
+        """
+        Bidirectional upward Dijkstra between node ids. Each side stops once its
+        smallest key is no better than the best meeting found. Stall-on-demand
+        skips relaxing a node when a higher-ranked node already reached proves
+        its tentative distance is not optimal.
+        Returns (distance, meeting node id or -1).
+        """
+        self.query_id += 1
+        q = self.query_id
+        dist, pred, stamp = self.dist, self.pred, self.stamp
+        for side, root in ((0, s), (1, t)):
+            dist[side][root], pred[side][root], stamp[side][root] = 0.0, -1, q
+        queues = ([(0.0, s)], [(0.0, t)])
+        # Side 0 climbs `up` and stalls via `down`; side 1 the other way round
+        graphs = ((self.up, self.down), (self.down, self.up))
+        best, meeting = INF, -1
+        heappop, heappush = heapq.heappop, heapq.heappush
+
+        while True:
+            f = queues[0][0][0] if queues[0] else INF
+            b = queues[1][0][0] if queues[1] else INF
+            if min(f, b) >= best:
+                break
+            side = 0 if f <= b else 1
+            d, u = heappop(queues[side])
+            my_dist, my_stamp = dist[side], stamp[side]
+            if d > my_dist[u]:
+                continue
+            if stamp[1 - side][u] == q and d + dist[1 - side][u] < best:
+                best, meeting = d + dist[1 - side][u], u
+
+            (offsets, targets, weights, _), (s_offsets, s_targets, s_weights, _) = graphs[side]
+            stalled = False
+            for i in range(s_offsets[u], s_offsets[u + 1]):
+                x = s_targets[i]
+                if my_stamp[x] == q and my_dist[x] + s_weights[i] < d:
+                    stalled = True
+                    break
+            if stalled:
+                continue
+            my_pred = pred[side]
+            for i in range(offsets[u], offsets[u + 1]):
+                x = targets[i]
+                nd = d + weights[i]
+                if my_stamp[x] != q or nd < my_dist[x]:
+                    my_dist[x], my_pred[x], my_stamp[x] = nd, u, q
+                    heappush(queues[side], (nd, x))
+        return best, meeting
+
+    def _unpack(self, tail, head, path):
+        """Appends the original nodes after `tail` on the (possibly shortcut) edge tail -> head."""
+        stack = [(tail, head)]
+        while stack:
+            a, b = stack.pop()
+            mid = self.via.get((a, b))
+            if mid is None:
+                path.append(b)
+            else:
+                stack.append((mid, b))
+                stack.append((a, mid))
+
+    def _id_of(self, name):
+        return self.ids[name] if self.ids is not None else name
+
+    def _name_of(self, node_id):
+        return self.names[node_id] if self.names is not None else node_id
+
+    def distance(self, source, target):
+        """Shortest distance from source to target, float('inf') if unreachable."""
+        s, t = self._id_of(source), self._id_of(target)
+        if s == t:
+            return 0.0
+        return self._search(s, t)[0]
+
+    def shortest_path(self, source, target):
+        """
+        Returns (distance, path) with shortcuts expanded back into original
+        nodes; (float('inf'), []) if target is unreachable.
+        """
+        s, t = self._id_of(source), self._id_of(target)
+        if s == t:
+            return 0.0, [source]
+        best, meeting = self._search(s, t)
+        if meeting < 0:
+            return INF, []
+        upward = [meeting]
+        node = meeting
+        while self.pred[0][node] != -1:
+            node = self.pred[0][node]
+            upward.append(node)
+        upward.reverse() # s .. meeting
+        chain = upward
+        node = meeting
+        while self.pred[1][node] != -1:
+            node = self.pred[1][node]
+            chain.append(node) # meeting .. t
+        path = [chain[0]]
+        for a, b in zip(chain, chain[1:]):
+            self._unpack(a, b, path)
+        return best, [self._name_of(i) for i in path]
+
+    # --- Persistence ---
+    def to_bytes(self) -> bytes:
+        """
+        Compact little-endian layout: header, rank (int32), then for `up` and
+        `down` the offsets (int64), weights (float64), targets and via (int32),
+        then the pickled node names if the graph had any.
+        """
+        names_blob = pickle.dumps(self.names) if self.names is not None else b''
+        parts = [HEADER.pack(self.MAGIC, self.num_nodes, len(self.up[1]), len(self.down[1]), len(names_blob)),
+                 np.asarray(self.rank, dtype='<i4').tobytes()]
+        for offsets, targets, weights, via in (self.up, self.down):
+            parts += [np.asarray(offsets, dtype='<i8').tobytes(), np.asarray(weights, dtype='<f8').tobytes(),
+                      np.asarray(targets, dtype='<i4').tobytes(), np.asarray(via, dtype='<i4').tobytes()]
+        parts.append(names_blob)
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data) -> "ContractionHierarchy":
+        magic, n, m_up, m_down, names_len = HEADER.unpack_from(data, 0)
+        if magic != cls.MAGIC:
+            raise ValueError(f"Not a serialized {cls.__name__}.")
+        pos = HEADER.size
+
+        def take(dtype, count):
+            nonlocal pos
+            values = np.frombuffer(data, dtype=dtype, count=count, offset=pos)
+            pos += values.nbytes
+            return values.tolist() # Plain lists index fastest in the query loop
+
+        rank = take('<i4', n)
+        csr = []
+        for m in (m_up, m_down):
+            offsets, weights = take('<i8', n + 1), take('<f8', m)
+            targets, via = take('<i4', m), take('<i4', m)
+            csr.append((offsets, targets, weights, via))
+        names = pickle.loads(data[pos:pos + names_len]) if names_len else None
+        return cls(rank, csr[0], csr[1], names)
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "ContractionHierarchy":
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+# --- Benchmark ---
+def grid_road_network(side, seed=0):
+    """
+    Road-like test graph in program_10's format: a side x side grid of two-way
+    streets with random travel times, plus a sparse grid of faster highways.
+    """
+    rng = random.Random(seed)
+    graph = {(r, c): [] for r in range(side) for c in range(side)}
+
+    def road(a, b, w):
+        graph[a].append((b, w))
+        graph[b].append((a, w))
+
+    for r in range(side):
+        for c in range(side):
+            if r + 1 < side:
+                road((r, c), (r + 1, c), rng.randint(10, 100))
+            if c + 1 < side:
+                road((r, c), (r, c + 1), rng.randint(10, 100))
+    for r in range(0, side, 10):
+        for c in range(0, side - 10, 10):
+            road((r, c), (r, c + 10), rng.randint(150, 250))
+            road((c, r), (c + 10, r), rng.randint(150, 250))
+    return graph
+
+def run_benchmark(side=100, num_queries=300, path="/tmp/program_355_ch.bin"):
+    from program_10 import dijkstra, ShortestPathQueryEngine
+
+    graph = grid_road_network(side)
+    print(f"Road grid: {len(graph):,} nodes, {sum(map(len, graph.values())):,} edges")
+    start = time.perf_counter()
+    ch = ContractionHierarchy.build(graph)
+    print(f"Contraction:        {time.perf_counter() - start:8.2f} s, {ch.num_shortcuts:,} shortcuts")
+    ch.save(path)
+    start = time.perf_counter()
+    ch = ContractionHierarchy.load(path)
+    with open(path, 'rb') as f:
+        size = len(f.read())
+    print(f"Load:               {time.perf_counter() - start:8.2f} s, {size / 2**20:.1f} MiB on disk")
+
+    rng = random.Random(1)
+    nodes = list(graph)
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(num_queries)]
+
+    start = time.perf_counter()
+    expected = [dijkstra(graph, s)[t] for s, t in pairs[:50]]
+    per_query = (time.perf_counter() - start) / 50
+    print(f"program_10 dijkstra (full):     {per_query * 1e6:10,.0f} us/query")
+
+    engine = ShortestPathQueryEngine(graph)
+    start = time.perf_counter()
+    for s, t in pairs:
+        engine.query(s, t)
+    print(f"program_10 bidirectional:       {(time.perf_counter() - start) / num_queries * 1e6:10,.0f} us/query")
+
+    start = time.perf_counter()
+    answers = [ch.distance(s, t) for s, t in pairs]
+    print(f"Contraction hierarchy:          {(time.perf_counter() - start) / num_queries * 1e6:10,.0f} us/query")
+
+    mismatches = sum(a != e for a, e in zip(answers, expected))
+    for s, t in pairs[50:]:
+        if ch.shortest_path(s, t)[0] != engine.query(s, t)[0]:
+            mismatches += 1
+    print(f"Mismatches against dijkstra over {num_queries} queries: {mismatches}")
+
+# Example Usage:
+if __name__ == "__main__":
+    graph = {
+        'S': [('A', 10), ('C', 1)],
+        'A': [('B', 2)],
+        'B': [('D', 7)],
+        'C': [('A', 4), ('D', 8)],
+        'D': [('E', 3)],
+        'E': []
+    }
+    ch = ContractionHierarchy.build(graph)
+    print("Contraction order:", sorted(graph, key=lambda name: ch.rank[ch.ids[name]]))
+    print("S -> E:", ch.shortest_path('S', 'E'))
+    # Expected: (12.0, ['S', 'C', 'D', 'E'])
+    print("S -> B:", ch.shortest_path('S', 'B'))
+    # Expected: (7.0, ['S', 'C', 'A', 'B'])
+    print("E -> S:", ch.shortest_path('E', 'S'))
+    # Expected: (inf, [])
+
+    ch.save("/tmp/program_355_demo.bin")
+    loaded = ContractionHierarchy.load("/tmp/program_355_demo.bin")
+    print("Reloaded S -> D:", loaded.distance('S', 'D'))
+    # Expected: 9.0
+
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        print()
+        run_benchmark()
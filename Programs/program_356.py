@@ -0,0 +1,431 @@
+import heapq
+import math
+import sys
+import time
+from array import array
+import numpy as np
+
+INF = float('inf')
+SQRT2 = math.sqrt(2)
+
+class GridMap:
+    def __init__(self, rows, cols, free=None):
+        """
+        Grid for pathfinding stored as one flat bytearray, 1 = walkable.
+
+        The grid is padded with a one-cell wall border, so cell (r, c) lives at
+        index (r + 1) * width + (c + 1) and every neighbour lookup is a plain
+        index offset with no bounds checks. Searches keep per-cell state in
+        flat arrays (a predecessor direction byte per cell) instead of dicts
+        keyed by (row, col) tuples.
+
+        Args:
+            rows, cols (int): Grid size without the border.
+            free (bytearray | None): Padded walkability; use the from_* constructors.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.width = cols + 2
+        self.free = free if free is not None else bytearray((rows + 2) * self.width)
+        W = self.width
+        # Direction codes: 0-3 orthogonal, 4-7 diagonal
+        self.steps = (1, -1, W, -W, W + 1, W - 1, -W + 1, -W - 1)
+
+    @classmethod
+    def from_numpy(cls, walls):
+        """From a 2D array where nonzero marks an obstacle (same convention as the list grids)."""
+        walls = np.asarray(walls)
+        rows, cols = walls.shape
+        padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+        padded[1:-1, 1:-1] = walls == 0
+        return cls(rows, cols, bytearray(padded.tobytes()))
+
+    @classmethod
+    def from_lists(cls, grid):
+        """From a list of lists with 0 = walkable, 1 = obstacle."""
+        return cls.from_numpy(np.array(grid, dtype=np.uint8).reshape(len(grid), -1))
+
+    @classmethod
+    def random(cls, rows, cols, wall_probability, seed=0):
+        rng = np.random.default_rng(seed)
+        return cls.from_numpy(rng.random((rows, cols)) < wall_probability)
+
+    def np_free(self):
+        return np.frombuffer(self.free, dtype=np.uint8)
+
+    def index(self, cell):
+        return (cell[0] + 1) * self.width + cell[1] + 1
+
+    def cell(self, i):
+        r, c = divmod(i, self.width)
+        return (r - 1, c - 1)
+
+    def is_free(self, cell):
+        return 0 <= cell[0] < self.rows and 0 <= cell[1] < self.cols and self.free[self.index(cell)] == 1
+
+    def _walk_back(self, came_from, start, end):
+        """Follows predecessor direction codes (code + 1; 0 = none) from end to start."""
+        steps = self.steps
+        path = [end]
+        i = end
+        while i != start:
+            i -= steps[came_from[i] - 1]
+            path.append(i)
+        return [self.cell(i) for i in reversed(path)]
+
+    # --- Breadth-first search ---
+    def bfs_path(self, start, end):
+        """
+        Shortest 4-connected path, or None. Expands one whole BFS layer per
+        step with NumPy: the frontier is an index array, and each of the four
+        directions marks its unvisited free neighbours in the predecessor
+        array at once. Memory is one byte per cell.
+        """
+        if not (self.is_free(start) and self.is_free(end)):
+            return None
+        s, t = self.index(start), self.index(end)
+        free = self.np_free()
+        came_from = np.zeros(len(free), dtype=np.uint8)
+        came_from[s] = 255 # Visited, no predecessor
+        frontier = np.array([s], dtype=np.int64)
+        steps = self.steps[:4]
+        while frontier.size and not came_from[t]:
+            reached = []
+            for code, step in enumerate(steps):
+                candidates = frontier + step
+                candidates = candidates[(free[candidates] == 1) & (came_from[candidates] == 0)]
+                came_from[candidates] = code + 1
+                reached.append(candidates)
+            frontier = np.concatenate(reached)
+        if not came_from[t]:
+            return None
+        return self._walk_back(came_from, s, t)
+
+    # --- A* ---
+    def astar(self, start, end, diagonal=False):
+        """
+        A* over the flat grid. With diagonal=True moves are 8-connected
+        (diagonal cost sqrt(2), no squeezing between two diagonal walls) and
+        the octile heuristic is used; otherwise 4-connected with Manhattan.
+        g-scores live in an array('d') and predecessors in a bytearray.
+        Returns the path as a list of (row, col), or None.
+        """
+        if not (self.is_free(start) and self.is_free(end)):
+            return None
+        s, t = self.index(start), self.index(end)
+        W = self.width
+        free = self.free
+        er, ec = divmod(t, W)
+        # (code, step, cost, side_a, side_b): a diagonal step needs both orthogonal
+        # cells it passes open; for straight steps the sides are the cell itself
+        moves = [(code, step, 1.0, step, step) for code, step in enumerate(self.steps[:4])]
+        if diagonal:
+            moves += [(code, dr * W + dc, SQRT2, dr * W, dc)
+                      for code, (dr, dc) in enumerate(((1, 1), (1, -1), (-1, 1), (-1, -1)), start=4)]
+            extra = SQRT2 - 2
+
+            def heuristic(i):
+                r, c = divmod(i, W)
+                dr, dc = abs(r - er), abs(c - ec)
+                return dr + dc + extra * (dr if dr < dc else dc)
+        else:
+            def heuristic(i):
+                r, c = divmod(i, W)
+                return abs(r - er) + abs(c - ec)
+
+        g = array('d', [INF]) * len(free)
+        came_from = bytearray(len(free))
+        closed = bytearray(len(free))
+        g[s] = 0.0
+        open_set = [(heuristic(s), 0.0, s)] # (f, h, cell)
+        heappop, heappush = heapq.heappop, heapq.heappush
+        while open_set:
+            _, _, i = heappop(open_set)
+            if i == t:
+                return self._walk_back(came_from, s, t)
+            if closed[i]:
+                continue
+            closed[i] = 1
+            current_g = g[i]
+            for code, step, cost, side_a, side_b in moves:
+                j = i + step
+                if not free[j] or closed[j] or not (free[i + side_a] and free[i + side_b]):
+                    continue
+                tentative = current_g + cost
+                if tentative < g[j]:
+                    g[j] = tentative
+                    came_from[j] = code + 1
+                    h = heuristic(j)
+                    heappush(open_set, (tentative + h, h, j)) # Ties go to the node nearer the goal
+        return None
+
+    # --- Jump point search ---
+    def _line_boards(self):
+        """
+        Bitboards for straight-line scans, one set per direction (E, W, S, N).
+        Each grid line (a row for E/W, a column for S/N, reversed for W/N) is
+        a Python int with bit p set if position p along the scan is a wall,
+        plus a second int marking forced neighbours: cells whose side cell is
+        open while the side cell one step back is blocked. A scan is then a
+        shift and a lowest-set-bit lookup over the whole line at once.
+        """
+        H, W = self.rows + 2, self.width
+        free = self.np_free().reshape(H, W)
+        boards = []
+        for lines in (free, free[:, ::-1], free.T, free.T[:, ::-1]):
+            packed = np.packbits(lines, axis=1, bitorder='little')
+            ints = [int.from_bytes(row.tobytes(), 'little') for row in packed]
+            full = (1 << lines.shape[1]) - 1
+            walls = [full ^ line for line in ints]
+            # Side line open at p, blocked at p - 1 (one step behind along the scan)
+            edge = [line & ~(line << 1) for line in ints]
+            forced = [0] + [edge[k - 1] | edge[k + 1] for k in range(1, len(ints) - 1)] + [0]
+            boards.append((walls, forced))
+        return boards
+
+    def _jump_straight(self, i, step, boards, goal):
+        """First jump point scanning from i in a straight line, or -1."""
+        W, last = self.width, self.rows + 1
+        r, c = divmod(i, W)
+        gr, gc = divmod(goal, W)
+        # Line number and position along the scan, for i and for the goal
+        if step == 1:
+            direction, k, p, gk, gp = 0, r, c, gr, gc
+        elif step == -1:
+            direction, k, p, gk, gp = 1, r, W - 1 - c, gr, W - 1 - gc
+        elif step == W:
+            direction, k, p, gk, gp = 2, c, r, gc, gr
+        else:
+            direction, k, p, gk, gp = 3, c, last - r, gc, last - gr
+        walls, forced = boards[direction]
+        blocked = walls[k] >> p # Never zero: the border wall ends every line
+        stop = (blocked & -blocked).bit_length() - 1
+        hits = forced[k] >> p
+        if gk == k and gp >= p:
+            hits |= 1 << (gp - p)
+        if not hits:
+            return -1
+        first = (hits & -hits).bit_length() - 1
+        return i + first * step if first < stop else -1
+
+    def _jump_diagonal(self, i, dr, dc, boards, goal):
+        W, free = self.width, self.free
+        v, h = dr * W, dc
+        while True:
+            if not free[i]:
+                return -1
+            if i == goal:
+                return i
+            if self._jump_straight(i + h, h, boards, goal) >= 0 or self._jump_straight(i + v, v, boards, goal) >= 0:
+                return i
+            if not (free[i + h] and free[i + v]):
+                return -1
+            i += v + h
+
+    def _pruned_neighbours(self, i, parent):
+        """Successor directions (dr, dc) to try from i, given the parent jump point."""
+        W, free = self.width, self.free
+        if parent < 0:
+            dirs = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+            dirs += [(dr, dc) for dr in (1, -1) for dc in (1, -1) if free[i + dr * W] and free[i + dc]]
+            return dirs
+        r, c = divmod(i, W)
+        pr, pc = divmod(parent, W)
+        dr = (r > pr) - (r < pr)
+        dc = (c > pc) - (c < pc)
+        dirs = []
+        if dr and dc:
+            down, across = free[i + dr * W], free[i + dc]
+            if down:
+                dirs.append((dr, 0))
+            if across:
+                dirs.append((0, dc))
+            if down and across:
+                dirs.append((dr, dc))
+        elif dc:
+            ahead, up, down = free[i + dc], free[i - W], free[i + W]
+            if ahead:
+                dirs.append((0, dc))
+                if up:
+                    dirs.append((-1, dc))
+                if down:
+                    dirs.append((1, dc))
+            if up:
+                dirs.append((-1, 0))
+            if down:
+                dirs.append((1, 0))
+        else:
+            ahead, left, right = free[i + dr * W], free[i - 1], free[i + 1]
+            if ahead:
+                dirs.append((dr, 0))
+                if left:
+                    dirs.append((dr, -1))
+                if right:
+                    dirs.append((dr, 1))
+            if left:
+                dirs.append((0, -1))
+            if right:
+                dirs.append((0, 1))
+        return dirs
+
+    def jps(self, start, end):
+        """
+        Jump point search: optimal 8-connected paths on uniform-cost grids
+        (same movement rules as astar(diagonal=True)). Instead of pushing every
+        neighbour, it scans along straight and diagonal lines and only stops at
+        cells with forced neighbours, so open areas cost a few heap operations.
+        Straight scans test a whole row or column at once on bitboards
+        (see `_line_boards`).
+        Jump points are sparse, so their g-scores and parents live in dicts.
+        """
+        if not (self.is_free(start) and self.is_free(end)):
+            return None
+        s, t = self.index(start), self.index(end)
+        W = self.width
+
+        def octile(a, b):
+            ar, ac = divmod(a, W)
+            br, bc = divmod(b, W)
+            dr, dc = abs(ar - br), abs(ac - bc)
+            return dr + dc + (SQRT2 - 2) * (dr if dr < dc else dc)
+
+        boards = self._line_boards()
+        g = {s: 0.0}
+        parent = {s: -1}
+        closed = set()
+        open_set = [(octile(s, t), 0.0, s)] # (f, h, jump point)
+        while open_set:
+            _, _, i = heapq.heappop(open_set)
+            if i == t:
+                jump_points = [t]
+                while parent[jump_points[-1]] >= 0:
+                    jump_points.append(parent[jump_points[-1]])
+                return self._expand(jump_points[::-1])
+            if i in closed:
+                continue
+            closed.add(i)
+            current_g = g[i]
+            for dr, dc in self._pruned_neighbours(i, parent[i]):
+                if dr and dc:
+                    j = self._jump_diagonal(i + dr * W + dc, dr, dc, boards, t)
+                elif dc:
+                    j = self._jump_straight(i + dc, dc, boards, t)
+                else:
+                    j = self._jump_straight(i + dr * W, dr * W, boards, t)
+                if j < 0 or j in closed:
+                    continue
+                tentative = current_g + octile(i, j)
+                if tentative < g.get(j, INF):
+                    g[j] = tentative
+                    parent[j] = i
+                    h = octile(j, t)
+                    heapq.heappush(open_set, (tentative + h, h, j))
+        return None
+
+    def _expand(self, jump_points):
+        """Fills in the straight/diagonal runs between consecutive jump points."""
+        W = self.width
+        path = [jump_points[0]]
+        for a, b in zip(jump_points, jump_points[1:]):
+            ar, ac = divmod(a, W)
+            br, bc = divmod(b, W)
+            step = ((br > ar) - (br < ar)) * W + ((bc > ac) - (bc < ac))
+            i = a
+            while i != b:
+                i += step
+                path.append(i)
+        return [self.cell(i) for i in path]
+
+def path_cost(path):
+    """Length of a path of (row, col) cells: 1 per straight step, sqrt(2) per diagonal."""
+    return sum(SQRT2 if a[0] != b[0] and a[1] != b[1] else 1.0 for a, b in zip(path, path[1:]))
+
+# --- Benchmark ---
+def _a_star_dicts(grid, start, end):
+    # The original program_21 search (a g_score dict over every cell), kept as the baseline
+    rows, cols = len(grid), len(grid[0])
+    g_score = {(r, c): INF for r in range(rows) for c in range(cols)}
+    g_score[start] = 0
+    came_from = {}
+    open_set = [(0, 0, start)]
+    while open_set:
+        _, _, node = heapq.heappop(open_set)
+        if node == end:
+            path = [node]
+            while node in came_from:
+                node = came_from[node]
+                path.append(node)
+            return path[::-1]
+        for dr, dc in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+            neighbor = (node[0] + dr, node[1] + dc)
+            if 0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols and grid[neighbor[0]][neighbor[1]] == 0:
+                tentative = g_score[node] + 1
+                if tentative < g_score[neighbor]:
+                    came_from[neighbor] = node
+                    g_score[neighbor] = tentative
+                    f = tentative + abs(neighbor[0] - end[0]) + abs(neighbor[1] - end[1])
+                    heapq.heappush(open_set, (f, tentative, neighbor))
+    return None
+
+def _rooms(size, room=256, door=8, seed=0):
+    """Mostly open map: walls every `room` cells with a few doors in each wall segment."""
+    rng = np.random.default_rng(seed)
+    walls = np.zeros((size, size), dtype=np.uint8)
+    walls[room::room, :] = 1
+    walls[:, room::room] = 1
+    for line in range(room, size, room):
+        for start in range(0, size, room):
+            for gap in rng.integers(start, min(start + room, size) - door, size=2):
+                walls[line, gap:gap + door] = 0
+                walls[gap:gap + door, line] = 0
+    return GridMap.from_numpy(walls)
+
+def run_benchmark(size=4096, baseline_size=512):
+    walls = (np.random.default_rng(1).random((baseline_size, baseline_size)) < 0.25).astype(np.uint8)
+    walls[0, 0] = walls[-1, -1] = 0
+    grid = GridMap.from_numpy(walls)
+    walls = walls.tolist()
+    start_cell, end_cell = (0, 0), (baseline_size - 1, baseline_size - 1)
+    print(f"{baseline_size} x {baseline_size}, 25% obstacles, corner to corner:")
+    for label, run in (("original dict A*", lambda: _a_star_dicts(walls, start_cell, end_cell)),
+                       ("GridMap.astar", lambda: grid.astar(start_cell, end_cell))):
+        start = time.perf_counter()
+        path = run()
+        print(f"  {label:<26} {time.perf_counter() - start:7.2f} s, {len(path) - 1} steps")
+
+    maps = [(f"{p:.0%} obstacles", GridMap.random(size, size, p, seed=2)) for p in (0.25, 0.05)]
+    maps.append(("rooms with doors", _rooms(size)))
+    start_cell, end_cell = (0, 0), (size - 1, size - 1)
+    for name, grid in maps:
+        grid.free[grid.index(start_cell)] = grid.free[grid.index(end_cell)] = 1
+        print(f"{size} x {size}, {name}, corner to corner:")
+        runs = (("bfs_path (4-conn)", lambda: grid.bfs_path(start_cell, end_cell)),
+                ("astar (4-conn)", lambda: grid.astar(start_cell, end_cell)),
+                ("astar (8-conn, octile)", lambda: grid.astar(start_cell, end_cell, diagonal=True)),
+                ("jps (8-conn)", lambda: grid.jps(start_cell, end_cell)))
+        for label, run in runs:
+            start = time.perf_counter()
+            path = run()
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<26} {elapsed:7.2f} s, cost {path_cost(path):.1f}" if path else
+                  f"  {label:<26} {elapsed:7.2f} s, no path")
+
+# Example Usage:
+if __name__ == "__main__":
+    grid = GridMap.from_lists([
+        [0, 0, 0, 0, 0],
+        [0, 1, 1, 1, 0],
+        [0, 0, 0, 1, 0],
+        [0, 1, 0, 0, 0],
+        [0, 0, 0, 0, 0]
+    ])
+    print("BFS:  ", grid.bfs_path((0, 0), (4, 4)))
+    print("A*:   ", grid.astar((0, 0), (4, 4)))
+    path = grid.astar((0, 0), (4, 4), diagonal=True)
+    print("A* 8: ", path, f"cost {path_cost(path):.3f}")
+    path = grid.jps((0, 0), (4, 4))
+    print("JPS:  ", path, f"cost {path_cost(path):.3f}")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        print()
+        run_benchmark()
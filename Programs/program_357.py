@@ -0,0 +1,151 @@
+import sys
+import time
+from collections import deque
+
+class AhoCorasick:
+    def __init__(self, patterns):
+        """
+        Multi-pattern matcher: every occurrence of every pattern in one pass.
+
+        The patterns form a trie (`goto[state]` maps a symbol to the child
+        state); `fail[state]` points to the longest proper suffix of the
+        state's string that is also in the trie, and `outputs[state]` lists
+        every pattern ending at that state, its own plus those inherited
+        through the failure chain. Scanning costs O(len(text) + matches)
+        however many patterns there are.
+
+        Args:
+            patterns (iterable): str patterns for str text, or bytes patterns
+                                 for bytes text. Duplicates and empty
+                                 patterns are ignored.
+        """
+        self.patterns = list(dict.fromkeys(p for p in patterns if p))
+        self.goto = [{}]
+        self.fail = [0]
+        own = [()]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for symbol in pattern:
+                nxt = self.goto[state].get(symbol)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][symbol] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    own.append(())
+                state = nxt
+            own[state] = (index,)
+
+        # Breadth-first, so a state's failure target is final before its children need it
+        self.outputs = own
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for symbol, child in self.goto[state].items():
+                f = self.fail[state]
+                while f and symbol not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[child] = self.goto[f].get(symbol, 0)
+                self.outputs[child] = own[child] + self.outputs[self.fail[child]]
+                queue.append(child)
+        self.lengths = [len(p) for p in self.patterns]
+        self.reset()
+
+    def reset(self):
+        """Forgets the stream position and any partial match."""
+        self.state = 0
+        self.offset = 0
+
+    def _scan(self, text, state, offset, matches):
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        patterns, lengths = self.patterns, self.lengths
+        root = goto[0]
+        for i, symbol in enumerate(text):
+            while state and symbol not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(symbol, 0) if state else root.get(symbol, 0)
+            if outputs[state]:
+                end = offset + i + 1
+                for index in outputs[state]:
+                    matches.append((end - lengths[index], patterns[index]))
+        return state
+
+    def find_all(self, text):
+        """List of every (start position, pattern) in text, ordered by end position."""
+        matches = []
+        self._scan(text, 0, 0, matches)
+        return matches
+
+    def iter_matches(self, text, chunk_size=1 << 16):
+        """Same matches as find_all, produced lazily a chunk of text at a time."""
+        state = 0
+        for offset in range(0, len(text), chunk_size):
+            matches = []
+            state = self._scan(text[offset:offset + chunk_size], state, offset, matches)
+            yield from matches
+
+    def feed(self, chunk):
+        """
+        Streaming mode: scans the next chunk of a stream and returns its
+        matches with positions relative to the start of the stream. The
+        automaton state carries over, so matches spanning chunk boundaries
+        are found as well.
+        """
+        matches = []
+        self.state = self._scan(chunk, self.state, self.offset, matches)
+        self.offset += len(chunk)
+        return matches
+
+# --- Benchmark ---
+def run_benchmark(num_keywords=2_000, text_size=1_000_000, kmp_sample=20):
+    import random
+    from program_321 import kmp_find_all
+
+    rng = random.Random(0)
+    alphabet = 'abcdefghijklmnopqrstuvwxyz'
+    keywords = list({''.join(rng.choice(alphabet) for _ in range(rng.randint(4, 10))) for _ in range(num_keywords)})
+    words = keywords + [''.join(rng.choice(alphabet) for _ in range(rng.randint(2, 9))) for _ in range(20_000)]
+    text = ' '.join(rng.choice(words) for _ in range(text_size // 6))[:text_size]
+    print(f"{len(keywords):,} keywords over {len(text):,} characters:")
+
+    start = time.perf_counter()
+    matcher = AhoCorasick(keywords)
+    print(f"  Aho-Corasick build         {time.perf_counter() - start:8.3f} s ({len(matcher.goto):,} states)")
+    start = time.perf_counter()
+    matches = matcher.find_all(text)
+    print(f"  Aho-Corasick scan (str)    {time.perf_counter() - start:8.3f} s ({len(matches):,} matches)")
+    data = text.encode()
+    byte_matcher = AhoCorasick(keyword.encode() for keyword in keywords)
+    start = time.perf_counter()
+    byte_matcher.find_all(data)
+    print(f"  Aho-Corasick scan (bytes)  {time.perf_counter() - start:8.3f} s")
+    start = time.perf_counter()
+    for offset in range(0, len(data), 4096):
+        byte_matcher.feed(data[offset:offset + 4096])
+    print(f"  Aho-Corasick feed (4 KB)   {time.perf_counter() - start:8.3f} s")
+
+    sample = keywords[:kmp_sample]
+    start = time.perf_counter()
+    kmp_counts = {keyword: sum(1 for _ in kmp_find_all(text, keyword)) for keyword in sample}
+    per_pattern = (time.perf_counter() - start) / len(sample)
+    print(f"  kmp per keyword            {per_pattern * len(keywords):8.1f} s "
+          f"(estimated from {len(sample)} keywords)")
+    ac_counts = {keyword: 0 for keyword in sample}
+    for _, keyword in matches:
+        if keyword in ac_counts:
+            ac_counts[keyword] += 1
+    print(f"  same matches for the sampled keywords: {ac_counts == kmp_counts}")
+
+if __name__ == '__main__':
+    matcher = AhoCorasick(["he", "she", "his", "hers"])
+    print(matcher.find_all("ushers"))
+    # Expected: [(1, 'she'), (2, 'he'), (2, 'hers')]
+
+    stream = AhoCorasick([b"ERROR", b"timeout"])
+    for chunk in (b"12:00 ERR", b"OR db timeo", b"ut\n"):
+        print(chunk, "->", stream.feed(chunk))
+    # Expected: ERROR at 6 found in the second chunk, timeout at 15 in the third
+
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        print()
+        run_benchmark()
@@ -1,3 +1,9 @@
+import sys
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_right
+
 class Node:
     def __init__(self):
         self.children = {}
@@ -5,30 +11,299 @@ class Node:
         self.is_terminal = False
 
 class SuffixTree:
+    ROOT = 0
+
     def __init__(self, text):
-        self.root = Node()
-        self.text = text + '$'
+        """
+        Suffix tree built with Ukkonen's algorithm in O(n).
+
+        Edges are labelled by (start, end) positions into `codes` instead of
+        copied strings, and nodes live in parallel int32 arrays: `start`/`end`
+        of the edge into the node, its suffix `link`, and its children as a
+        `first_child` / `next_sibling` list. Only the root, which is visited
+        constantly and has many children, keeps a dict. That is about 20
+        bytes per node and at most 2n nodes, against the O(n^2) Node objects
+        of a character trie.
+
+        Args:
+            text (str | list[str]): One string, or several for a generalized
+                suffix tree. Each string is followed by its own unique
+                terminator, so no match ever crosses from one string into the next.
+        """
+        self.generalized = not isinstance(text, str) # Given a list, even of one string
+        self.texts = list(text) if self.generalized else [text]
+        self.codes = array('i')
+        self.offsets = [] # Start of each string in codes
+        for i, s in enumerate(self.texts):
+            self.offsets.append(len(self.codes))
+            self.codes.extend(map(ord, s))
+            self.codes.append(-1 - i) # Terminator that can match nothing else
         self.build_tree()
 
+    def _new_node(self, start, end):
+        self.start.append(start)
+        self.end.append(end)
+        self.link.append(self.ROOT)
+        self.first_child.append(-1)
+        self.next_sibling.append(-1)
+        return len(self.start) - 1
+
+    def _child(self, node, code):
+        if node == self.ROOT:
+            return self.root_children.get(code, -1)
+        codes, start, next_sibling = self.codes, self.start, self.next_sibling
+        child = self.first_child[node]
+        while child != -1 and codes[start[child]] != code:
+            child = next_sibling[child]
+        return child
+
+    def _add_child(self, node, child):
+        if node == self.ROOT:
+            self.root_children[self.codes[self.start[child]]] = child
+        else:
+            self.next_sibling[child] = self.first_child[node]
+            self.first_child[node] = child
+
+    def _replace_child(self, node, old, new):
+        # `new` takes over old's slot; both edges start with the same symbol
+        if node == self.ROOT:
+            self.root_children[self.codes[self.start[old]]] = new
+            return
+        self.next_sibling[new] = self.next_sibling[old]
+        if self.first_child[node] == old:
+            self.first_child[node] = new
+            return
+        child = self.first_child[node]
+        while self.next_sibling[child] != old:
+            child = self.next_sibling[child]
+        self.next_sibling[child] = new
+
     def build_tree(self):
-        for i in range(len(self.text)):
-            self.insert_suffix(self.text[i:])
+        codes = self.codes
+        n = len(codes)
+        self.start, self.end, self.link = array('i'), array('i'), array('i')
+        self.first_child, self.next_sibling = array('i'), array('i')
+        self.root_children = {}
+        self._new_node(-1, -1)
+        start, end, link = self.start, self.end, self.link
+        # Leaves get end = n straight away: their edges only ever grow to the end of the text
+        active_node, active_edge, active_length, remainder = self.ROOT, 0, 0, 0
+
+        for i in range(n):
+            code = codes[i]
+            remainder += 1
+            last_internal = -1 # Internal node created this phase, still waiting for its suffix link
+            while remainder:
+                if active_length == 0:
+                    active_edge = i
+                nxt = self._child(active_node, codes[active_edge])
+                if nxt == -1:
+                    self._add_child(active_node, self._new_node(i, n))
+                    if last_internal != -1:
+                        link[last_internal] = active_node
+                        last_internal = -1
+                else:
+                    edge_length = end[nxt] - start[nxt]
+                    if active_length >= edge_length: # Skip/count down to the next node
+                        active_edge += edge_length
+                        active_length -= edge_length
+                        active_node = nxt
+                        continue
+                    if codes[start[nxt] + active_length] == code:
+                        # Already present: this phase is done (rule 3)
+                        if last_internal != -1 and active_node != self.ROOT:
+                            link[last_internal] = active_node
+                        active_length += 1
+                        break
+                    # Split the edge and hang a new leaf off the split point
+                    split = self._new_node(start[nxt], start[nxt] + active_length)
+                    self._replace_child(active_node, nxt, split)
+                    start[nxt] += active_length
+                    self._add_child(split, nxt)
+                    self._add_child(split, self._new_node(i, n))
+                    if last_internal != -1:
+                        link[last_internal] = split
+                    last_internal = split
+                remainder -= 1
+                if active_node == self.ROOT and active_length > 0:
+                    active_length -= 1
+                    active_edge = i - remainder + 1
+                elif active_node != self.ROOT:
+                    active_node = link[active_node]
 
-    def insert_suffix(self, suffix):
-        node = self.root
-        for char in suffix:
-            if char not in node.children:
-                node.children[char] = Node()
-            node = node.children[char]
-        node.is_terminal = True
+    # --- Queries ---
+    def _children(self, node):
+        if node == self.ROOT:
+            return list(self.root_children.values())
+        children = []
+        child = self.first_child[node]
+        while child != -1:
+            children.append(child)
+            child = self.next_sibling[child]
+        return children
+
+    def _locate(self, pattern):
+        """(node, string depth at the node's lower end) for the edge where pattern ends, or None."""
+        codes, start, end = self.codes, self.start, self.end
+        node, depth, i, m = self.ROOT, 0, 0, len(pattern)
+        while i < m:
+            node = self._child(node, ord(pattern[i]))
+            if node == -1:
+                return None
+            edge_start, edge_end = start[node], end[node]
+            j = edge_start
+            while j < edge_end and i < m:
+                if codes[j] != ord(pattern[i]):
+                    return None
+                i += 1
+                j += 1
+            depth += edge_end - edge_start
+        return node, depth
 
     def contains(self, substring):
-        node = self.root
-        for char in substring:
-            if char not in node.children:
-                return False
-            node = node.children[char]
-        return True
+        return self._locate(substring) is not None
+
+    def _leaf_starts(self, node, depth):
+        """Start positions (in codes) of every suffix below node."""
+        starts = []
+        stack = [(node, depth)]
+        while stack:
+            node, depth = stack.pop()
+            children = self._children(node)
+            if not children:
+                starts.append(self.end[node] - depth) # depth includes the whole leaf edge
+                continue
+            for child in children:
+                stack.append((child, depth + self.end[child] - self.start[child]))
+        return starts
+
+    def occurrences(self, pattern):
+        """
+        Every occurrence of pattern, in order: positions for a tree built from
+        one string, (text index, position) pairs for one built from a list.
+        """
+        if not pattern:
+            return []
+        located = self._locate(pattern)
+        if located is None:
+            return []
+        starts = sorted(self._leaf_starts(*located))
+        if not self.generalized:
+            return starts
+        result = []
+        for p in starts:
+            k = bisect_right(self.offsets, p) - 1
+            result.append((k, p - self.offsets[k]))
+        return result
+
+    def count(self, pattern):
+        return len(self.occurrences(pattern))
+
+    def _internal_nodes(self):
+        """Yields (node, string depth, parent) for every internal node, parents first."""
+        stack = [(self.ROOT, 0, -1)]
+        while stack:
+            node, depth, parent = stack.pop()
+            yield node, depth, parent
+            for child in self._children(node):
+                if self.first_child[child] != -1:
+                    stack.append((child, depth + self.end[child] - self.start[child], node))
+
+    def _label(self, node, depth):
+        # The path label of node is the `depth` symbols ending at its edge's end
+        end = self.end[node]
+        return ''.join(map(chr, self.codes[end - depth:end]))
+
+    def longest_repeated_substring(self):
+        """Longest substring occurring at least twice: the deepest internal node."""
+        best_node, best_depth = self.ROOT, 0
+        for node, depth, _ in self._internal_nodes():
+            if depth > best_depth:
+                best_node, best_depth = node, depth
+        return self._label(best_node, best_depth) if best_depth else ""
+
+    def longest_common_substring(self):
+        """
+        Longest substring shared by every text of a generalized tree: the
+        deepest internal node whose subtree has leaves from all of them.
+        """
+        if len(self.texts) == 1:
+            return self.texts[0] # One text shares all of itself with itself
+        full = (1 << len(self.texts)) - 1
+        nodes = list(self._internal_nodes())
+        mask = {}
+        depth_of = {}
+        for node, depth, _ in nodes:
+            depth_of[node] = depth
+        for node, depth, _ in reversed(nodes): # Children before parents
+            bits = 0
+            for child in self._children(node):
+                if self.first_child[child] == -1:
+                    suffix = self.start[child] - depth # Where the leaf's suffix starts
+                    bits |= 1 << (bisect_right(self.offsets, suffix) - 1)
+                else:
+                    bits |= mask[child]
+            mask[node] = bits
+        best_node, best_depth = self.ROOT, 0
+        for node, bits in mask.items():
+            if bits == full and depth_of[node] > best_depth:
+                best_node, best_depth = node, depth_of[node]
+        return self._label(best_node, best_depth) if best_depth else ""
+
+# --- Benchmark ---
+class _SuffixTrie:
+    # The original character-per-node trie of all suffixes, kept as the baseline
+    def __init__(self, text):
+        self.root = Node()
+        self.text = text + '$'
+        for i in range(len(self.text)):
+            node = self.root
+            for char in self.text[i:]:
+                if char not in node.children:
+                    node.children[char] = Node()
+                node = node.children[char]
+            node.is_terminal = True
+
+def _measure(build, text):
+    """(peak traced memory, build time); timed without tracemalloc, which slows allocation down."""
+    start = time.perf_counter()
+    build(text)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    tree = build(text)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del tree
+    return peak, elapsed
+
+def _random_text(size, seed=0):
+    import random
+    rng = random.Random(seed)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 8)))
+             for _ in range(2000)]
+    text = []
+    length = 0
+    while length < size:
+        word = rng.choice(words)
+        text.append(word)
+        length += len(word) + 1
+    return ' '.join(text)[:size]
+
+def run_benchmark(size=1_000_000):
+    print("Peak memory while building (tracemalloc) and build time:")
+    per_char_squared = 0
+    for n in (250, 500, 1000):
+        peak, elapsed = _measure(_SuffixTrie, _random_text(n))
+        per_char_squared = peak / n ** 2
+        print(f"  trie of suffixes, {n:>9,} chars: {peak / 2**20:9.1f} MB, {elapsed:6.2f} s")
+    print(f"  trie of suffixes, {size:>9,} chars: ~{per_char_squared * size ** 2 / 2**40:,.0f} TB (O(n^2) extrapolation)")
+    peak, elapsed = _measure(SuffixTree, _random_text(size))
+    print(f"  Ukkonen,          {size:>9,} chars: {peak / 2**20:9.1f} MB, {elapsed:6.2f} s")
+
+    tree = SuffixTree(_random_text(size))
+    start = time.perf_counter()
+    repeat = tree.longest_repeated_substring()
+    print(f"Longest repeated substring ({len(repeat)} chars) in {time.perf_counter() - start:.2f} s")
 
 if __name__ == "__main__":
     text = "banana"
@@ -39,4 +314,16 @@ if __name__ == "__main__":
     print(st.contains("ban"))
     print(st.contains("z"))
     print(st.contains("bana"))
-    print(st.contains("nana"))
\ No newline at end of file
+    print(st.contains("nana"))
+
+    print(f"'ana' occurs at {st.occurrences('ana')}, longest repeat: {st.longest_repeated_substring()!r}")
+    # Expected: [1, 3], 'ana'
+    gst = SuffixTree(["xabxac", "abcabxabcd", "babxba"])
+    print(f"'abx' occurs at {gst.occurrences('abx')}, common to all: {gst.longest_common_substring()!r}")
+    # Expected: [(0, 1), (1, 3), (2, 1)], 'abx'
+    print(f"One-text generalized tree: {SuffixTree(['banana']).occurrences('ana')}")
+    # Expected: [(0, 1), (0, 3)]
+
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        print()
+        run_benchmark()
@@ -1,17 +1,118 @@
-def bellman_ford(graph, num_vertices, start_node):
-    distances = {node: float('inf') for node in range(num_vertices)}
+from collections import deque
+import numpy as np
+
+def _predecessor_cycle(predecessors):
+    """
+    Returns the vertices of a cycle in the predecessor graph, in edge order,
+    or None. Any such cycle left by edge relaxation has negative total weight.
+    """
+    state = [0] * len(predecessors) # 0 = unvisited, 1 = on current walk, 2 = done
+    for start in range(len(predecessors)):
+        node = start
+        walk = []
+        while node != -1 and state[node] == 0:
+            state[node] = 1
+            walk.append(node)
+            node = predecessors[node]
+        if node != -1 and state[node] == 1:
+            cycle = walk[walk.index(node):]
+            return cycle[::-1] # Predecessor links point backwards along the edges
+        for visited in walk:
+            state[visited] = 2
+    return None
+
+def _bellman_ford_passes(graph, num_vertices, start_node):
+    distances = [float('inf')] * num_vertices
+    predecessors = [-1] * num_vertices
     distances[start_node] = 0
-    
-    for _ in range(num_vertices - 1):
+
+    for _ in range(num_vertices):
+        changed = False
         for u, v, weight in graph:
-            if distances[u] != float('inf') and distances[u] + weight < distances[v]:
+            # inf + weight is never < inf, so unreached vertices need no check
+            if distances[u] + weight < distances[v]:
                 distances[v] = distances[u] + weight
-    
+                predecessors[v] = u
+                changed = True
+        if not changed:
+            return distances, None # A quiet pass means every distance is final
+    # Still relaxing after num_vertices passes: a negative cycle is reachable
+    return None, _predecessor_cycle(predecessors)
+
+def _spfa(graph, num_vertices, start_node):
+    adjacency = [[] for _ in range(num_vertices)]
     for u, v, weight in graph:
-        if distances[u] != float('inf') and distances[u] + weight < distances[v]:
-            return None, "Negative cycle detected"
-            
-    return distances, "No negative cycle"
+        adjacency[u].append((v, weight))
+    distances = [float('inf')] * num_vertices
+    predecessors = [-1] * num_vertices
+    edges_used = [0] * num_vertices # Edges on the current best path to each vertex
+    in_queue = [False] * num_vertices
+    distances[start_node] = 0
+    queue = deque([start_node])
+    in_queue[start_node] = True
+
+    while queue:
+        u = queue.popleft()
+        in_queue[u] = False
+        for v, weight in adjacency[u]:
+            if distances[u] + weight < distances[v]:
+                distances[v] = distances[u] + weight
+                predecessors[v] = u
+                edges_used[v] = edges_used[u] + 1
+                if edges_used[v] >= num_vertices: # A simple path has at most V - 1 edges
+                    return None, _predecessor_cycle(predecessors)
+                if not in_queue[v]:
+                    queue.append(v)
+                    in_queue[v] = True
+    return distances, None
+
+def _bellman_ford_numpy(graph, num_vertices, start_node):
+    edges = np.asarray(graph, dtype=np.float64).reshape(-1, 3)
+    sources = edges[:, 0].astype(np.int64)
+    targets = edges[:, 1].astype(np.int64)
+    weights = edges[:, 2]
+    distances = np.full(num_vertices, np.inf)
+    predecessors = np.full(num_vertices, -1, dtype=np.int64)
+    distances[start_node] = 0.0
+
+    for _ in range(num_vertices):
+        candidate = distances[sources] + weights
+        best = np.full(num_vertices, np.inf)
+        np.minimum.at(best, targets, candidate)
+        improved = best < distances
+        if not improved.any():
+            return distances.tolist(), None
+        # Record one winning edge per improved vertex as its predecessor
+        winners = improved[targets] & (candidate == best[targets])
+        predecessors[targets[winners]] = sources[winners]
+        distances = np.where(improved, best, distances)
+    return None, _predecessor_cycle(predecessors.tolist())
+
+def bellman_ford(graph, num_vertices, start_node, mode="standard"):
+    """
+    Single-source shortest paths with negative edge weights.
+
+    Args:
+        graph (list): Edge list of (u, v, weight) with vertices 0..num_vertices-1.
+        num_vertices (int): Number of vertices.
+        start_node (int): Source vertex.
+        mode (str): "standard" runs edge-list passes and stops at the first pass
+                    that changes nothing. "spfa" only re-relaxes edges out of
+                    vertices whose distance just improved (a FIFO work queue),
+                    usually far fewer relaxations on sparse graphs. "numpy"
+                    relaxes every edge of a pass at once with array operations.
+
+    Returns:
+        tuple: (distances dict, "No negative cycle"), or (None, cycle) where
+               cycle lists the vertices of a reachable negative cycle in order.
+    """
+    solvers = {"standard": _bellman_ford_passes, "spfa": _spfa, "numpy": _bellman_ford_numpy}
+    if mode not in solvers:
+        raise ValueError(f"Unknown mode {mode!r}; expected one of {sorted(solvers)}.")
+    distances, cycle = solvers[mode](graph, num_vertices, start_node)
+    if distances is None:
+        return None, cycle
+    return {node: distances[node] for node in range(num_vertices)}, "No negative cycle"
 
 if __name__ == "__main__":
     num_vertices = 5
@@ -21,11 +122,12 @@ if __name__ == "__main__":
         (3, 2, 5), (3, 1, 1),
         (4, 3, -3)
     ]
-    
-    dist, msg = bellman_ford(edges, num_vertices, 0)
-    print(msg)
-    if dist:
-        print(dist)
+
+    for mode in ("standard", "spfa", "numpy"):
+        dist, msg = bellman_ford(edges, num_vertices, 0, mode=mode)
+        print(f"{mode}: {msg}")
+        if dist:
+            print(dist)
 
     num_vertices_cycle = 4
     edges_cycle = [
@@ -34,5 +136,6 @@ if __name__ == "__main__":
         (2, 3, -1),
         (3, 0, -1)
     ]
-    dist_cycle, msg_cycle = bellman_ford(edges_cycle, num_vertices_cycle, 0)
-    print(msg_cycle)
\ No newline at end of file
+    for mode in ("standard", "spfa", "numpy"):
+        dist_cycle, cycle = bellman_ford(edges_cycle, num_vertices_cycle, 0, mode=mode)
+        print(f"{mode}: Negative cycle detected: {cycle}")
@@ -1,84 +1,394 @@
 import hashlib
 import bisect
+import math
+import sys
 import time
 from collections import OrderedDict
+import numpy as np
+
+MASK64 = (1 << 64) - 1
+
+def _splitmix64(x):
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+def _splitmix64_np(x):
+    # Same mixer over a uint64 array; NumPy wraps modulo 2**64 like the masks above
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
 
 class ConsistentHasher:
-    def __init__(self, replicas=100):
+    def __init__(self, replicas=100, load_factor=None):
+        """
+        Consistent-hash ring stored as two parallel sorted arrays: 64-bit ring
+        positions (uint64) and the id of the node owning each position (int32).
+        Adding or removing a node splices its virtual points in place instead
+        of re-sorting the whole ring, and `get_nodes` routes a whole batch of
+        keys with one vectorized binary search.
+
+        Args:
+            replicas (int): Virtual points per node.
+            load_factor (float | None): Enables consistent hashing with bounded
+                loads (Mirrokni et al.). No node is assigned more than
+                ceil((1 + load_factor) * average) keys; a key whose ring owner is
+                full walks clockwise to the next node with room. Use `assign` /
+                `release` to track keys in this mode.
+        """
         self.replicas = replicas
-        self.ring = OrderedDict()
-        self.sorted_keys = []
+        self.positions = np.empty(0, dtype=np.uint64)
+        self.owners = np.empty(0, dtype=np.int32)
         self.nodes = set()
+        self.node_names = []   # node id -> name (None once removed)
+        self.node_ids = {}     # name -> node id
+        self.load_factor = load_factor
+        self.assignments = {}  # key -> node, for bounded-load mode
+        self.loads = {}        # node -> number of assigned keys
 
     def add_node(self, node):
         if node in self.nodes:
             return
         self.nodes.add(node)
-        for i in range(self.replicas):
-            key = self._hash(f"{node}:{i}")
-            self.ring[key] = node
-        self.sorted_keys = sorted(self.ring.keys())
+        node_id = len(self.node_names)
+        self.node_names.append(node)
+        self.node_ids[node] = node_id
+        self.loads[node] = 0
+        points = np.sort(np.array([self._hash(f"{node}:{i}") for i in range(self.replicas)], dtype=np.uint64))
+        slots = np.searchsorted(self.positions, points)
+        self.positions = np.insert(self.positions, slots, points)
+        self.owners = np.insert(self.owners, slots, np.int32(node_id))
 
     def remove_node(self, node):
         if node not in self.nodes:
             return
         self.nodes.remove(node)
-        for i in range(self.replicas):
-            key = self._hash(f"{node}:{i}")
-            del self.ring[key]
-        self.sorted_keys = sorted(self.ring.keys())
+        node_id = self.node_ids.pop(node)
+        self.node_names[node_id] = None
+        keep = self.owners != node_id
+        self.positions = self.positions[keep]
+        self.owners = self.owners[keep]
+        # Keys held by the removed node must be re-assigned on next use
+        orphaned = [key for key, owner in self.assignments.items() if owner == node]
+        for key in orphaned:
+            del self.assignments[key]
+        del self.loads[node]
+
+    def _slot(self, hash_key):
+        idx = bisect.bisect_left(self.positions, hash_key)
+        return 0 if idx == len(self.positions) else idx
 
     def get_node(self, key):
-        if not self.ring:
+        if not len(self.positions):
+            return None
+        if self.load_factor is not None and key in self.assignments:
+            return self.assignments[key]
+        return self.node_names[self.owners[self._slot(self._hash(key))]]
+
+    def get_replica_nodes(self, key, count):
+        """
+        The first `count` distinct nodes clockwise from `key`: its replica set,
+        primary first.
+        """
+        if self.load_factor is not None and key in self.assignments:
+            return [self.assignments[key]]
+        n = len(self.positions)
+        if not n:
+            return []
+        count = min(count, len(self.nodes))
+        slot = self._slot(self._hash(key))
+        replicas = []
+        while len(replicas) < count:
+            node = self.node_names[self.owners[slot]]
+            if node not in replicas:
+                replicas.append(node)
+            slot = slot + 1 if slot + 1 < n else 0
+        return replicas
+
+    def successors(self, node, count):
+        """
+        Nodes that follow any virtual point of `node` within `count` distinct
+        steps. These are the only nodes whose key ranges change when `node`
+        joins or leaves a ring with `count` replicas.
+        """
+        node_id = self.node_ids[node]
+        n = len(self.positions)
+        found = set()
+        for slot in np.flatnonzero(self.owners == node_id):
+            seen = []
+            step = 1
+            while len(seen) < count and step < n:
+                other = self.node_names[self.owners[(slot + step) % n]]
+                if other != node and other not in seen:
+                    seen.append(other)
+                step += 1
+            found.update(seen)
+        return found
+
+    def get_node_ids(self, keys):
+        """
+        Ring owner id of every key, as an int32 array, or None if the ring is
+        empty. Integer NumPy arrays are hashed without a Python loop; other
+        iterables are hashed key by key.
+        """
+        if not len(self.positions):
             return None
-        hash_key = self._hash(key)
-        idx = bisect.bisect_left(self.sorted_keys, hash_key)
-        if idx == len(self.sorted_keys):
-            idx = 0
-        return self.ring[self.sorted_keys[idx]]
+        if isinstance(keys, np.ndarray) and keys.dtype.kind in 'iu':
+            hashes = _splitmix64_np(keys.astype(np.uint64, copy=False))
+        else:
+            hashes = np.fromiter((self._hash(k) for k in keys), dtype=np.uint64)
+        idx = np.searchsorted(self.positions, hashes, side='left')
+        idx[idx == len(self.positions)] = 0
+        return self.owners[idx]
+
+    def get_nodes(self, keys):
+        """
+        Batch version of `get_node`: returns the node name of every key, or
+        None if the ring is empty.
+        """
+        node_ids = self.get_node_ids(keys)
+        if node_ids is None:
+            return None
+        names = np.array(self.node_names, dtype=object)
+        return names[node_ids]
+
+    # --- Bounded-load mode ---
+    def _capacity(self):
+        total = sum(self.loads.values()) + 1
+        return math.ceil((1 + self.load_factor) * total / len(self.nodes))
+
+    def assign(self, key):
+        """
+        Returns the node for `key`, recording the assignment. Repeated calls
+        return the same node until the key is released.
+        """
+        if self.load_factor is None:
+            return self.get_node(key)
+        if key in self.assignments:
+            return self.assignments[key]
+        if not len(self.positions):
+            return None
+        capacity = self._capacity()
+        start = self._slot(self._hash(key))
+        n = len(self.positions)
+        for step in range(n):
+            node = self.node_names[self.owners[(start + step) % n]]
+            if self.loads[node] < capacity:
+                break
+        self.assignments[key] = node
+        self.loads[node] += 1
+        return node
+
+    def release(self, key):
+        node = self.assignments.pop(key, None)
+        if node is not None and node in self.loads:
+            self.loads[node] -= 1
 
     def _hash(self, key):
-        return int(hashlib.md5(key.encode()).hexdigest(), 16)
+        if isinstance(key, (int, np.integer)):
+            # Same mixer as the vectorized integer path in get_node_ids
+            return _splitmix64(int(key) & MASK64)
+        return int.from_bytes(hashlib.blake2b(str(key).encode(), digest_size=8).digest(), 'big')
 
 class CacheNode:
     def __init__(self, name, capacity):
         self.name = name
         self.capacity = capacity
         self.cache = OrderedDict()
+        self.reads = 0 # Requests served, used to pick the least-loaded replica
 
     def set(self, key, value):
+        """
+        Stores `key` and returns the key evicted to make room, if any.
+        """
+        evicted = None
         if key in self.cache:
             self.cache.pop(key)
         elif len(self.cache) >= self.capacity:
-            self.cache.popitem(last=False)
+            evicted, _ = self.cache.popitem(last=False)
         self.cache[key] = value
+        return evicted
 
     def get(self, key):
+        self.reads += 1
         if key in self.cache:
             value = self.cache.pop(key)
             self.cache[key] = value
             return value
         return None
 
+    def delete(self, key):
+        self.cache.pop(key, None)
+
 class DistributedCacheClient:
-    def __init__(self, nodes, capacity):
+    def __init__(self, nodes, capacity, load_factor=None, replication_factor=1):
+        """
+        Args:
+            load_factor (float | None): If set, keys are placed with bounded
+                loads so a hot region of the ring cannot overload one node.
+            replication_factor (int): Every key is written to this many
+                distinct nodes and read from the least-loaded of them.
+        """
+        if load_factor is not None and replication_factor > 1:
+            raise ValueError("Bounded loads and replication cannot be combined.")
+        self.capacity = capacity
+        self.replication_factor = replication_factor
         self.nodes = {node: CacheNode(node, capacity) for node in nodes}
-        self.hasher = ConsistentHasher()
+        self.hasher = ConsistentHasher(load_factor=load_factor)
         for node in nodes:
             self.hasher.add_node(node)
+        self.migrating_from = {} # name -> CacheNode whose keys are still being moved
+        self._rebalance = None   # Generator performing the pending migration
+
+    def _replicas(self, key, assign=False):
+        # Only writes record a bounded-load assignment; reads must not take capacity
+        if self.replication_factor == 1:
+            node = self.hasher.assign(key) if assign else self.hasher.get_node(key)
+            return [node] if node else []
+        return self.hasher.get_replica_nodes(key, self.replication_factor)
 
     def set(self, key, value):
-        node_name = self.hasher.get_node(key)
-        if node_name:
-            self.nodes[node_name].set(key, value)
-        
+        owners = self._replicas(key, assign=True)
+        for node_name in owners:
+            evicted = self.nodes[node_name].set(key, value)
+            if evicted is not None:
+                self.hasher.release(evicted)
+        # A copy waiting to be migrated off a non-owner is now stale
+        for name, source in self.migrating_from.items():
+            if name not in owners:
+                source.delete(key)
+
     def get(self, key):
-        node_name = self.hasher.get_node(key)
-        if node_name:
-            return self.nodes[node_name].get(key)
+        replicas = [self.nodes[name] for name in self._replicas(key)]
+        for node in sorted(replicas, key=lambda n: n.reads):
+            value = node.get(key)
+            if value is not None:
+                return value
+        # Mid-rebalance the key may not have reached its new owner yet
+        for source in self.migrating_from.values():
+            value = source.cache.get(key)
+            if value is not None:
+                return value
         return None
 
+    # --- Online rebalancing ---
+    def add_node(self, name, capacity=None):
+        """
+        Adds a node and schedules migration of the keys it now owns. Call
+        `rebalance_step` between requests (or `rebalance` to finish at once);
+        reads fall back to the previous owners until the move completes.
+        """
+        self.rebalance() # Finish any earlier migration first
+        self.nodes[name] = CacheNode(name, capacity or self.capacity)
+        self.hasher.add_node(name)
+        if self.hasher.load_factor is not None:
+            return # Keys keep their recorded assignment, nothing to move
+        affected = [self.nodes[n] for n in self.hasher.successors(name, self.replication_factor)]
+        for source in affected:
+            self.migrating_from[source.name] = source
+        self._rebalance = self._migrate(affected)
+
+    def remove_node(self, name):
+        """
+        Takes a node out of the ring and schedules migration of its keys to
+        their new owners. Its data stays readable until the migration is done.
+        """
+        self.rebalance()
+        source = self.nodes.pop(name)
+        self.hasher.remove_node(name)
+        self.migrating_from[name] = source
+        self._rebalance = self._migrate([source], retire=name)
+
+    def _migrate(self, sources, batch_size=256, retire=None):
+        """
+        Moves keys of `sources` (already listed in `migrating_from`) to their
+        current replica sets, one batch per `next()`.
+        """
+        for source in sources:
+            keys = list(source.cache.keys())
+            for start in range(0, len(keys), batch_size):
+                for key in keys[start:start + batch_size]:
+                    value = source.cache.get(key)
+                    if value is None:
+                        continue # Evicted or overwritten since the snapshot
+                    owners = self._replicas(key, assign=True)
+                    for owner in owners:
+                        target = self.nodes[owner]
+                        if owner != source.name and key not in target.cache:
+                            evicted = target.set(key, value)
+                            if evicted is not None:
+                                self.hasher.release(evicted)
+                    if source.name not in owners:
+                        source.delete(key)
+                yield
+            if retire is None:
+                del self.migrating_from[source.name]
+        if retire is not None:
+            del self.migrating_from[retire]
+
+    def rebalance_step(self):
+        """
+        Moves one batch of keys. Returns False once no migration is pending.
+        """
+        if self._rebalance is None:
+            return False
+        try:
+            next(self._rebalance)
+            return True
+        except StopIteration:
+            self._rebalance = None
+            return False
+
+    def rebalance(self):
+        while self.rebalance_step():
+            pass
+
+def run_benchmark(num_keys=10_000_000, num_nodes=64):
+    hasher = ConsistentHasher(replicas=100)
+    start = time.perf_counter()
+    for i in range(num_nodes):
+        hasher.add_node(f"node{i}")
+    build = time.perf_counter() - start
+    print(f"Ring: {num_nodes} nodes x 100 replicas = {len(hasher.positions)} points, "
+          f"{hasher.positions.nbytes + hasher.owners.nbytes} bytes, built incrementally in {build * 1000:.1f} ms")
+
+    keys = np.arange(num_keys, dtype=np.int64)
+    start = time.perf_counter()
+    node_ids = hasher.get_node_ids(keys)
+    elapsed = time.perf_counter() - start
+    counts = np.bincount(node_ids, minlength=num_nodes)
+    print(f"get_node_ids, {num_keys:,} integer keys: {elapsed:.2f} s ({num_keys / elapsed:,.0f} keys/s), "
+          f"per-node load min/max {counts.min()}/{counts.max()}")
+
+    string_keys = [f"user:{i}" for i in range(1_000_000)]
+    start = time.perf_counter()
+    hasher.get_nodes(string_keys)
+    elapsed = time.perf_counter() - start
+    print(f"get_nodes, {len(string_keys):,} string keys:   {elapsed:.2f} s ({len(string_keys) / elapsed:,.0f} keys/s)")
+
+    sample = string_keys[:200_000]
+    start = time.perf_counter()
+    for key in sample:
+        hasher.get_node(key)
+    elapsed = time.perf_counter() - start
+    print(f"get_node loop, {len(sample):,} string keys: {elapsed:.2f} s ({len(sample) / elapsed:,.0f} keys/s)")
+
+    bounded = ConsistentHasher(replicas=100, load_factor=0.25)
+    for i in range(num_nodes):
+        bounded.add_node(f"node{i}")
+    for key in string_keys[:200_000]:
+        bounded.assign(key)
+    loads = list(bounded.loads.values())
+    print(f"Bounded loads (eps=0.25), 200,000 keys: per-node load min/max {min(loads)}/{max(loads)} "
+          f"(cap {bounded._capacity()})")
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        run_benchmark()
+        sys.exit(0)
+
     nodes = ["node1", "node2", "node3"]
     client = DistributedCacheClient(nodes, capacity=2)
     
@@ -96,16 +406,51 @@ if __name__ == "__main__":
     print(f"Getting key_8: {client.get('key_8')}")
     
     print("\nAdding a new node:")
-    client.hasher.add_node("node4")
-    client.nodes["node4"] = CacheNode("node4", 2)
+    client.add_node("node4")
+    client.rebalance()
     client.set("key_10", "value_10")
     
     for name, node in client.nodes.items():
         print(f"Node {name}: {list(node.cache.keys())}")
     
     print("\nRemoving node2:")
-    del client.nodes["node2"]
-    client.hasher.remove_node("node2")
+    client.remove_node("node2")
+    client.rebalance()
     
     for name, node in client.nodes.items():
-        print(f"Node {name}: {list(node.cache.keys())}")
\ No newline at end of file
+        print(f"Node {name}: {list(node.cache.keys())}")
+
+    print("\n--- Hit rate during scale-out (2000 keys, 3 -> 4 nodes) ---")
+    all_keys = [f"item_{i}" for i in range(2000)]
+
+    def hit_rate(c):
+        return sum(c.get(k) is not None for k in all_keys) / len(all_keys)
+
+    cold = DistributedCacheClient(nodes, capacity=2000)
+    for k in all_keys:
+        cold.set(k, k)
+    cold.hasher.add_node("node4") # Old behaviour: ring changes, data stays put
+    cold.nodes["node4"] = CacheNode("node4", 2000)
+    print(f"Without rebalancing:          {hit_rate(cold):.1%}")
+
+    warm = DistributedCacheClient(nodes, capacity=2000)
+    for k in all_keys:
+        warm.set(k, k)
+    warm.add_node("node4")
+    warm.rebalance_step() # Only one batch moved so far
+    print(f"Mid-rebalance (fallback reads): {hit_rate(warm):.1%}")
+    warm.rebalance()
+    print(f"After rebalance:              {hit_rate(warm):.1%}, "
+          f"keys on node4: {len(warm.nodes['node4'].cache)}")
+
+    print("\n--- Replication factor 2 ---")
+    replicated = DistributedCacheClient(nodes, capacity=2000, replication_factor=2)
+    for k in all_keys:
+        replicated.set(k, k)
+    for k in all_keys * 3:
+        replicated.get(k)
+    print("Reads served per node:", {name: node.reads for name, node in replicated.nodes.items()})
+    replicated.remove_node("node1")
+    replicated.rebalance()
+    print(f"Hit rate after losing node1: {hit_rate(replicated):.1%}, "
+          f"copies per key: {sum(len(n.cache) for n in replicated.nodes.values()) / len(all_keys):.2f}")
\ No newline at end of file
@@ -1,5 +1,10 @@
 import random
 import math
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+import numpy as np
 
 class City:
     def __init__(self, x, y):
@@ -23,23 +28,24 @@ def calculate_fitness(individual, cities):
         city1_idx = individual[i]
         city2_idx = individual[(i + 1) % len(individual)]
         total_distance += distance(cities[city1_idx], cities[city2_idx])
-    
+
     return 1 / total_distance
 
 def ordered_crossover(parent1, parent2):
     size = len(parent1)
     child = [-1] * size
     start, end = sorted(random.sample(range(size), 2))
-    
+
     child[start:end] = parent1[start:end]
-    
+    taken = set(child[start:end]) # Set lookup instead of scanning the child for every gene
+
     fill_pos = 0
     for gene in parent2:
-        if gene not in child:
+        if gene not in taken:
             while child[fill_pos] != -1:
                 fill_pos += 1
             child[fill_pos] = gene
-            
+
     return child
 
 def swap_mutation(individual):
@@ -47,43 +53,403 @@ def swap_mutation(individual):
     individual[idx1], individual[idx2] = individual[idx2], individual[idx1]
     return individual
 
+# --- Vectorized tour evaluation ---
+MATRIX_LIMIT = 5000 # Above this the n x n matrix (8 n^2 bytes) is skipped for coordinate gathers
+
+def city_coordinates(cities):
+    """(n, 2) float array of the x, y positions of a list of City objects."""
+    return np.array([(city.x, city.y) for city in cities], dtype=np.float64)
+
+def distance_matrix(coords):
+    """All pairwise Euclidean distances, computed once."""
+    diff = coords[:, None, :] - coords[None, :, :]
+    return np.sqrt((diff ** 2).sum(axis=2))
+
+class TourEvaluator:
+    def __init__(self, coords):
+        """
+        Scores whole populations of tours at once.
+
+        With a precomputed distance matrix a population's lengths are one fancy
+        index D[pop, next_city] and a row sum. Past MATRIX_LIMIT cities the
+        matrix would not fit comfortably in memory, so the leg lengths are
+        gathered from the coordinates instead, still without a Python loop.
+        """
+        self.coords = np.asarray(coords, dtype=np.float64)
+        self.matrix = distance_matrix(self.coords) if len(self.coords) <= MATRIX_LIMIT else None
+
+    def lengths(self, population):
+        """Tour length of every row of an (individuals, n) array of city indices."""
+        population = np.asarray(population)
+        following = np.roll(population, -1, axis=1)
+        if self.matrix is not None:
+            return self.matrix[population, following].sum(axis=1)
+        legs = self.coords[following] - self.coords[population]
+        return np.hypot(legs[..., 0], legs[..., 1]).sum(axis=1)
+
+    def length(self, tour):
+        return float(self.lengths(np.asarray(tour)[None, :])[0])
+
 def genetic_algorithm(cities, pop_size, generations):
+    """
+    Same contract as before (prints progress, returns the best individual),
+    but the population's fitness is computed in one vectorized call.
+    """
+    evaluator = TourEvaluator(city_coordinates(cities))
     population = [create_individual(cities) for _ in range(pop_size)]
-    
+
     for gen in range(generations):
-        fitness_scores = [(calculate_fitness(ind, cities), ind) for ind in population]
-        fitness_scores.sort(key=lambda x: x[0], reverse=True)
-        
+        fitness = 1 / evaluator.lengths(population)
+        order = np.argsort(-fitness, kind="stable")
+        fitness_scores = [(fitness[i], population[i]) for i in order]
+
         best_fitness, best_individual = fitness_scores[0]
-        
+
         if gen % 100 == 0:
             print(f"Generation {gen}, Best distance: {1 / best_fitness}")
-        
+
         new_population = [best_individual]
-        
+
         while len(new_population) < pop_size:
             parent1 = random.choice(fitness_scores)[1]
             parent2 = random.choice(fitness_scores)[1]
-            
+
             if random.random() < 0.8:
                 child = ordered_crossover(parent1, parent2)
             else:
-                child = parent1
-            
+                child = parent1[:]
+
             if random.random() < 0.05:
                 child = swap_mutation(child)
-            
+
             new_population.append(child)
-            
+
         population = new_population
-        
+
     return best_individual
 
+# --- Construction and local search ---
+def nearest_neighbour_tour(coords, start=0):
+    """Greedy tour: always travel to the closest unvisited city. O(n^2) in NumPy."""
+    n = len(coords)
+    visited = np.zeros(n, dtype=bool)
+    tour = [start]
+    visited[start] = True
+    current = start
+    for _ in range(n - 1):
+        d = np.hypot(coords[:, 0] - coords[current, 0], coords[:, 1] - coords[current, 1])
+        d[visited] = np.inf
+        current = int(d.argmin())
+        visited[current] = True
+        tour.append(current)
+    return tour
+
+def neighbour_lists(coords, k=8, chunk=512):
+    """The k nearest cities of every city, closest first (rows computed in chunks)."""
+    n = len(coords)
+    k = min(k, n - 1)
+    neighbours = []
+    for lo in range(0, n, chunk):
+        block = coords[lo:lo + chunk]
+        d = ((block[:, None, :] - coords[None, :, :]) ** 2).sum(axis=2)
+        d[np.arange(len(block)), np.arange(lo, lo + len(block))] = np.inf
+        nearest = np.argpartition(d, k - 1, axis=1)[:, :k]
+        rows = np.arange(len(block))[:, None]
+        nearest = np.take_along_axis(nearest, d[rows, nearest].argsort(axis=1), axis=1)
+        neighbours.extend(nearest.tolist())
+    return neighbours
+
+def local_search(tour, coords, neighbours=None, max_segment=3, dirty=None):
+    """
+    2-opt and Or-opt until no improving move is left.
+
+    Moves are only tried towards each city's nearest neighbours, and a queue
+    of "dirty" cities (don't-look bits) means a city is re-examined only after
+    one of its tour edges changed. That keeps a pass close to O(n) instead of
+    the O(n^2) of scanning every pair of edges.
+
+    Args:
+        tour (list): Permutation of 0..n-1; not modified.
+        coords: (n, 2) array of city positions.
+        neighbours (list): Candidate lists from `neighbour_lists`; built if None.
+        max_segment (int): Longest chain of cities Or-opt relocates.
+        dirty (iterable): Cities to start from; defaults to all of them. After
+                          a small perturbation only its endpoints need a look.
+
+    Returns:
+        list: The improved tour.
+    """
+    n = len(tour)
+    if n < 5:
+        return list(tour)
+    if neighbours is None:
+        neighbours = neighbour_lists(coords)
+    xs, ys = coords[:, 0].tolist(), coords[:, 1].tolist()
+    hypot = math.hypot
+    tour = list(tour)
+    pos = [0] * n
+    for i, city in enumerate(tour):
+        pos[city] = i
+
+    def dist(a, b):
+        return hypot(xs[a] - xs[b], ys[a] - ys[b])
+
+    def reverse(i, j):
+        # Reverse the cyclic stretch tour[i..j]; flip the complement when that is shorter
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+        for _ in range(length // 2):
+            a, b = tour[i], tour[j]
+            tour[i], tour[j] = b, a
+            pos[b], pos[a] = i, j
+            i = (i + 1) % n
+            j = (j - 1) % n
+
+    def two_opt(a):
+        for forward in (True, False):
+            b = tour[(pos[a] + 1) % n] if forward else tour[pos[a] - 1]
+            d_ab = dist(a, b)
+            for c in neighbours[a]:
+                d_ac = dist(a, c)
+                if d_ac >= d_ab:
+                    break # Neighbours are sorted, so no later c can gain either
+                d = tour[(pos[c] + 1) % n] if forward else tour[pos[c] - 1]
+                if c == b or d == a:
+                    continue
+                if d_ac + dist(b, d) < d_ab + dist(c, d) - 1e-10:
+                    if forward:
+                        reverse(pos[b], pos[c])
+                    else:
+                        reverse(pos[c], pos[b])
+                    return (a, b, c, d)
+        return None
+
+    def or_opt(a):
+        for length in range(1, max_segment + 1):
+            i = pos[a]
+            segment = [tour[(i + s) % n] for s in range(length)]
+            first, last = segment[0], segment[-1]
+            prev, nxt = tour[i - 1], tour[(i + length) % n]
+            if nxt == prev or nxt in segment:
+                return None
+            removal = dist(prev, first) + dist(last, nxt) - dist(prev, nxt)
+            inside = set(segment)
+            for end in (first, last):
+                for c in neighbours[end]:
+                    if c in inside:
+                        continue
+                    for e in (tour[(pos[c] + 1) % n], tour[pos[c] - 1]):
+                        if e in inside:
+                            continue
+                        u, v = (c, e) if tour[(pos[c] + 1) % n] == e else (e, c)
+                        base = dist(u, v)
+                        forward_cost = dist(u, first) + dist(last, v) - base
+                        backward_cost = dist(u, last) + dist(first, v) - base
+                        if min(forward_cost, backward_cost) < removal - 1e-10:
+                            _relocate(segment, u, forward_cost <= backward_cost)
+                            return (prev, nxt, u, v, first, last)
+        return None
+
+    def _relocate(segment, u, keep_order):
+        # Cut the segment out and splice it back in right after u
+        inside = set(segment)
+        rest = [city for city in tour if city not in inside]
+        at = rest.index(u) + 1
+        tour[:] = rest[:at] + (segment if keep_order else segment[::-1]) + rest[at:]
+        for i, city in enumerate(tour):
+            pos[city] = i
+
+    queue = deque(tour if dirty is None else set(dirty))
+    queued = [dirty is None] * n
+    for city in queue:
+        queued[city] = True
+    while queue:
+        a = queue.popleft()
+        queued[a] = False
+        touched = two_opt(a) or or_opt(a)
+        if touched:
+            for city in touched:
+                if not queued[city]:
+                    queued[city] = True
+                    queue.append(city)
+            if not queued[a]:
+                queued[a] = True
+                queue.append(a)
+    return tour
+
+# --- Island-model evolution ---
+_worker_state = None
+
+def _init_worker(coords):
+    # Each worker process builds its evaluator (and distance matrix) and neighbour lists once
+    global _worker_state
+    _worker_state = (TourEvaluator(coords), neighbour_lists(coords))
+
+def _ox_children(parents_a, parents_b, rng):
+    """Ordered crossover for a batch of parent pairs, one NumPy pass per child."""
+    count, n = parents_a.shape
+    children = np.empty_like(parents_a)
+    taken = np.zeros(n, dtype=bool)
+    for row in range(count):
+        start, end = np.sort(rng.choice(n, 2, replace=False))
+        p1, p2 = parents_a[row], parents_b[row]
+        taken[:] = False
+        taken[p1[start:end]] = True
+        rest = p2[~taken[p2]]
+        children[row, :start] = rest[:start]
+        children[row, start:end] = p1[start:end]
+        children[row, end:] = rest[start:]
+    return children
+
+def _double_bridge(tour, rng):
+    """
+    Classic 4-opt kick: A B C D -> A C B D. Returns the new tour and the
+    cities at the ends of the four changed edges; tours of fewer than four
+    cities have no such kick and come back unchanged, with no ends.
+    """
+    if len(tour) < 4:
+        return tour.copy(), []
+    a, b, c = np.sort(rng.choice(np.arange(1, len(tour)), 3, replace=False))
+    ends = tour[[0, a - 1, a, b - 1, b, c - 1, c, -1]].tolist()
+    return np.concatenate([tour[:a], tour[b:c], tour[a:b], tour[c:]]), ends
+
+def _evolve_island(args):
+    """
+    Runs one island for a number of generations and returns its population.
+    Besides crossover children, every generation adds `kicks` memetic children:
+    a double-bridge kick of a tournament winner repaired by a local search
+    that only starts from the eight cities the kick touched.
+    """
+    population, generations, seed, mutation_rate, kicks = args
+    evaluator, neighbours = _worker_state
+    rng = np.random.default_rng(seed)
+    size, n = population.shape
+    elite = max(1, size // 10)
+    for _ in range(generations):
+        lengths = evaluator.lengths(population)
+        order = np.argsort(lengths)
+        population, lengths = population[order], lengths[order]
+        # Binary tournaments, drawn for all children at once
+        picks = rng.integers(0, size, (2, size - elite, 2))
+        winners = np.where(lengths[picks[..., 0]] <= lengths[picks[..., 1]], picks[..., 0], picks[..., 1])
+        children = _ox_children(population[winners[0]], population[winners[1]], rng)
+        coords = evaluator.coords
+        memetic = min(kicks, len(children)) if n >= 4 else 0 # Too few cities for a double bridge
+        for row in range(memetic):
+            kicked, ends = _double_bridge(population[winners[0, row]], rng)
+            children[row] = local_search(kicked.tolist(), coords, neighbours, dirty=ends)
+        # Mutation reverses a random stretch (a 2-opt move), which suits tours better than swaps
+        for row in memetic + np.flatnonzero(rng.random(len(children) - memetic) < mutation_rate):
+            i, j = np.sort(rng.choice(n, 2, replace=False))
+            children[row, i:j + 1] = children[row, i:j + 1][::-1]
+        population = np.vstack([population[:elite], children])
+    return population
+
+def island_model(coords, initial_tour=None, islands=4, pop_size=40, generations=200,
+                 migration_interval=20, mutation_rate=0.3, kicks=2, processes=None, seed=0):
+    """
+    Genetic algorithm over several independent populations ("islands") run in
+    a multiprocessing pool. Every migration_interval generations each island's
+    best tour replaces the worst tour of the next island in a ring, so good
+    building blocks spread while the islands keep their diversity.
+
+    Args:
+        coords: (n, 2) array of city positions.
+        initial_tour (list): Optional start tour (e.g. a local-search result);
+                             islands are seeded with double-bridge kicks of it.
+                             Random permutations are used otherwise.
+        kicks (int): Memetic (kick + local search) children per island and generation.
+        processes (int): Pool size; defaults to one process per island.
+
+    Returns:
+        tuple: (best_tour as a list, its length)
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    n = len(coords)
+    rng = np.random.default_rng(seed)
+    populations = []
+    for _ in range(islands):
+        if initial_tour is None:
+            population = np.array([rng.permutation(n) for _ in range(pop_size)])
+        else:
+            base = np.asarray(initial_tour)
+            population = np.array([base] + [_double_bridge(base, rng)[0] for _ in range(pop_size - 1)])
+        populations.append(population)
+
+    evaluator = TourEvaluator(coords)
+    with Pool(processes or islands, initializer=_init_worker, initargs=(coords,)) as pool:
+        done = 0
+        while done < generations:
+            step = min(migration_interval, generations - done)
+            jobs = [(population, step, int(rng.integers(2**32)), mutation_rate, kicks)
+                    for population in populations]
+            populations = pool.map(_evolve_island, jobs)
+            done += step
+            # Ring migration: best of island i replaces the worst of island i + 1
+            bests = [population[evaluator.lengths(population).argmin()].copy() for population in populations]
+            for i, population in enumerate(populations):
+                population[evaluator.lengths(population).argmax()] = bests[i - 1]
+
+    candidates = np.vstack(populations)
+    lengths = evaluator.lengths(candidates)
+    best = int(lengths.argmin())
+    return candidates[best].tolist(), float(lengths[best])
+
+# --- Benchmark ---
+def run_benchmark(sizes=(1000, 2000, 5000, 10000), ga_generations=100):
+    rng = np.random.default_rng(42)
+    for n in sizes:
+        coords = rng.uniform(0, 100, (n, 2))
+        print(f"{n:,} cities:")
+        start = time.perf_counter()
+        evaluator = TourEvaluator(coords)
+        print(f"  evaluator setup      {time.perf_counter() - start:7.2f} s "
+              f"({'distance matrix' if evaluator.matrix is not None else 'coordinate gathers'})")
+
+        population = np.array([rng.permutation(n) for _ in range(100)])
+        start = time.perf_counter()
+        evaluator.lengths(population)
+        vectorized = time.perf_counter() - start
+        cities = [City(x, y) for x, y in coords.tolist()]
+        start = time.perf_counter()
+        for individual in population[:10].tolist():
+            calculate_fitness(individual, cities)
+        per_call = (time.perf_counter() - start) / 10
+        print(f"  fitness of 100 tours {vectorized:7.3f} s vectorized vs {per_call * 100:.3f} s with calculate_fitness")
+
+        start = time.perf_counter()
+        tour = nearest_neighbour_tour(coords)
+        elapsed = time.perf_counter() - start
+        print(f"  nearest neighbour    {elapsed:7.2f} s, length {evaluator.length(tour):10.1f}")
+        start = time.perf_counter()
+        neighbours = neighbour_lists(coords)
+        tour = local_search(tour, coords, neighbours)
+        elapsed += time.perf_counter() - start
+        print(f"  + 2-opt / Or-opt     {elapsed:7.2f} s, length {evaluator.length(tour):10.1f}")
+        start = time.perf_counter()
+        evolved, _ = island_model(coords, tour, generations=ga_generations)
+        evolved = local_search(evolved, coords, neighbours)
+        elapsed += time.perf_counter() - start
+        print(f"  + island GA ({ga_generations} gen) {elapsed:7.2f} s, length {evaluator.length(evolved):10.1f}")
+        # Random uniform instances: optimal tour ~ 0.7124 * sqrt(n * area)
+        print(f"  (asymptotic optimum  ~{0.7124 * math.sqrt(n * 100 * 100):.1f})")
+
 if __name__ == "__main__":
     num_cities = 20
     cities_list = generate_cities(num_cities)
-    
+
     solution = genetic_algorithm(cities_list, pop_size=100, generations=1000)
-    
+
     print("\nFinal best route (city indices):")
-    print(solution)
\ No newline at end of file
+    print(solution)
+
+    coords = city_coordinates(cities_list)
+    evaluator = TourEvaluator(coords)
+    improved = local_search(solution, coords)
+    print(f"After 2-opt / Or-opt: {evaluator.length(solution):.2f} -> {evaluator.length(improved):.2f}")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        print()
+        run_benchmark()
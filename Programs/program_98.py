@@ -1,27 +1,281 @@
+import mmap
+import struct
+import sys
+import time
+import numpy as np
+
+HEADER = struct.Struct('<4sQQQQ') # magic, length in symbols, bytes per symbol, SA item size, has LCP
+PACKED_KEY_LIMIT = 3_000_000_000 # Longest text whose rank pairs still pack into one int64 (n^2 + 2n < 2^63)
+
+# --- Construction ---
+def _symbols(text):
+    """
+    (codes, width) for str or bytes-like text. str is stored as big-endian
+    UTF-32 so that comparing encoded bytes orders suffixes by code point.
+    """
+    if isinstance(text, str):
+        return text.encode('utf-32-be'), 4
+    return bytes(text), 1
+
+def suffix_array(text) -> np.ndarray:
+    """
+    Suffix array by prefix doubling over integer ranks, O(n log n).
+
+    Round k sorts suffixes by the pair (rank of the first k symbols, rank of
+    the next k), packed into one int64 key, so each round is a single NumPy
+    argsort and no suffix is ever materialized. Texts of PACKED_KEY_LIMIT
+    symbols or more would overflow that key and are sorted on the pair with
+    np.lexsort instead. It stops as soon as every rank is distinct, which for
+    ordinary text takes only a few rounds.
+
+    Building holds about seven int64 arrays of length n at once (ranks, keys,
+    the sort order and temporaries), so budget roughly 56 bytes per symbol;
+    the finished index keeps only the 8-byte-per-symbol suffix array.
+
+    Args:
+        text (str | bytes): The text to index.
+
+    Returns:
+        np.ndarray: int64 start positions of the suffixes in sorted order.
+    """
+    data, width = _symbols(text)
+    n = len(data) // width
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    codes = np.frombuffer(data, dtype='>u4' if width == 4 else np.uint8)
+    # Dense initial ranks 1..sigma; 0 is reserved for "past the end"
+    rank = np.unique(codes, return_inverse=True)[1].astype(np.int64) + 1
+    k = 1
+    while True:
+        second = np.zeros(n, dtype=np.int64)
+        second[:n - k] = rank[k:]
+        if n < PACKED_KEY_LIMIT:
+            key = rank * (n + 1) + second
+            order = np.argsort(key) # Equal keys have equal ranks, so their order does not matter
+            sorted_key = key[order]
+            changed = sorted_key[1:] != sorted_key[:-1]
+        else:
+            order = np.lexsort((second, rank))
+            first_sorted, second_sorted = rank[order], second[order]
+            changed = (first_sorted[1:] != first_sorted[:-1]) | (second_sorted[1:] != second_sorted[:-1])
+        new_rank = np.empty(n, dtype=np.int64)
+        new_rank[order] = np.concatenate(([1], np.cumsum(changed) + 1))
+        rank = new_rank
+        if rank.max() == n or k >= n:
+            return order.astype(np.int64)
+        k *= 2
+
+def lcp_array(text, sa) -> np.ndarray:
+    """
+    Kasai's algorithm: lcp[i] is the length of the longest common prefix of
+    the suffixes at sa[i - 1] and sa[i] (lcp[0] = 0). O(n), because the
+    common prefix shrinks by at most one when moving from suffix i to i + 1.
+    """
+    n = len(sa)
+    rank = np.empty(n, dtype=np.int64)
+    rank[sa] = np.arange(n)
+    rank = rank.tolist()
+    sa_list = sa.tolist() if isinstance(sa, np.ndarray) else list(sa)
+    lcp = [0] * n
+    h = 0
+    for i in range(n):
+        r = rank[i]
+        if r == 0:
+            h = 0
+            continue
+        j = sa_list[r - 1]
+        while i + h < n and j + h < n and text[i + h] == text[j + h]:
+            h += 1
+        lcp[r] = h
+        if h:
+            h -= 1
+    return np.array(lcp, dtype=np.int64)
+
 def build_suffix_array(text):
-    n = len(text)
-    suffixes = [(text[i:], i) for i in range(n)]
-    suffixes.sort(key=lambda item: item[0])
-    suffix_array = [suffix[1] for suffix in suffixes]
-    return suffix_array
+    """Same contract as before (a list of start positions), built by prefix doubling."""
+    return suffix_array(text).tolist()
+
+# --- Index ---
+class SuffixArrayIndex:
+    MAGIC = b'SAX1'
+
+    def __init__(self, data, width, sa, lcp=None):
+        """
+        Searchable suffix array over str or bytes text.
+
+        `data` holds the text as bytes (or an mmap of them), `width` bytes per
+        symbol; `sa` and `lcp` may be NumPy memmaps, so a loaded index only
+        touches the pages a query actually needs. Use `build` or `load`
+        rather than calling this directly.
+        """
+        self.data = data
+        self.width = width
+        self.sa = sa
+        self.lcp = lcp
+        self.n = len(sa)
+
+    @classmethod
+    def build(cls, text, with_lcp: bool = True) -> "SuffixArrayIndex":
+        data, width = _symbols(text)
+        sa = suffix_array(text)
+        lcp = lcp_array(text, sa) if with_lcp else None
+        return cls(data, width, sa, lcp)
+
+    def _encode(self, pattern):
+        if isinstance(pattern, str):
+            if self.width != 4:
+                raise TypeError("A str pattern needs an index built over str text.")
+            return pattern.encode('utf-32-be')
+        if self.width != 1:
+            raise TypeError("A bytes pattern needs an index built over bytes text.")
+        return bytes(pattern)
+
+    def range(self, pattern) -> tuple[int, int]:
+        """
+        [lo, hi) interval of the suffix array whose suffixes start with pattern.
+        Two binary searches, each comparing at most len(pattern) symbols per step.
+        """
+        key = self._encode(pattern)
+        m, w, data, sa = len(key), self.width, self.data, self.sa
+        lo, hi = 0, self.n
+        while lo < hi: # First suffix whose prefix is >= pattern
+            mid = (lo + hi) // 2
+            start = int(sa[mid]) * w
+            if data[start:start + m] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        first = lo
+        hi = self.n
+        while lo < hi: # First suffix whose prefix is > pattern
+            mid = (lo + hi) // 2
+            start = int(sa[mid]) * w
+            if data[start:start + m] <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return first, lo
+
+    def count(self, pattern) -> int:
+        lo, hi = self.range(pattern)
+        return hi - lo
+
+    def occurrences(self, pattern) -> np.ndarray:
+        """Every start position of pattern, in increasing order."""
+        lo, hi = self.range(pattern)
+        return np.sort(np.asarray(self.sa[lo:hi], dtype=np.int64))
+
+    def longest_repeated_substring(self):
+        """(start, length) of the longest substring occurring at least twice; needs the LCP array."""
+        if self.lcp is None:
+            raise ValueError("Index was built without an LCP array.")
+        if self.n < 2:
+            return 0, 0
+        best = int(np.argmax(self.lcp))
+        return int(self.sa[best]), int(self.lcp[best])
+
+    # --- Persistence ---
+    def save(self, path: str) -> None:
+        """
+        Header, then the text bytes, then the suffix array and the LCP array
+        as little-endian int32 (int64 for texts of 2^31 symbols or more). The
+        arrays start on an 8-byte boundary so they can be mapped in place.
+        """
+        dtype = np.dtype('<i4') if self.n < 2 ** 31 else np.dtype('<i8')
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(self.MAGIC, self.n, self.width, dtype.itemsize, self.lcp is not None))
+            f.write(self.data[:self.n * self.width])
+            f.write(b'\0' * (-(HEADER.size + self.n * self.width) % 8))
+            f.write(np.asarray(self.sa, dtype=dtype).tobytes())
+            if self.lcp is not None:
+                f.write(np.asarray(self.lcp, dtype=dtype).tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> "SuffixArrayIndex":
+        """
+        Memory-maps a saved index: nothing is read up front, so opening a
+        multi-GB index is instant and the OS pages in only what queries touch.
+        """
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n, width, itemsize, has_lcp = HEADER.unpack_from(data, 0)
+        if magic != cls.MAGIC:
+            raise ValueError(f"Not a serialized {cls.__name__}.")
+        dtype = np.dtype(f'<i{itemsize}')
+        text_start = HEADER.size
+        sa_start = text_start + n * width + (-(text_start + n * width) % 8)
+        sa = np.frombuffer(data, dtype=dtype, count=n, offset=sa_start)
+        lcp = np.frombuffer(data, dtype=dtype, count=n, offset=sa_start + n * itemsize) if has_lcp else None
+        return cls(_MappedText(data, text_start, n * width), width, sa, lcp)
+
+class _MappedText:
+    """The text section of a mapped index; slices read straight from the mmap as bytes."""
+    def __init__(self, mapped, offset, length):
+        self.mapped = mapped
+        self.offset = offset
+        self.length = length
+
+    def __getitem__(self, index):
+        start, stop, _ = index.indices(self.length)
+        return self.mapped[self.offset + start:self.offset + stop]
+
+    def __len__(self):
+        return self.length
 
 def search_suffix_array(text, suffix_array, pattern):
-    n = len(text)
-    m = len(pattern)
-    low, high = 0, n - 1
-    
-    while low <= high:
-        mid = (low + high) // 2
-        suffix = text[suffix_array[mid]:]
-        
-        if pattern == suffix[:m]:
-            return suffix_array[mid]
-        elif pattern < suffix[:m]:
-            high = mid - 1
-        else:
-            low = mid + 1
-            
-    return -1
+    """
+    Same contract as before: a position where pattern occurs, or -1.
+    Use `find_all_occurrences` or SuffixArrayIndex for every match and counts.
+    """
+    occurrences = find_all_occurrences(text, suffix_array, pattern)
+    return occurrences[0] if occurrences else -1
+
+def find_all_occurrences(text, suffix_array, pattern):
+    """Sorted list of every position of pattern in text, given its suffix array."""
+    data, width = _symbols(text)
+    index = SuffixArrayIndex(data, width, suffix_array)
+    lo, hi = index.range(pattern)
+    return sorted(suffix_array[lo:hi])
+
+# --- Benchmark ---
+def _build_suffix_array_naive(text):
+    # The original construction (O(n^2 log n) time, O(n^2) memory), kept as the baseline
+    suffixes = [(text[i:], i) for i in range(len(text))]
+    suffixes.sort(key=lambda item: item[0])
+    return [suffix[1] for suffix in suffixes]
+
+def run_benchmark(sizes=(10_000, 1_000_000, 10_000_000), path="suffix_array_benchmark.idx"):
+    import os
+    rng = np.random.default_rng(0)
+    words = [bytes(rng.integers(97, 123, rng.integers(2, 9)).astype(np.uint8)) for _ in range(5000)]
+    for n in sizes:
+        corpus = b' '.join(words[i] for i in rng.integers(0, len(words), n // 5))[:n]
+        print(f"{len(corpus):,} bytes of text:")
+        if n <= 20_000:
+            start = time.perf_counter()
+            naive = _build_suffix_array_naive(corpus)
+            print(f"  naive sort of suffixes   {time.perf_counter() - start:7.2f} s")
+        start = time.perf_counter()
+        sa = suffix_array(corpus)
+        print(f"  prefix doubling          {time.perf_counter() - start:7.2f} s")
+        if n <= 20_000:
+            print(f"  same suffix array: {naive == sa.tolist()}")
+        start = time.perf_counter()
+        lcp = lcp_array(corpus, sa)
+        print(f"  Kasai LCP                {time.perf_counter() - start:7.2f} s")
+
+        SuffixArrayIndex(corpus, 1, sa, lcp).save(path)
+        start = time.perf_counter()
+        index = SuffixArrayIndex.load(path)
+        print(f"  mmap load                {(time.perf_counter() - start) * 1e3:7.2f} ms "
+              f"({os.path.getsize(path) / 2**20:.0f} MB on disk)")
+        patterns = [words[i] for i in rng.integers(0, len(words), 1000)]
+        start = time.perf_counter()
+        total = sum(index.count(pattern) for pattern in patterns)
+        elapsed = time.perf_counter() - start
+        print(f"  1000 count queries       {elapsed * 1e3:7.2f} ms ({total:,} occurrences)")
+        del index
+        os.remove(path)
 
 if __name__ == '__main__':
     text = "banana"
@@ -29,4 +283,14 @@ if __name__ == '__main__':
     print(f"Suffix array for '{text}': {sa}")
 
     print(f"Found 'ana' at index: {search_suffix_array(text, sa, 'ana')}")
-    print(f"Found 'ban' at index: {search_suffix_array(text, sa, 'ban')}")
\ No newline at end of file
+    print(f"Found 'ban' at index: {search_suffix_array(text, sa, 'ban')}")
+
+    index = SuffixArrayIndex.build(text)
+    print(f"All 'ana': {index.occurrences('ana').tolist()}, count of 'a': {index.count('a')}")
+    # Expected: [1, 3], 3
+    print(f"LCP: {index.lcp.tolist()}, longest repeat starts at {index.longest_repeated_substring()}")
+    # Expected: [0, 1, 3, 0, 0, 2], (1, 3) -> 'ana'
+
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        print()
+        run_benchmark()